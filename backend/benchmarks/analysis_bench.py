@@ -0,0 +1,91 @@
+"""
+Признаки decide по одной вакансии против пула резюме: прежний путь (каждый скорер заново
+разбирает оба текста) против AnalyzedText (вакансия разбирается один раз, резюме - один раз
+на все скореры). Совпадение признаков проверяется на всех парах.
+
+Запуск из backend/:
+    python -m benchmarks.analysis_bench --cvs 500 --words 400
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from matching.aliases import ALIASES
+from matching.analysis import AnalyzedText, analyzed
+from matching.extract import estimate_total_experience, detect_english_level
+from matching.matcher import vacancy_text
+from matching.score import bm25_score, bm25_score_tokens, fuzzy_score
+from matching.skills import normalize_skills
+
+_WORDS = (
+    "опыт работы разработка сервисов сопровождение пользователей команда проект банк "
+    "english upper-intermediate b2 сентябрь 2016 — декабрь 2019 январь 2020 - н.в. 2012 2015"
+).split()
+
+
+def _text(rnd: random.Random, words: int) -> str:
+    aliases = [a for v in ALIASES.values() for a in v]
+    return " ".join(rnd.choice(aliases) if rnd.random() < 0.1 else rnd.choice(_WORDS) for _ in range(words))
+
+
+def _legacy_details(vac: Dict[str, Any], cv_text: str) -> Dict[str, Any]:
+    """Прежний decide без общего разбора - только вычисление признаков."""
+    vac_text = vacancy_text(vac)
+    return {
+        "english": detect_english_level(cv_text),
+        "bm25": bm25_score(vac_text, cv_text),
+        "fuzzy": fuzzy_score(vac_text, cv_text),
+        "skills": normalize_skills(cv_text),
+        "experience": estimate_total_experience(cv_text),
+    }
+
+
+def _shared_details(vac: Dict[str, Any], cv_text: str) -> Dict[str, Any]:
+    va, ca = analyzed(vacancy_text(vac)), AnalyzedText(cv_text)
+    return {
+        "english": ca.english_level,
+        "bm25": bm25_score_tokens(va.bm25_weights, ca.tokens),
+        "fuzzy": fuzzy_score(va.fuzzy_text, ca.fuzzy_text),
+        "skills": ca.skill_set,
+        "experience": ca.experience_years,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cvs", type=int, default=300)
+    ap.add_argument("--words", type=int, default=400)
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    vac = {
+        "title": "Python разработчик",
+        "description_md": _text(rnd, args.words // 2),
+        "must_have": rnd.sample(sorted(ALIASES), 4),
+        "nice_to_have": rnd.sample(sorted(ALIASES), 3),
+        "min_years_total": 3,
+        "english_min_level": "B2",
+    }
+    cvs: List[str] = [_text(rnd, args.words) for _ in range(args.cvs)]
+
+    mismatches = sum(1 for cv in cvs if _legacy_details(vac, cv) != _shared_details(vac, cv))
+    print(f"parity: {len(cvs) - mismatches}/{len(cvs)} pairs identical")
+
+    t0 = time.perf_counter()
+    for cv in cvs:
+        _legacy_details(vac, cv)
+    legacy = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for cv in cvs:
+        _shared_details(vac, cv)
+    shared = time.perf_counter() - t0
+
+    print(f"legacy  {len(cvs) / legacy:8.1f} cv/s")
+    print(f"shared  {len(cvs) / shared:8.1f} cv/s")
+    print(f"speedup x{legacy / shared:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Одно резюме против всего реестра вакансий:
+  legacy  - как было: BM25Okapi из одного документа на каждый вызов (idf вырожден),
+  weights - предрасчитанные веса одного документа (matching.score.bm25_weights) в цикле,
+  okapi   - rank_bm25.BM25Okapi по всему корпусу (корпусные idf, но get_scores - цикл по документам),
+  index   - matching.bm25_index.BM25Index: постинги + один np.bincount.
+Проверяется совпадение скоров index и okapi.
+
+Запуск из backend/:
+    python -m benchmarks.bm25_index_bench --vacancies 10000
+"""
+import argparse
+import random
+import time
+from typing import List
+
+import numpy as np
+from rank_bm25 import BM25Okapi
+
+from matching.bm25_index import BM25Index
+from matching.score import bm25_doc_stats, bm25_weights, bm25_score_weights, tokenize
+
+
+def _vocab(size: int, rnd: random.Random) -> List[str]:
+    letters = "абвгдежзиклмнопрстуфхцчшэюяabcdefghijklmnopqrstuvwxyz"
+    return ["".join(rnd.choice(letters) for _ in range(rnd.randint(3, 10))) for _ in range(size)]
+
+
+def _text(vocab: List[str], weights: List[float], n: int, rnd: random.Random) -> str:
+    return " ".join(rnd.choices(vocab, weights=weights, k=n))
+
+
+def _timeit(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--vacancies", type=int, default=10000)
+    ap.add_argument("--vocab", type=int, default=20000)
+    ap.add_argument("--vac-len", type=int, default=300)
+    ap.add_argument("--cv-len", type=int, default=1500)
+    ap.add_argument("--legacy-sample", type=int, default=500)
+    args = ap.parse_args()
+
+    rnd = random.Random(42)
+    vocab = _vocab(args.vocab, rnd)
+    zipf = [1.0 / (i + 1) for i in range(len(vocab))]
+    vacancies = [_text(vocab, zipf, rnd.randint(args.vac_len // 2, args.vac_len * 2), rnd)
+                 for _ in range(args.vacancies)]
+    cv = _text(vocab, zipf, args.cv_len, rnd)
+    cv_tokens = tokenize(cv)
+
+    t0 = time.perf_counter()
+    index: BM25Index[int] = BM25Index()
+    for i, text in enumerate(vacancies):
+        index.add(i, bm25_doc_stats(text))
+    build = time.perf_counter() - t0
+    index.scores(cv)  # первый запрос строит массивы постингов
+
+    tfs = [bm25_doc_stats(t) for t in vacancies]
+    weights = [bm25_weights(tf) for tf in tfs]
+    okapi = BM25Okapi([tokenize(t) for t in vacancies])
+
+    sample = vacancies[:args.legacy_sample]
+    legacy = _timeit(lambda: [BM25Okapi([tokenize(t)]).get_scores(cv_tokens) for t in sample], 1)
+    legacy *= len(vacancies) / len(sample)
+    loop = _timeit(lambda: [bm25_score_weights(w, cv) for w in weights], 1)
+    corpus = _timeit(lambda: okapi.get_scores(cv_tokens), 1)
+    vectorized = _timeit(lambda: index.scores(cv))
+    topk = _timeit(lambda: index.top_k(cv, 20))
+
+    _, ours = index.scores(cv)
+    ref = okapi.get_scores(cv_tokens)
+    rel = np.abs(ours - ref).max() / max(1e-12, np.abs(ref).max())
+
+    # инкрементальное добавление/удаление на живом индексе
+    extra = [bm25_doc_stats(_text(vocab, zipf, args.vac_len, rnd)) for _ in range(100)]
+    t0 = time.perf_counter()
+    for j, tf in enumerate(extra):
+        index.add(args.vacancies + j, tf)
+        index.remove(j)
+        index.top_k(cv, 20)
+    churn = (time.perf_counter() - t0) / len(extra)
+
+    n = len(vacancies)
+    print(f"corpus: {n} vacancies, vocab {len(index._df)}, cv {len(cv_tokens)} tokens")
+    print(f"index build          {build * 1000:9.1f} ms  ({n / build:,.0f} docs/s)")
+    print(f"legacy (per call)    {legacy * 1000:9.1f} ms  (extrapolated from {len(sample)})")
+    print(f"weights loop         {loop * 1000:9.1f} ms")
+    print(f"rank_bm25 corpus     {corpus * 1000:9.1f} ms")
+    print(f"index scores         {vectorized * 1000:9.1f} ms  x{corpus / vectorized:.0f} vs rank_bm25, "
+          f"x{legacy / vectorized:.0f} vs legacy")
+    print(f"index top-20         {topk * 1000:9.1f} ms")
+    print(f"add+remove+top-20    {churn * 1000:9.1f} ms per update")
+    print(f"parity vs rank_bm25: max relative diff {rel:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Синтетический корпус DOCX: резюме (RU/EN, контакты, места работы с интервалами дат, навыки,
+английский) и вакансии в формате таблицы "Наименование поля / Значение", который разбирает
+utils/vacancy_extract (ключи - из KEY_SYNONYMS). Детерминирован по seed.
+
+Из backend/ - записать файлы на диск (например, для ручной загрузки через /compare):
+    python -m benchmarks.corpus --out /tmp/corpus --cvs 200 --vacancies 20 --size medium
+"""
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from io import BytesIO
+from typing import List, Tuple
+
+from docx import Document
+
+from matching.aliases import ALIASES
+
+
+@dataclass(frozen=True)
+class Size:
+    jobs: Tuple[int, int]          # мест работы в резюме
+    bullets: Tuple[int, int]       # пунктов обязанностей на место / в вакансии
+    words: Tuple[int, int]         # слов в пункте
+
+
+SIZES = {
+    "small": Size(jobs=(1, 3), bullets=(2, 4), words=(5, 12)),
+    "medium": Size(jobs=(3, 6), bullets=(4, 8), words=(8, 20)),
+    "large": Size(jobs=(8, 15), bullets=(8, 15), words=(15, 40)),
+}
+
+_FIRST = ["Иван", "Анна", "Дмитрий", "Елена", "Сергей", "Ольга", "Alexey", "Maria", "Никита", "Татьяна"]
+_LAST = ["Иванов", "Смирнова", "Кузнецов", "Попова", "Соколов", "Lebedeva", "Petrov", "Морозова"]
+_COMPANIES = ["ПАО Банк", "ООО Ромашка", "АО Технологии", "Yandex", "EPAM Systems", "ООО ИТ-Сервис",
+              "Сбертех", "Lanit", "ФГУП Почта", "X5 Retail Group"]
+_TITLES = ["Системный администратор", "Python-разработчик", "Инженер технической поддержки",
+           "Аналитик данных", "DevOps-инженер", "Backend Developer", "QA Engineer", "Руководитель группы"]
+_VERBS_RU = ["разработка", "сопровождение", "настройка", "администрирование", "поддержка", "внедрение",
+             "автоматизация", "мониторинг", "оптимизация", "тестирование", "документирование", "миграция"]
+_NOUNS_RU = ["сервисов", "инфраструктуры", "пользователей", "отчётности", "серверов", "баз данных",
+             "CI/CD", "сети", "интеграций", "процессов", "рабочих мест", "API"]
+_VERBS_EN = ["developed", "maintained", "migrated", "automated", "designed", "supported", "monitored"]
+_NOUNS_EN = ["services", "pipelines", "databases", "infrastructure", "dashboards", "integrations"]
+_MONTHS_RU = ["январь", "февраль", "март", "апрель", "май", "июнь", "июль", "август", "сентябрь",
+              "октябрь", "ноябрь", "декабрь"]
+_MONTHS_EN = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+_PRESENT = ["н.в.", "по настоящее время", "present", "настоящее время"]
+_DASHES = [" — ", " - ", " – ", "-"]
+_ENGLISH = ["A2", "B1", "B2", "C1", "Intermediate", "Upper-Intermediate", "Advanced", "свободно"]
+
+_SKILLS = sorted(ALIASES)
+
+
+def _alias(rnd: random.Random, canon: str) -> str:
+    return rnd.choice(sorted(ALIASES[canon]))
+
+
+def _sentence(rnd: random.Random, size: Size, english: bool, skills: List[str]) -> str:
+    verbs, nouns = (_VERBS_EN, _NOUNS_EN) if english else (_VERBS_RU, _NOUNS_RU)
+    words = []
+    for _ in range(rnd.randint(*size.words)):
+        r = rnd.random()
+        if r < 0.12 and skills:
+            words.append(_alias(rnd, rnd.choice(skills)))
+        elif r < 0.5:
+            words.append(rnd.choice(verbs))
+        else:
+            words.append(rnd.choice(nouns))
+    return " ".join(words).capitalize()
+
+
+def _date(rnd: random.Random, year: int, month: int) -> str:
+    r = rnd.random()
+    if r < 0.5:
+        return f"{_MONTHS_RU[month - 1].capitalize()} {year}"
+    if r < 0.75:
+        return f"{_MONTHS_EN[month - 1]} {year}"
+    if r < 0.9:
+        return f"{month:02d}.{year}"
+    return str(year)
+
+
+def _phone(rnd: random.Random) -> str:
+    n = "".join(str(rnd.randint(0, 9)) for _ in range(7))
+    return rnd.choice(["+7 (9{}{}) {}-{}-{}", "8 9{}{} {}{}{}", "+7-9{}{}-{}-{}-{}"]).format(
+        rnd.randint(0, 9), rnd.randint(0, 9), n[:3], n[3:5], n[5:])
+
+
+def _email(rnd: random.Random) -> str:
+    login = f"{rnd.choice(['ivanov', 'anna.s', 'dev', 'petrov', 'it.pro'])}{rnd.randint(1, 999)}"
+    domain = rnd.choice(["mail.ru", "yandex.ru", "gmail.com", "bk.ru"])
+    if rnd.random() < 0.1:
+        # обфусцированный адрес - ветка _normalize_obfuscated_emails
+        return f"{login} (at) {domain.replace('.', ' (dot) ')}"
+    return f"{login}@{domain}"
+
+
+def _save(doc) -> bytes:
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def make_cv(rnd: random.Random, size: Size) -> bytes:
+    english = rnd.random() < 0.25
+    skills = rnd.sample(_SKILLS, rnd.randint(3, 15))
+    doc = Document()
+    last = rnd.choice(_LAST)
+    doc.add_heading(f"{rnd.choice(_FIRST)} {last}", level=1)
+    doc.add_paragraph(rnd.choice(_TITLES))
+    doc.add_paragraph(f"Телефон: {_phone(rnd)}")
+    doc.add_paragraph(f"E-mail: {_email(rnd)}")
+
+    doc.add_heading("Work experience" if english else "Опыт работы", level=2)
+    year, month = rnd.randint(2018, 2025), rnd.randint(1, 12)
+    for i in range(rnd.randint(*size.jobs)):
+        end = rnd.choice(_PRESENT) if i == 0 and rnd.random() < 0.6 else _date(rnd, year, month)
+        year -= rnd.randint(1, 3)
+        month = rnd.randint(1, 12)
+        doc.add_paragraph(f"{_date(rnd, year, month)}{rnd.choice(_DASHES)}{end}")
+        doc.add_paragraph(f"{rnd.choice(_COMPANIES)}, {rnd.choice(_TITLES)}")
+        for _ in range(rnd.randint(*size.bullets)):
+            doc.add_paragraph(_sentence(rnd, size, english, skills), style="List Bullet")
+
+    doc.add_heading("Skills" if english else "Ключевые навыки", level=2)
+    doc.add_paragraph(", ".join(_alias(rnd, s) for s in skills))
+    doc.add_heading("Languages" if english else "Знание языков", level=2)
+    doc.add_paragraph(f"{'English' if english else 'Английский'} — {rnd.choice(_ENGLISH)}")
+    doc.add_heading("Education" if english else "Образование", level=2)
+    doc.add_paragraph(f"{rnd.randint(2000, 2018)} МГТУ им. Баумана, информатика и вычислительная техника")
+    return _save(doc)
+
+
+def make_vacancy(rnd: random.Random, size: Size) -> bytes:
+    must = rnd.sample(_SKILLS, rnd.randint(2, 6))
+    nice = rnd.sample(_SKILLS, rnd.randint(1, 5))
+    lo = rnd.randint(0, 5)
+    rows = [
+        ("Название", rnd.choice(_TITLES)),
+        ("Регион", rnd.choice(["Москва", "Санкт-Петербург", "Удалённо"])),
+        ("Обязанности (для публикации)",
+         "\n".join(_sentence(rnd, size, False, nice) for _ in range(rnd.randint(*size.bullets)))),
+        ("Требования (для публикации)",
+         "\n".join(_sentence(rnd, size, False, must) for _ in range(rnd.randint(*size.bullets)))
+         + "\n" + ", ".join(_alias(rnd, s) for s in must)),
+        ("Требуемый опыт работы", rnd.choice([f"от {lo} лет", f"{lo}-{lo + 2} года", "без опыта", f"{lo} года"])),
+        ("Знание иностранных языков", rnd.choice(["Английский", "Не требуется"])),
+        ("Уровень владения языка", rnd.choice(_ENGLISH)),
+        ("Тип занятости", rnd.choice(["Полная", "Частичная"])),
+    ]
+    doc = Document()
+    doc.add_paragraph("Профиль вакансии")
+    table = doc.add_table(rows=len(rows) + 1, cols=2)
+    table.rows[0].cells[0].text = "Наименование поля"
+    table.rows[0].cells[1].text = "Значение"
+    for row, (key, value) in zip(table.rows[1:], rows):
+        row.cells[0].text = key
+        row.cells[1].text = value
+    return _save(doc)
+
+
+def make_corpus(cvs: int, vacancies: int, size: str = "medium", seed: int = 0) -> Tuple[List[bytes], List[bytes]]:
+    rnd = random.Random(seed)
+    sz = SIZES[size]
+    return [make_cv(rnd, sz) for _ in range(cvs)], [make_vacancy(rnd, sz) for _ in range(vacancies)]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Синтетический корпус DOCX резюме и вакансий")
+    ap.add_argument("--out", required=True)
+    ap.add_argument("--cvs", type=int, default=100)
+    ap.add_argument("--vacancies", type=int, default=10)
+    ap.add_argument("--size", choices=sorted(SIZES), default="medium")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    cvs, vacancies = make_corpus(args.cvs, args.vacancies, args.size, args.seed)
+    os.makedirs(args.out, exist_ok=True)
+    for prefix, docs in (("cv", cvs), ("vacancy", vacancies)):
+        for i, data in enumerate(docs):
+            with open(os.path.join(args.out, f"{prefix}_{i:05d}.docx"), "wb") as f:
+                f.write(data)
+    print(f"{len(cvs)} CVs and {len(vacancies)} vacancies written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Скоринг одной вакансии против пула резюме: decide по одному против decide_many (массивы numpy,
+rapidfuzz cdist, BM25 - разреженная матрица на вектор весов). Резюме - как при пересчёте пула
+(CandidateService.rescreen): текст и сохранённые признаки cv_features (с bm25_tf), без готового
+разбора. Для сравнения - decide только по тексту, как считался пул без сохранённых bm25_tf.
+На всех парах проверяется, что решения и причины совпадают, а скор расходится не больше
+чем на шаг округления (другой порядок сложения).
+
+Запуск из backend/:
+    python -m benchmarks.decide_many_bench --cvs 5000 --words 400 --workers -1
+"""
+import argparse
+import random
+import time
+from typing import Any, Dict, List
+
+from matching.aliases import ALIASES
+from matching.features import cv_features
+from matching.matcher import decide, decide_many
+
+_WORDS = (
+    "опыт работы разработка сервисов сопровождение пользователей команда проект банк "
+    "english upper-intermediate b2 сентябрь 2016 — декабрь 2019 январь 2020 - н.в. 2012 2015"
+).split()
+
+
+def _text(rnd: random.Random, words: int) -> str:
+    aliases = [a for v in ALIASES.values() for a in v]
+    return " ".join(rnd.choice(aliases) if rnd.random() < 0.1 else rnd.choice(_WORDS) for _ in range(words))
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cvs", type=int, default=2000)
+    ap.add_argument("--words", type=int, default=400)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    vac = {
+        "title": "Python разработчик",
+        "description_md": _text(rnd, args.words // 2),
+        "must_have": rnd.sample(sorted(ALIASES), 4),
+        "nice_to_have": rnd.sample(sorted(ALIASES), 3),
+        "min_years_total": 3,
+        "english_min_level": "B2",
+    }
+    cvs: List[Dict[str, Any]] = []
+    for _ in range(args.cvs):
+        text = _text(rnd, args.words)
+        cvs.append({"text": text, **cv_features(text)})
+
+    t0 = time.perf_counter()
+    [decide(vac, {"text": cv["text"]}) for cv in cvs]
+    t_text = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    single = [decide(vac, cv) for cv in cvs]
+    t_single = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    batch = decide_many(vac, cvs, workers=args.workers)
+    t_batch = time.perf_counter() - t0
+
+    same = sum(1 for a, b in zip(single, batch) if a == b)
+    diff = max((abs(a["score"] - b["score"]) for a, b in zip(single, batch)), default=0.0)
+    assert all(a["decision"] == b["decision"] and a["reasons"] == b["reasons"] for a, b in zip(single, batch)), \
+        "decide_many: решения расходятся с decide"
+    assert diff <= 0.001 + 1e-9, f"decide_many: скор расходится на {diff}"
+    print(f"parity: decisions identical, {same}/{len(cvs)} pairs bit-identical, max |score diff| {diff:.3f}")
+    print(f"decide text  {len(cvs) / t_text:10.1f} cv/s")
+    print(f"decide       {len(cvs) / t_single:10.1f} cv/s")
+    print(f"decide_many  {len(cvs) / t_batch:10.1f} cv/s")
+    print(f"speedup x{t_single / t_batch:.2f} vs decide, x{t_text / t_batch:.2f} vs decide text")
+
+
+if __name__ == "__main__":
+    main()
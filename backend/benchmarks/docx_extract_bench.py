@@ -0,0 +1,101 @@
+"""
+Сравнение потокового извлечения DOCX (utils.docx_extract) с прежней схемой:
+tempfile + docx2txt для текста и дерево python-docx для таблиц вакансии.
+
+Запуск из backend/:
+    python -m benchmarks.docx_extract_bench --docs 200 --paragraphs 400
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+from typing import Callable, List, Tuple
+
+import docx2txt
+from docx import Document
+
+from utils.docx_extract import extract_docx, _clean_text
+from utils.vacancy_extract import table_rows_to_pairs
+
+_WORDS = (
+    "опыт разработки python fastapi postgresql docker kubernetes linux git "
+    "администрирование windows server active directory dns dhcp сопровождение "
+    "пользователей jira itil english upper-intermediate команда проект банк"
+).split()
+
+
+def _make_docx(paragraphs: int, table_rows: int, seed: int) -> bytes:
+    rnd = random.Random(seed)
+    doc = Document()
+    for _ in range(paragraphs):
+        doc.add_paragraph(" ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(5, 25))))
+    table = doc.add_table(rows=table_rows, cols=2)
+    for i, row in enumerate(table.rows):
+        row.cells[0].text = f"Поле {i}"
+        row.cells[1].text = " ".join(rnd.choice(_WORDS) for _ in range(10))
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _legacy_text(data: bytes) -> str:
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
+    try:
+        tmp.write(data)
+        tmp.close()
+        text = docx2txt.process(tmp.name)
+        return _clean_text((text or "").replace("\r\n", "\n").replace("\r", "\n"))
+    finally:
+        os.remove(tmp.name)
+
+
+def _legacy_pairs(data: bytes) -> List[Tuple[str, str]]:
+    doc = Document(BytesIO(data))
+    return table_rows_to_pairs([c.text for c in row.cells] for t in doc.tables for row in t.rows)
+
+
+def _legacy(data: bytes):
+    return _legacy_text(data), _legacy_pairs(data)
+
+
+def _native(data: bytes):
+    content = extract_docx(data)
+    return content.text, table_rows_to_pairs(content.rows)
+
+
+def _measure(fn: Callable[[bytes], object], docs: List[bytes]) -> Tuple[float, int]:
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    for d in docs:
+        fn(d)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=100)
+    ap.add_argument("--paragraphs", type=int, default=300)
+    ap.add_argument("--rows", type=int, default=20)
+    args = ap.parse_args()
+
+    docs = [_make_docx(args.paragraphs, args.rows, seed) for seed in range(args.docs)]
+
+    mismatches = sum(1 for d in docs if _legacy(d) != _native(d))
+    print(f"parity: {len(docs) - mismatches}/{len(docs)} documents identical")
+
+    results = {}
+    for name, fn in (("legacy", _legacy), ("native", _native)):
+        elapsed, peak = _measure(fn, docs)
+        results[name] = elapsed
+        print(f"{name:7s} {len(docs) / elapsed:8.1f} docs/s  peak {peak / 1024:8.1f} KiB")
+    print(f"speedup x{results['legacy'] / results['native']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Семантический поиск: скорость HashingEmbedder и поиск ближайших - точный FlatIndex против
+HnswIndex (задержка запроса, recall@k относительно точного).
+
+Запуск из backend/:
+    python -m benchmarks.embeddings_bench --docs 50000 --queries 200 --k 10
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import List
+
+import numpy as np
+
+from matching.aliases import ALIASES
+from matching.ann import FlatIndex, HnswIndex
+from matching.embeddings import HashingEmbedder
+
+_WORDS = (
+    "опыт работы разработка сервисов сопровождение пользователей команда проект банк "
+    "бухгалтер отчётность налоги продажи клиенты аналитика данные отчёты"
+).split()
+
+
+def _texts(rnd: random.Random, n: int, words: int) -> List[str]:
+    aliases = [a for v in ALIASES.values() for a in v]
+    return [" ".join(rnd.choice(aliases) if rnd.random() < 0.3 else rnd.choice(_WORDS) for _ in range(words))
+            for _ in range(n)]
+
+
+def _latency(fn, queries) -> List[float]:
+    out = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        out.append((time.perf_counter() - t0) * 1000)
+    return sorted(out)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--docs", type=int, default=20000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--words", type=int, default=150)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--dim", type=int, default=512)
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    embedder = HashingEmbedder(dim=args.dim)
+    texts = _texts(rnd, args.docs, args.words)
+    t0 = time.perf_counter()
+    vectors = embedder.embed(texts)
+    elapsed = time.perf_counter() - t0
+    print(f"hashing embed: {args.docs / elapsed:8.1f} docs/s ({args.words} words)")
+
+    flat: FlatIndex[int] = FlatIndex(args.dim)
+    hnsw: HnswIndex[int] = HnswIndex(args.dim, capacity=args.docs)
+    t0 = time.perf_counter()
+    for i, v in enumerate(vectors):
+        flat.add(i, v)
+    t_flat = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    for i, v in enumerate(vectors):
+        hnsw.add(i, v)
+    t_hnsw = time.perf_counter() - t0
+    print(f"build: flat {t_flat:.2f} s, hnsw {t_hnsw:.2f} s")
+
+    queries = embedder.embed(_texts(rnd, args.queries, args.words))
+    flat.search(queries[0], args.k)
+    recall = statistics.mean(
+        len({key for key, _ in flat.search(q, args.k)} & {key for key, _ in hnsw.search(q, args.k)}) / args.k
+        for q in queries)
+    for name, index in (("flat", flat), ("hnsw", hnsw)):
+        lat = _latency(lambda q: index.search(q, args.k), queries)
+        print(f"{name:5s} search over {args.docs}: p50 {statistics.median(lat):.2f} ms  "
+              f"p99 {lat[int(len(lat) * 0.99) - 1]:.2f} ms")
+    print(f"hnsw recall@{args.k}: {recall:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Пропускная способность CPU-части /compare (парсинг резюме и вакансии + мэтчер) и отзывчивость
+event loop при разных режимах исполнения:
+  loop    - этапы прямо на event loop (как было для мэтчера и контактов),
+  thread  - CpuExecutor(processes=0), asyncio.to_thread (упирается в GIL),
+  procN   - CpuExecutor(processes=N), пул процессов.
+Параллельно работает "аудио-пинг": корутина просыпается каждые 20 мс, как обработчик
+WebSocket-чанков, и меряет опоздание - это задержка, которую почувствовал бы голосовой канал.
+
+Запуск из backend/:
+    python -m benchmarks.executor_bench --requests 200 --concurrency 16
+"""
+import argparse
+import asyncio
+import multiprocessing as mp
+import random
+import statistics
+import time
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Tuple
+
+from docx import Document
+
+from infrastructure.executor.pool import CpuExecutor
+from services import cpu_tasks
+
+_WORDS = (
+    "опыт разработки python fastapi postgresql docker kubernetes linux git "
+    "администрирование windows server active directory dns dhcp сопровождение "
+    "пользователей jira itil english upper-intermediate команда проект банк"
+).split()
+
+_TICK_SEC = 0.02
+
+
+def _make_cv(paragraphs: int, seed: int) -> bytes:
+    rnd = random.Random(seed)
+    doc = Document()
+    doc.add_paragraph(f"Иванов Иван, ivan{seed}@mail.ru, +7 916 {seed % 1000:03d}-12-34")
+    for y in range(5):
+        doc.add_paragraph(f"01.{2015 + y} - 12.{2016 + y} инженер")
+    for _ in range(paragraphs):
+        doc.add_paragraph(" ".join(rnd.choice(_WORDS) for _ in range(rnd.randint(5, 25))))
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _make_vacancy() -> bytes:
+    doc = Document()
+    rows = [
+        ("Название", "Системный администратор"),
+        ("Обязанности", "администрирование windows server, active directory, dns, dhcp"),
+        ("Требования", "python, docker, linux, git, jira, itil"),
+        ("Требуемый опыт работы", "от 3 лет"),
+        ("Знание иностранных языков", "английский"),
+        ("Уровень владения языка", "B2"),
+    ]
+    table = doc.add_table(rows=len(rows), cols=2)
+    for (k, v), row in zip(rows, table.rows):
+        row.cells[0].text, row.cells[1].text = k, v
+    buf = BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def _vac_input(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    profile = parsed["profile"]
+    return {
+        "title": profile.get("title") or "Vacancy",
+        "description_md": profile.get("description_md", ""),
+        "must_have": profile.get("must_have", []),
+        "nice_to_have": profile.get("nice_to_have", []),
+        "min_years_total": profile.get("min_years_total"),
+        "english_min_level": profile.get("english_min_level"),
+    }
+
+
+def _cv_input(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    return {**parsed["features"], "text": parsed["text"], "detected_meta": parsed["contacts"]}
+
+
+Runner = Callable[[str, Callable[..., Any], Tuple[Any, ...]], Any]
+
+
+async def _compare(run: Runner, cv: bytes, vac: bytes) -> str:
+    cv_p, vac_p = await asyncio.gather(run("parse_cv", cpu_tasks.parse_cv, (cv,)),
+                                       run("parse_vacancy", cpu_tasks.parse_vacancy, (vac,)))
+    d = await run("match", cpu_tasks.match, (_vac_input(vac_p), _cv_input(cv_p)))
+    return d["decision"]
+
+
+async def _probe(stop: asyncio.Event, lags: List[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(_TICK_SEC)
+        lags.append(time.perf_counter() - t0 - _TICK_SEC)
+
+
+async def _bench(run: Runner, cvs: List[bytes], vac: bytes, concurrency: int) -> Tuple[float, List[float], List[str]]:
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(cv: bytes) -> str:
+        async with slots:
+            return await _compare(run, cv, vac)
+
+    stop, lags = asyncio.Event(), []
+    probe = asyncio.create_task(_probe(stop, lags))
+    t0 = time.perf_counter()
+    decisions = await asyncio.gather(*[one(cv) for cv in cvs])
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await probe
+    return elapsed, lags, decisions
+
+
+async def _inline(stage: str, fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+    return fn(*args)
+
+
+def _pct(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    cvs = [_make_cv(args.paragraphs, seed) for seed in range(args.requests)]
+    vac = _make_vacancy()
+
+    modes: List[Tuple[str, int | None]] = [("loop", None), ("thread", 0)]
+    n = 1
+    while n <= args.max_processes:
+        modes.append((f"proc{n}", n))
+        n *= 2
+
+    reference: List[str] | None = None
+    print(f"{'mode':8s} {'req/s':>8s} {'lag p50':>9s} {'lag p99':>9s} {'lag max':>9s}")
+    for name, processes in modes:
+        executor = None
+        if processes is None:
+            run: Runner = _inline
+        else:
+            executor = CpuExecutor(processes=processes)
+            await executor.start()
+
+            async def run(stage: str, fn: Callable[..., Any], a: Tuple[Any, ...], ex=executor) -> Any:
+                return await ex.run(stage, fn, *a)
+
+        elapsed, lags, decisions = await _bench(run, cvs, vac, args.concurrency)
+        if reference is None:
+            reference = decisions
+        assert decisions == reference, f"{name}: решения отличаются от режима loop"
+
+        print(f"{name:8s} {len(cvs) / elapsed:8.1f} {_pct(lags, 0.5) * 1000:7.1f}ms "
+              f"{_pct(lags, 0.99) * 1000:7.1f}ms {max(lags or [0.0]) * 1000:7.1f}ms")
+        if executor is not None:
+            if args.verbose:
+                for stage, st in executor.stats()["stages"].items():
+                    print(f"         {stage:14s} {st}")
+            executor.shutdown()
+
+    print(f"cpu_count={mp.cpu_count()}  tick={_TICK_SEC * 1000:.0f}ms  "
+          f"decisions: {dict((d, reference.count(d)) for d in set(reference or []))}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=100)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--paragraphs", type=int, default=150)
+    ap.add_argument("--max-processes", type=int, default=mp.cpu_count())
+    ap.add_argument("--verbose", action="store_true")
+    args = ap.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
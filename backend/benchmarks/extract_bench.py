@@ -0,0 +1,151 @@
+"""
+Интервалы опыта: прежний разбор (RANGE_RX + до пяти re.fullmatch на каждую дату и повторная
+проверка 'н.в.') против одного прохода с группами (matching/extract.py) на синтетическом
+корпусе резюме. Эталон - прежняя реализация: интервалы и стаж должны совпасть на всех текстах,
+иначе скрипт падает с примерами расхождений.
+
+Запуск из backend/:
+    python -m benchmarks.extract_bench --cvs 5000 --jobs 12
+"""
+import argparse
+import random
+import re
+import sys
+import time
+from datetime import date
+from typing import List, Optional, Tuple
+
+from matching.extract import (
+    find_date_ranges, estimate_total_experience, experience_from, find_years,
+    _ru_month_to_num, _en_month_to_num, _WORD_RU, _WORD_EN, _DASH, _PRESENT,
+)
+
+# ==== прежняя реализация (эталон) ====
+
+_LEGACY_TOKEN = rf"""
+    (?:
+        {_WORD_RU}\s+\d{{4}}
+      | {_WORD_EN}\s+\d{{4}}
+      | \d{{1,2}}[./-]\d{{4}}
+      | \d{{4}}[./-]\d{{1,2}}
+      | \d{{4}}
+    )
+"""
+_LEGACY_RX = re.compile(rf"(?P<d1>{_LEGACY_TOKEN})\s*{_DASH}\s*(?P<d2>{_LEGACY_TOKEN}|{_PRESENT})",
+                        re.I | re.X | re.U)
+
+
+def _legacy_parse(s: str) -> Optional[date]:
+    s = s.strip()
+    m = re.fullmatch(rf"\s*({_WORD_RU})\s+(\d{{4}})\s*", s, flags=re.I | re.U)
+    if m:
+        mon = _ru_month_to_num(m.group(1))
+        if mon:
+            return date(int(m.group(2)), mon, 1)
+    m = re.fullmatch(rf"\s*({_WORD_EN})\s+(\d{{4}})\s*", s, flags=re.I)
+    if m:
+        mon = _en_month_to_num(m.group(1))
+        if mon:
+            return date(int(m.group(2)), mon, 1)
+    m = re.fullmatch(r"\s*(\d{1,2})[./-](\d{4})\s*", s)
+    if m:
+        mm, yy = int(m.group(1)), int(m.group(2))
+        if 1 <= mm <= 12:
+            return date(yy, mm, 1)
+    m = re.fullmatch(r"\s*(\d{4})[./-](\d{1,2})\s*", s)
+    if m:
+        yy, mm = int(m.group(1)), int(m.group(2))
+        if 1 <= mm <= 12:
+            return date(yy, mm, 1)
+    m = re.fullmatch(r"\s*(\d{4})\s*", s)
+    if m:
+        return date(int(m.group(1)), 1, 1)
+    return None
+
+
+def legacy_date_ranges(md: str) -> List[Tuple[date, date]]:
+    today = date.today()
+    intervals = []
+    for m in _LEGACY_RX.finditer(md):
+        right_raw = m.group("d2")
+        left = _legacy_parse(m.group("d1"))
+        right = today if re.fullmatch(_PRESENT, right_raw.strip(), flags=re.I | re.U) else _legacy_parse(right_raw)
+        if left and right and right >= left:
+            intervals.append((left, right))
+    return intervals
+
+
+def legacy_experience(md: str) -> Optional[float]:
+    intervals = legacy_date_ranges(md)
+    return experience_from(intervals, [] if intervals else find_years(md))
+
+# ==== синтетический корпус ====
+
+_RU = ["январь", "января", "февраль", "марта", "апрель", "мая", "май", "июнь", "июля", "августа",
+       "сентябрь", "сен.", "сент", "окт.", "ноя", "дек", "Декабрь", "МАРТ", "опыт", "год", "."]
+_EN = ["Jan", "January", "feb.", "March", "Apr", "may", "June", "jul", "Aug.", "Sep", "Sept",
+       "October", "nov", "Dec", "DECEMBER", "work", "year"]
+_PRESENTS = ["н.в.", "по наст.", "по настоящее время", "настоящее время", "present", "Now", "current"]
+_DASHES = ["-", "–", "—", " - ", " — ", "–  "]
+_FILLER = ("Опыт работы компания разработка сервисов сопровождение пользователей команда проект банк "
+           "Python SQL обязанности достижения Москва 150 000 руб.").split()
+
+
+def _date(rnd: random.Random) -> str:
+    y = rnd.randint(1995, 2026)
+    r = rnd.random()
+    if r < 0.35:
+        return f"{rnd.choice(_RU)} {y}"
+    if r < 0.6:
+        return f"{rnd.choice(_EN)} {y}"
+    if r < 0.75:
+        return f"{rnd.randint(0, 14):02d}{rnd.choice('./-')}{y}"
+    if r < 0.85:
+        return f"{y}{rnd.choice('./-')}{rnd.randint(0, 14)}"
+    return str(y)
+
+
+def _cv(rnd: random.Random, jobs: int) -> str:
+    parts = []
+    for _ in range(jobs):
+        left = _date(rnd)
+        right = rnd.choice(_PRESENTS) if rnd.random() < 0.15 else _date(rnd)
+        parts.append(f"{left}{rnd.choice(_DASHES)}{right}")
+        parts.append(" ".join(rnd.choice(_FILLER) for _ in range(rnd.randint(5, 60))))
+    return "\n".join(parts)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cvs", type=int, default=5000)
+    ap.add_argument("--jobs", type=int, default=12)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rnd = random.Random(18)
+    texts = [_cv(rnd, rnd.randint(1, args.jobs)) for _ in range(args.cvs)]
+
+    bad = [t for t in texts
+           if legacy_date_ranges(t) != find_date_ranges(t) or legacy_experience(t) != estimate_total_experience(t)]
+    print(f"golden: {len(texts) - len(bad)}/{len(texts)} CVs with identical intervals and experience")
+    for t in bad[:3]:
+        print("---", t[:300], legacy_date_ranges(t), find_date_ranges(t), sep="\n")
+
+    def best(fn) -> float:
+        runs = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            for t in texts:
+                fn(t)
+            runs.append(time.perf_counter() - t0)
+        return min(runs)
+
+    t_old, t_new = best(legacy_experience), best(estimate_total_experience)
+    print(f"experience: legacy {t_old / len(texts) * 1e6:8.1f} us/CV   single pass {t_new / len(texts) * 1e6:8.1f} us/CV"
+          f"   x{t_old / t_new:.2f}")
+    if bad:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
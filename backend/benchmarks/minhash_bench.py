@@ -0,0 +1,113 @@
+"""
+Почти-дубликаты резюме: стоимость MinHash-подписи на резюме из корпуса, задержка поиска
+в LshIndex на --index подписях (реальные + случайный фон) и качество: доля найденных
+правок (новый телефон, переставленные разделы, дописанная строка) и ложные срабатывания
+на разных резюме при пороге --threshold.
+
+Запуск из backend/:
+    python -m benchmarks.minhash_bench --cvs 200 --index 100000
+"""
+import argparse
+import random
+import re
+import statistics
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.corpus import SIZES, make_cv
+from matching import minhash
+from utils.docx_extract import extract_docx
+
+_PHONE_RX = re.compile(r"\+?\d[\d\s()\-]{8,}\d")
+
+
+def _new_phone(rnd: random.Random, text: str) -> str:
+    return _PHONE_RX.sub(lambda _: f"+7 9{rnd.randint(10, 99)} {rnd.randint(100, 999)}-{rnd.randint(10, 99)}-"
+                                   f"{rnd.randint(10, 99)}", text)
+
+
+def _reorder(rnd: random.Random, text: str, parts: int = 4) -> str:
+    # переставляем разделы целиком: режем по границам строк на parts кусков
+    lines = text.split("\n")
+    cuts = sorted(rnd.sample(range(1, len(lines)), parts - 1))
+    blocks = [lines[i:j] for i, j in zip([0] + cuts, cuts + [len(lines)])]
+    rnd.shuffle(blocks)
+    return "\n".join(line for block in blocks for line in block)
+
+
+def _append(rnd: random.Random, text: str) -> str:
+    return text + "\nДополнительно: готов к командировкам, есть водительское удостоверение категории B."
+
+
+EDITS: Dict[str, Callable[[random.Random, str], str]] = {
+    "phone": _new_phone,
+    "reorder": _reorder,
+    "append": _append,
+    "phone+reorder": lambda rnd, t: _reorder(rnd, _new_phone(rnd, t)),
+}
+
+
+def _pct(values: List[float], q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(q * len(values)))]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--cvs", type=int, default=200)
+    ap.add_argument("--size", choices=sorted(SIZES), default="medium")
+    ap.add_argument("--index", type=int, default=100_000, help="подписей в индексе")
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--threshold", type=float, default=0.9)
+    ap.add_argument("--bands", type=int, default=16)
+    args = ap.parse_args()
+
+    rnd = random.Random(3)
+    texts = [extract_docx(make_cv(rnd, SIZES[args.size])).text for _ in range(args.cvs)]
+
+    t0 = time.perf_counter()
+    sigs = [minhash.signature(t) for t in texts]
+    t_sig = time.perf_counter() - t0
+    words = statistics.mean(len(t.split()) for t in texts)
+    print(f"signature: {args.cvs} cvs (~{words:.0f} words), {t_sig / args.cvs * 1000:.3f} ms/cv, "
+          f"{minhash.NUM_PERM * 4} bytes stored")
+
+    # фон - случайные подписи: с реальными совпадают полосами только случайно, как разные резюме
+    index: minhash.LshIndex[int] = minhash.LshIndex(args.bands)
+    noise = np.random.default_rng(0).integers(0, 2 ** 32, size=(max(0, args.index - args.cvs), minhash.NUM_PERM),
+                                              dtype=np.uint32)
+    t0 = time.perf_counter()
+    for i, sig in enumerate(sigs):
+        index.add(i, sig)
+    for j, sig in enumerate(noise):
+        index.add(args.cvs + j, sig)
+    index.query(sigs[0])  # первый запрос сливает буфер добавленных
+    t_build = time.perf_counter() - t0
+    print(f"index: {len(index)} signatures, build {t_build:.2f} s")
+
+    lat = []
+    for _ in range(args.queries):
+        sig = sigs[rnd.randrange(args.cvs)]
+        t0 = time.perf_counter()
+        index.query(sig, args.threshold)
+        lat.append(time.perf_counter() - t0)
+    print(f"lookup: p50 {_pct(lat, 0.5) * 1000:.3f} ms  p99 {_pct(lat, 0.99) * 1000:.3f} ms  "
+          f"max {max(lat) * 1000:.3f} ms")
+
+    # качество: правка резюме i должна находить i; чужие резюме выше порога - ложные срабатывания
+    for name, edit in EDITS.items():
+        found, sims = 0, []
+        for i, text in enumerate(texts):
+            sig = minhash.signature(edit(rnd, text))
+            sims.append(minhash.similarity(sig, sigs[i]))
+            found += any(k == i for k, _ in index.query(sig, args.threshold))
+        print(f"  {name:14s} recall {found}/{args.cvs}  similarity p50 {statistics.median(sims):.3f} "
+              f"min {min(sims):.3f}")
+    false_pos = sum(1 for i, sig in enumerate(sigs) for k, _ in index.query(sig, args.threshold) if k != i)
+    pair_max = max(minhash.similarity(sigs[i], sigs[j]) for i in range(args.cvs) for j in range(i + 1, args.cvs))
+    print(f"  distinct cvs   false positives {false_pos}  max pair similarity {pair_max:.3f}")
+
+
+if __name__ == "__main__":
+    main()
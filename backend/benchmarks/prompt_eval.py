@@ -0,0 +1,164 @@
+"""
+PromptBuilder: насколько сокращается промпт LLMAnalyzer и не меняется ли решение.
+
+Пары резюме/вакансия из синтетического корпуса; с --bloat в резюме добавляется то, что
+встречается в реальных выгрузках: повторяющиеся колонтитулы и строки таблиц, хобби,
+рекомендации, личные данные. Для каждой пары:
+- оценка токенов промпта (system + user) без сжатия и с ним;
+- офлайн-проверка стабильности: признаки (навыки, стаж, английский) и решение мэтчера
+  (decide) по сжатому тексту против чистого резюме - в сжатом не должно пропасть то,
+  на чём строится решение;
+- с --llm N - реальный LLM на первых N парах (нужен ключ settings.analyzer.api_key):
+  decision и match_percentage по исходному и сжатому промпту, prompt_tokens из usage.
+
+Запуск из backend/:
+    python -m benchmarks.prompt_eval --pairs 200 --size large --bloat
+    python -m benchmarks.prompt_eval --pairs 100 --size large --bloat --budget 6000
+    python -m benchmarks.prompt_eval --pairs 20 --bloat --llm 10
+"""
+import argparse
+import asyncio
+import random
+import statistics
+from typing import List, Tuple
+
+import httpx
+
+from benchmarks.corpus import SIZES, make_cv, make_vacancy
+from llm_compare.llm_module import LLMAnalyzer
+from llm_compare.prompt_builder import PromptBuilder, estimate_tokens
+from matching.analysis import AnalyzedText
+from matching.features import cv_features
+from matching.matcher import decide
+from services import cpu_tasks
+from services.match_service import MatchService
+from schemas.docs import ParsedDocument
+from settings.settings import settings
+
+_FOOTER = "Резюме обновлено 12 марта 2024 · Контактные данные указаны в начале документа"
+_CONFIDENTIAL = "Конфиденциально. Только для рассмотрения на открытые вакансии компании."
+_EXTRA = [
+    "Хобби", "Горные лыжи, настольные игры, фотография, путешествия по России",
+    "Рекомендации", "Иванов Пётр, руководитель отдела ИТ, АО Технологии, +7 900 000-00-00",
+    "Сидорова Анна, ведущий инженер, ООО ИТ-Сервис, по запросу",
+    "Личная информация", "Дата рождения: 01.01.1990", "Семейное положение: женат, есть дети",
+]
+
+
+def _bloat(rnd: random.Random, text: str) -> str:
+    out = []
+    for i, line in enumerate(text.split("\n")):
+        out.append(line)
+        # колонтитулы страниц и дубли строк таблиц при выгрузке в DOCX
+        if i % 12 == 11:
+            out += [_FOOTER, _CONFIDENTIAL]
+        if rnd.random() < 0.08:
+            out.append(line)
+    return "\n".join(out + _EXTRA)
+
+
+def _pairs(n: int, size: str, bloat: bool, seed: int) -> List[Tuple[str, str, str, ParsedDocument]]:
+    """(резюме, оно же без мусора, текст вакансии, вакансия)."""
+    rnd = random.Random(seed)
+    vacancies = [ParsedDocument(**cpu_tasks.parse_vacancy(make_vacancy(rnd, SIZES[size]))) for _ in range(5)]
+    pairs = []
+    for i in range(n):
+        cv = cpu_tasks.docx_text(make_cv(rnd, SIZES[size]))
+        vac = vacancies[i % len(vacancies)]
+        pairs.append((_bloat(rnd, cv) if bloat else cv, cv, vac.text, vac))
+    return pairs
+
+
+def _prompt_tokens(analyzer: LLMAnalyzer, vacancy: str, resume: str) -> int:
+    return estimate_tokens(analyzer.SYSTEM_PROMPT) + estimate_tokens(
+        analyzer.USER_PROMPT_TEMPLATE.format(vacancy_text=vacancy, resume_text=resume))
+
+
+def _match(vac, text: str):
+    features = cv_features(text)
+    return features, decide(vac, {**features, "text": text, "analysis": AnalyzedText(text)})
+
+
+def _same_features(a, b) -> bool:
+    return (set(a["skills"]) == set(b["skills"]) and a["experience_years"] == b["experience_years"]
+            and a["english_level"] == b["english_level"])
+
+
+def _offline(pairs, builder: PromptBuilder) -> None:
+    """
+    Эталон - мэтчер по чистому резюме (без мусора): сжатый текст должен давать те же признаки
+    и решение. Для сравнения - то же по исходному (замусоренному) тексту: даты в колонтитулах
+    и задублированные строки опыта сбивают и сам мэтчер. С --budget строки с навыками и
+    периодами не режутся, но стаж может разойтись: выкинутая строка перед периодом меняет
+    его разбор (слово в конце строки + год), поэтому бюджет по умолчанию выключен.
+    """
+    analyzer = LLMAnalyzer()
+    before, after, score_diff = [], [], {"raw": [], "compact": []}
+    same_features, same_decision = {"raw": 0, "compact": 0}, {"raw": 0, "compact": 0}
+    for cv_text, clean_text, vac_text, vac_doc in pairs:
+        built = builder.build(vac_text, cv_text)
+        before.append(_prompt_tokens(analyzer, vac_text, cv_text))
+        after.append(_prompt_tokens(analyzer, built.vacancy_text, built.resume_text))
+
+        vac = MatchService.vacancy_input(vac_doc)
+        f0, d0 = _match(vac, clean_text)
+        for name, text in (("raw", cv_text), ("compact", built.resume_text)):
+            f, d = _match(vac, text)
+            same_features[name] += _same_features(f0, f)
+            same_decision[name] += d0["decision"] == d["decision"]
+            score_diff[name].append(abs(d0["score"] - d["score"]))
+
+    n = len(pairs)
+    saved = 1 - sum(after) / sum(before)
+    print(f"prompt tokens (estimate): mean {statistics.mean(before):.0f} -> {statistics.mean(after):.0f}, "
+          f"max {max(before)} -> {max(after)}, saved {saved:.1%}")
+    for name in ("raw", "compact"):
+        print(f"matcher on {name:7} cv vs clean cv: same features {same_features[name]}/{n}, "
+              f"same decision {same_decision[name]}/{n}, |score diff| mean {statistics.mean(score_diff[name]):.4f} "
+              f"max {max(score_diff[name]):.4f}")
+
+
+async def _online(pairs, n: int) -> None:
+    agree, diffs, usage = 0, [], []
+    async with httpx.AsyncClient(timeout=settings.analyzer.timeout_sec) as client:
+        for cv_text, _, vac_text, _ in pairs[:n]:
+            out = []
+            for compact in (False, True):
+                analyzer = LLMAnalyzer()
+                if not compact:
+                    analyzer.prompt_builder = None
+                analyzer.set_data(cv_text, vac_text)
+                ok = await analyzer.analyze(client)
+                out.append((ok, str(analyzer.decision), analyzer.match_percentage, analyzer.prompt_tokens))
+            (ok0, dec0, pct0, tok0), (ok1, dec1, pct1, tok1) = out
+            if not (ok0 and ok1):
+                print("  llm call failed, pair skipped")
+                continue
+            agree += dec0 == dec1
+            diffs.append(abs(float(pct0 or 0) - float(pct1 or 0)))
+            usage.append((tok0, tok1))
+    if usage:
+        print(f"llm: same decision {agree}/{len(usage)}, |match_percentage diff| mean {statistics.mean(diffs):.1f} "
+              f"max {max(diffs):.0f}, prompt_tokens (usage) {statistics.mean(u[0] for u in usage):.0f} -> "
+              f"{statistics.mean(u[1] for u in usage):.0f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--pairs", type=int, default=200)
+    ap.add_argument("--size", choices=sorted(SIZES), default="medium")
+    ap.add_argument("--bloat", action="store_true", help="колонтитулы, дубли строк, хобби/рекомендации/личное")
+    ap.add_argument("--budget", type=int, default=settings.analyzer.prompt_budget_tokens)
+    ap.add_argument("--llm", type=int, default=0, help="проверить реальным LLM на первых N парах")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    pairs = _pairs(args.pairs, args.size, args.bloat, args.seed)
+    print(f"{len(pairs)} pairs, size {args.size}, bloat {args.bloat}, budget {args.budget}")
+    _offline(pairs, PromptBuilder(args.budget))
+    if args.llm:
+        asyncio.run(_online(pairs, args.llm))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Обратный мэтчинг: задержка RequirementIndex.shortlist на реестре в --vacancies вакансий
+и точность top-k - тот же путь, что VacancyService.suggest (candidates, match_vacancies,
+best_k), - против decide по всем вакансиям на реестре поменьше (--check).
+
+Запуск из backend/:
+    python -m benchmarks.skill_index_bench --vacancies 50000 --queries 500 --check 2000
+"""
+import argparse
+import random
+import statistics
+import time
+from typing import Any, Dict, List
+
+from matching.aliases import ALIASES
+from matching.analysis import AnalyzedText
+from matching.features import cv_features
+from matching.matcher import decide
+from matching.skill_index import RequirementIndex, best_k
+from services import cpu_tasks
+
+_WORDS = (
+    "опыт работы разработка сервисов сопровождение пользователей команда проект банк "
+    "сентябрь 2016 — декабрь 2019 январь 2020 - н.в."
+).split()
+
+
+def _vacancy(rnd: random.Random, skills: List[str], words: int) -> Dict[str, Any]:
+    must = rnd.sample(skills, rnd.randint(0, 6))
+    nice = [s for s in rnd.sample(skills, rnd.randint(0, 5)) if s not in must]
+    text = " ".join(rnd.choice(_WORDS + must + nice) for _ in range(words))
+    return {"title": "Vacancy", "description_md": text, "must_have": must, "nice_to_have": nice,
+            "min_years_total": rnd.choice([None, 1, 2, 3, 5])}
+
+
+def _cv(rnd: random.Random, skills: List[str], words: int) -> Dict[str, Any]:
+    aliases = [a for s in rnd.sample(skills, rnd.randint(1, 12)) for a in sorted(ALIASES[s])[:1]]
+    text = " ".join(rnd.choice(_WORDS + aliases) for _ in range(words))
+    return {"text": text, "analysis": AnalyzedText(text), **cv_features(text)}
+
+
+def _top_k(index: RequirementIndex[int], vacs: List[Dict[str, Any]], cv: Dict[str, Any], k: int):
+    # VacancyService.suggest без БД и пула: документы уже в памяти, match_vacancies - в этом процессе
+    keys = index.candidates(set(cv["skills"]), cv["experience_years"], k)
+    return best_k(keys, cpu_tasks.match_vacancies([vacs[i] for i in keys], cv), k), len(keys)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--vacancies", type=int, default=50000)
+    ap.add_argument("--queries", type=int, default=300)
+    ap.add_argument("--check", type=int, default=1000)
+    ap.add_argument("--k", type=int, default=10)
+    args = ap.parse_args()
+
+    rnd = random.Random(0)
+    skills = sorted(ALIASES)
+
+    index: RequirementIndex[int] = RequirementIndex()
+    for i in range(args.vacancies):
+        v = _vacancy(rnd, skills, 0)
+        index.add(i, v["must_have"], v["nice_to_have"], v["min_years_total"])
+    queries = [(set(rnd.sample(skills, rnd.randint(1, 12))), rnd.choice([None, 0.5, 2.0, 4.0, 10.0]))
+               for _ in range(args.queries)]
+    index.shortlist(*queries[0], 50)
+
+    lat = []
+    for q_skills, exp in queries:
+        t0 = time.perf_counter()
+        index.shortlist(q_skills, exp, 4 * (args.k + 1))
+        lat.append((time.perf_counter() - t0) * 1000)
+    lat.sort()
+    print(f"shortlist over {args.vacancies} vacancies: p50 {statistics.median(lat):.2f} ms  "
+          f"p99 {lat[int(len(lat) * 0.99) - 1]:.2f} ms")
+
+    vacs = [_vacancy(rnd, skills, 60) for _ in range(args.check)]
+    small: RequirementIndex[int] = RequirementIndex()
+    for i, v in enumerate(vacs):
+        small.add(i, v["must_have"], v["nice_to_have"], v["min_years_total"])
+    exact, overlap, decided, lat = 0, 0, [], []
+    cvs = [_cv(rnd, skills, 200) for _ in range(30)]
+    for cv in cvs:
+        t0 = time.perf_counter()
+        best, n = _top_k(small, vacs, cv, args.k)
+        lat.append((time.perf_counter() - t0) * 1000)
+        full = sorted(((i, decide(v, cv)) for i, v in enumerate(vacs)), key=lambda kv: -kv[1]["score"])[:args.k]
+        exact += [d["score"] for _, d in best] == [d["score"] for _, d in full]
+        overlap += len({i for i, _ in best} & {i for i, _ in full})
+        decided.append(n)
+    print(f"top-{args.k} exact scores: {exact}/{len(cvs)} CVs, same vacancies {overlap / (len(cvs) * args.k):.1%}, "
+          f"decide calls {statistics.mean(decided):.0f} of {args.check} on average, "
+          f"p50 {statistics.median(lat):.1f} ms, max {max(lat):.1f} ms per CV")
+
+
+if __name__ == "__main__":
+    main()
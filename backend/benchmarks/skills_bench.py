@@ -0,0 +1,116 @@
+"""
+Извлечение навыков: прежний цикл "один regex на канон" против SkillMatcher (один проход по тексту).
+Замеры на текущей таксономии ALIASES и на синтетической в --aliases алиасов; совпадение
+множеств канонов проверяется на всех текстах. Плюс загрузка скомпилированного файла
+(SkillMatcher.load) против построения дерева с нуля.
+
+Запуск из backend/:
+    python -m benchmarks.skills_bench --texts 200 --aliases 10000
+"""
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from typing import Dict, Iterable, List, Mapping, Set
+
+from matching.aliases import ALIASES
+from matching.skills import SkillMatcher
+
+_FILLER = (
+    "опыт работы с пользователями настройка сети сопровождение инфраструктуры "
+    "разработка сервисов проект команда банк отчётность поддержка"
+).split()
+
+
+class LegacyMatcher:
+    """Прежняя реализация normalize_skills: по regex на канон, текст сканируется на каждый."""
+
+    def __init__(self, aliases: Mapping[str, Iterable[str]]):
+        self.pats = {canon: re.compile(r"\b(?:{})\b".format("|".join(map(re.escape, variants))), re.I)
+                     for canon, variants in aliases.items()}
+
+    def skills(self, text: str) -> Set[str]:
+        return {canon for canon, rx in self.pats.items() if rx.search(text)}
+
+
+def _synthetic_taxonomy(n_aliases: int, rnd: random.Random) -> Dict[str, List[str]]:
+    letters = "abcdefghijklmnopqrstuvwxyzабвгдежзиклмнопрстуфхцчшэюя"
+    taxonomy: Dict[str, List[str]] = {canon: sorted(v) for canon, v in ALIASES.items()}
+    total = sum(len(v) for v in taxonomy.values())
+    i = 0
+    while total < n_aliases:
+        base = "".join(rnd.choice(letters) for _ in range(rnd.randint(3, 9)))
+        variants = [base] + [f"{base} {rnd.choice(_FILLER)}" for _ in range(rnd.randint(0, 4))]
+        taxonomy[f"skill_{i}"] = variants
+        total += len(variants)
+        i += 1
+    return taxonomy
+
+
+def _texts(taxonomy: Mapping[str, Iterable[str]], n: int, words: int, rnd: random.Random) -> List[str]:
+    aliases = [v for vs in taxonomy.values() for v in vs]
+    out = []
+    for _ in range(n):
+        parts = []
+        for _ in range(words):
+            r = rnd.random()
+            if r < 0.05:
+                parts.append(rnd.choice(aliases).upper() if rnd.random() < 0.2 else rnd.choice(aliases))
+            else:
+                parts.append(rnd.choice(_FILLER))
+            parts.append(rnd.choice((" ", " ", ", ", ". ", "\n", "/")))
+        out.append("".join(parts))
+    return out
+
+
+def _run(name: str, taxonomy: Mapping[str, Iterable[str]], texts: List[str]) -> None:
+    t0 = time.perf_counter()
+    legacy = LegacyMatcher(taxonomy)
+    t_legacy_build = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    matcher = SkillMatcher(taxonomy)
+    t_build = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    old = [legacy.skills(t) for t in texts]
+    t_old = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = [set(matcher.extract(t)) for t in texts]
+    t_new = time.perf_counter() - t0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "skills.bin")
+        matcher.dump(path)
+        t0 = time.perf_counter()
+        loaded = SkillMatcher.load(path)
+        t_load = time.perf_counter() - t0
+        size = os.path.getsize(path)
+    loaded_mismatches = sum(1 for t in texts if loaded.extract(t) != matcher.extract(t))
+
+    mismatches = sum(1 for a, b in zip(old, new) if a != b)
+    n_aliases = sum(len(list(v)) for v in taxonomy.values())
+    print(f"{name}: {len(taxonomy)} canons / {n_aliases} aliases, {len(texts)} texts, "
+          f"parity {len(texts) - mismatches}/{len(texts)}")
+    print(f"  build   legacy {t_legacy_build * 1000:9.1f} ms   single {t_build * 1000:9.1f} ms"
+          f"   load compiled {t_load * 1000:.1f} ms ({size / 1024:.0f} KiB, mismatches {loaded_mismatches})")
+    print(f"  extract legacy {t_old / len(texts) * 1000:9.3f} ms/text   single {t_new / len(texts) * 1000:9.3f} ms/text"
+          f"   x{t_old / t_new:.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--texts", type=int, default=200)
+    ap.add_argument("--words", type=int, default=1500)
+    ap.add_argument("--aliases", type=int, default=10000)
+    args = ap.parse_args()
+
+    rnd = random.Random(7)
+    _run("ALIASES", ALIASES, _texts(ALIASES, args.texts, args.words, rnd))
+    big = _synthetic_taxonomy(args.aliases, rnd)
+    _run("synthetic", big, _texts(big, max(1, args.texts // 10), args.words, rnd))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Набор замеров разбора и мэтчинга на синтетическом корпусе DOCX (benchmarks/corpus.py):
+на каждую функцию - пропускная способность, перцентили задержки одного вызова и пиковая
+память (tracemalloc, отдельным проходом, чтобы не искажать время).
+
+--json пишет результаты в файл для сравнения прогонов, --baseline печатает изменение
+относительно сохранённого прогона (p50 и пропускная способность).
+
+Из backend/:
+    python -m benchmarks.suite --cvs 200 --vacancies 20 --size medium --json /tmp/bench.json
+    python -m benchmarks.suite --cvs 200 --vacancies 20 --baseline /tmp/bench.json
+    python -m benchmarks.suite --only decide,normalize_skills
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from benchmarks.corpus import make_corpus
+from matching.extract import estimate_total_experience
+from matching.matcher import decide
+from matching.skills import normalize_skills
+from utils.contacts_extract import extract_contacts
+from utils.docx_extract import docx_to_txt
+from utils.vacancy_extract import parse_vacancy_docx_to_profile
+
+# (имя, функция одного вызова, входы)
+Case = Tuple[str, Callable[[Any], Any], Sequence[Any]]
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[i]
+
+
+def measure(fn: Callable[[Any], Any], inputs: Sequence[Any], repeat: int, warmup: int) -> Dict[str, Any]:
+    for x in inputs[:warmup]:
+        fn(x)
+
+    lat: List[float] = []
+    t_start = time.perf_counter()
+    for _ in range(repeat):
+        for x in inputs:
+            t0 = time.perf_counter()
+            fn(x)
+            lat.append(time.perf_counter() - t0)
+    total = time.perf_counter() - t_start
+    lat.sort()
+
+    tracemalloc.start()
+    for x in inputs:
+        fn(x)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "calls": len(lat),
+        "ops_per_sec": round(len(lat) / total, 2) if total else 0.0,
+        "mean_ms": round(sum(lat) / len(lat) * 1000, 4) if lat else 0.0,
+        "p50_ms": round(_percentile(lat, 0.50) * 1000, 4),
+        "p90_ms": round(_percentile(lat, 0.90) * 1000, 4),
+        "p99_ms": round(_percentile(lat, 0.99) * 1000, 4),
+        "max_ms": round(lat[-1] * 1000, 4) if lat else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def build_cases(cvs: List[bytes], vacancies: List[bytes]) -> List[Case]:
+    loop = asyncio.new_event_loop()
+    cv_texts = [loop.run_until_complete(docx_to_txt(d)) for d in cvs]
+    profiles = [parse_vacancy_docx_to_profile(d) for d in vacancies]
+    # каждое резюме против вакансии по кругу: decide без готовых признаков, как в /compare
+    pairs = [(profiles[i % len(profiles)], {"text": t}) for i, t in enumerate(cv_texts)] if profiles else []
+
+    return [
+        ("docx_to_txt", lambda d: loop.run_until_complete(docx_to_txt(d)), cvs),
+        ("parse_vacancy_docx_to_profile", parse_vacancy_docx_to_profile, vacancies),
+        ("extract_contacts", extract_contacts, cv_texts),
+        ("normalize_skills", normalize_skills, cv_texts),
+        ("estimate_total_experience", estimate_total_experience, cv_texts),
+        ("decide", lambda p: decide(*p), pairs),
+    ]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def _print_table(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]] | None) -> None:
+    head = f"{'function':32s} {'ops/s':>10s} {'p50 ms':>9s} {'p90 ms':>9s} {'p99 ms':>9s} {'peak KiB':>10s}"
+    print(head + ("   vs baseline (p50, ops/s)" if baseline else ""))
+    for name, r in results.items():
+        line = (f"{name:32s} {r['ops_per_sec']:10.1f} {r['p50_ms']:9.3f} {r['p90_ms']:9.3f} "
+                f"{r['p99_ms']:9.3f} {r['peak_kib']:10.1f}")
+        base = (baseline or {}).get(name)
+        if base and base.get("p50_ms") and base.get("ops_per_sec"):
+            line += (f"   {(r['p50_ms'] / base['p50_ms'] - 1) * 100:+6.1f}%"
+                     f" {(r['ops_per_sec'] / base['ops_per_sec'] - 1) * 100:+6.1f}%")
+        print(line)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Замеры разбора и мэтчинга")
+    ap.add_argument("--cvs", type=int, default=100)
+    ap.add_argument("--vacancies", type=int, default=10)
+    ap.add_argument("--size", choices=("small", "medium", "large"), default="medium")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--warmup", type=int, default=5)
+    ap.add_argument("--only", default="", help="имена функций через запятую")
+    ap.add_argument("--json", default="", help="куда записать результаты ('-' - stdout)")
+    ap.add_argument("--baseline", default="", help="JSON прошлого прогона для сравнения")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    cvs, vacancies = make_corpus(args.cvs, args.vacancies, args.size, args.seed)
+    print(f"corpus: {len(cvs)} CVs, {len(vacancies)} vacancies ({args.size}) in {time.perf_counter() - t0:.1f} s",
+          file=sys.stderr)
+
+    only = {s.strip() for s in args.only.split(",") if s.strip()}
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, fn, inputs in build_cases(cvs, vacancies):
+        if (only and name not in only) or not inputs:
+            continue
+        results[name] = measure(fn, inputs, args.repeat, args.warmup)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f).get("results", {})
+    _print_table(results, baseline)
+
+    if args.json:
+        report = {
+            "meta": {
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "commit": _git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "corpus": {"cvs": args.cvs, "vacancies": args.vacancies, "size": args.size, "seed": args.seed},
+                "repeat": args.repeat,
+            },
+            "results": results,
+        }
+        if args.json == "-":
+            json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+            print()
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,4 +8,7 @@ else
   echo "[entrypoint] models download failed or skipped, continuing..." >&2
 fi
 
+# схема уже существующей базы (init.sql срабатывает только на пустой)
+python -m infrastructure.db.upgrade
+
 exec uvicorn main:app --host 0.0.0.0 --port "${PORT:-8000}"
\ No newline at end of file
@@ -1,5 +1,6 @@
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine, AsyncSession
 from settings.settings import settings
+import asyncpg
 
 def pg_connection() -> async_sessionmaker[AsyncSession]:
     
@@ -8,3 +9,16 @@ def pg_connection() -> async_sessionmaker[AsyncSession]:
         f"{settings.pg.host}:{settings.pg.port}/{settings.pg.database}"
         )
     return async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+async def pg_listen_connection() -> asyncpg.Connection:
+    """
+    Отдельное "сырое" соединение asyncpg для LISTEN/NOTIFY (в пуле SQLAlchemy его держать нельзя).
+    """
+    return await asyncpg.connect(
+        user=settings.pg.username,
+        password=settings.pg.password,
+        host=settings.pg.host,
+        port=settings.pg.port,
+        database=settings.pg.database,
+    )
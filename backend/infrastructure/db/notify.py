@@ -0,0 +1,69 @@
+from infrastructure.db.connect import pg_listen_connection
+from typing import Dict, Iterable, Set, Tuple
+import asyncio
+import asyncpg
+import logging
+
+
+class PgNotifier:
+    """
+    Одно LISTEN-соединение на процесс: раздаёт NOTIFY ожидающим корутинам
+    (по каналу и payload) и подписчикам канала (очереди).
+    Если соединение не поднялось или упало - ожидающие работают на опросе БД.
+    """
+
+    def __init__(self, channels: Iterable[str]):
+        self.channels = list(channels)
+        self._conn: asyncpg.Connection | None = None
+        self._waiters: Dict[Tuple[str, str], Set[asyncio.Future]] = {}
+        self._queues: Dict[str, Set[asyncio.Queue]] = {}
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def active(self) -> bool:
+        return self._conn is not None and not self._conn.is_closed()
+
+    async def start(self) -> None:
+        try:
+            conn = await pg_listen_connection()
+            for channel in self.channels:
+                await conn.add_listener(channel, self._dispatch)
+            conn.add_termination_listener(lambda _: self.logger.warning("LISTEN connection lost"))
+            self._conn = conn
+        except Exception:
+            self.logger.exception("LISTEN is unavailable, falling back to polling")
+            self._conn = None
+
+    async def stop(self) -> None:
+        if self._conn is not None:
+            try:
+                await self._conn.close()
+            finally:
+                self._conn = None
+
+    def _dispatch(self, conn: asyncpg.Connection, pid: int, channel: str, payload: str) -> None:
+        for fut in self._waiters.pop((channel, payload), ()):
+            if not fut.done():
+                fut.set_result(payload)
+        for queue in self._queues.get(channel, ()):
+            queue.put_nowait(payload)
+
+    def waiter(self, channel: str, payload: str) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((channel, payload), set()).add(fut)
+        return fut
+
+    def discard(self, channel: str, payload: str, fut: asyncio.Future) -> None:
+        waiters = self._waiters.get((channel, payload))
+        if waiters is not None:
+            waiters.discard(fut)
+            if not waiters:
+                del self._waiters[(channel, payload)]
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        self._queues.setdefault(channel, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        self._queues.get(channel, set()).discard(queue)
@@ -0,0 +1,24 @@
+"""
+Доводит существующую базу до текущей схемы (upgrade.sql). Запуск из backend/:
+    python -m infrastructure.db.upgrade
+"""
+import asyncio
+from pathlib import Path
+
+from infrastructure.db.connect import pg_listen_connection
+
+UPGRADE_SQL = Path(__file__).resolve().parents[2] / "upgrade.sql"
+
+
+async def upgrade() -> None:
+    conn = await pg_listen_connection()
+    try:
+        # несколько команд без параметров - одним простым запросом, в одной транзакции
+        async with conn.transaction():
+            await conn.execute(UPGRADE_SQL.read_text(encoding="utf-8"))
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(upgrade())
@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple, TypeVar
+import multiprocessing as mp
+import importlib
+import asyncio
+import logging
+import time
+
+T = TypeVar("T")
+
+
+def _timed(fn: Callable[..., T], args: Tuple[Any, ...]) -> Tuple[T, float]:
+    # выполняется в дочернем процессе: возвращаем и результат, и чистое время вычисления
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def _preload(modules: Tuple[str, ...], initializers: Tuple[Tuple[Callable[..., Any], Tuple[Any, ...]], ...] = ()) -> None:
+    # импорт модулей задач (и компиляция их регулярок) при старте процесса, а не на первом запросе
+    for name in modules:
+        importlib.import_module(name)
+    # настройка состояния процесса (например, файл таксономии навыков) - до первой задачи
+    for fn, args in initializers:
+        fn(*args)
+
+
+def _ping() -> None:
+    return None
+
+
+@dataclass(slots=True)
+class StageStats:
+    calls: int = 0
+    errors: int = 0
+    total_sec: float = 0.0
+    compute_sec: float = 0.0
+    max_sec: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        n = max(1, self.calls)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "avg_ms": round(self.total_sec / n * 1000, 3),
+            "max_ms": round(self.max_sec * 1000, 3),
+            "compute_avg_ms": round(self.compute_sec / n * 1000, 3),
+            # ожидание свободного процесса + передача аргументов/результата
+            "queue_avg_ms": round((self.total_sec - self.compute_sec) / n * 1000, 3),
+        }
+
+
+class CpuExecutor:
+    """
+    Исполнитель CPU-этапов (разбор DOCX, признаки, мэтчер) в пуле процессов, чтобы
+    они не держали GIL и event loop (WebSocket-аудио, стриминг ответов).
+    processes=0 - этапы выполняются в потоке через asyncio.to_thread, как раньше.
+    Функции должны быть верхнего уровня модуля, аргументы и результат - простые данные.
+    """
+
+    def __init__(self, processes: int = 0, start_method: str = "spawn", max_tasks_per_child: int | None = None,
+                 preload: Tuple[str, ...] = ("services.cpu_tasks",),
+                 initializers: Tuple[Tuple[Callable[..., Any], Tuple[Any, ...]], ...] = ()):
+        self.processes = processes
+        self.preload = preload
+        # (функция верхнего уровня, аргументы) - вызываются в каждом процессе пула при старте
+        self.initializers = initializers
+        self.start_method = start_method
+        self.max_tasks_per_child = max_tasks_per_child
+        self._pool: ProcessPoolExecutor | None = None
+        self._stats: Dict[str, StageStats] = {}
+        self.logger = logging.getLogger(__name__)
+
+    def _make_pool(self) -> ProcessPoolExecutor:
+        # spawn: дочерние процессы не наследуют потоки torch/asyncio родителя
+        kwargs: Dict[str, Any] = {}
+        if self.max_tasks_per_child and self.start_method != "fork":
+            kwargs["max_tasks_per_child"] = self.max_tasks_per_child
+        return ProcessPoolExecutor(max_workers=self.processes, mp_context=mp.get_context(self.start_method),
+                                   initializer=_preload, initargs=(self.preload, self.initializers), **kwargs)
+
+    async def start(self) -> None:
+        """
+        Создаёт пул и поднимает процессы заранее, чтобы первый запрос не платил за их старт.
+        """
+        if self.processes <= 0 or self._pool is not None:
+            return
+        self._pool = self._make_pool()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*[loop.run_in_executor(self._pool, _ping) for _ in range(self.processes)])
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def run(self, stage: str, fn: Callable[..., T], *args: Any) -> T:
+        """
+        Выполняет fn(*args) вне event loop и учитывает время в статистике этапа stage.
+        """
+        st = self._stats.setdefault(stage, StageStats())
+        t0 = time.perf_counter()
+        try:
+            if self.processes <= 0:
+                result, compute = await asyncio.to_thread(_timed, fn, args)
+            else:
+                if self._pool is None:
+                    self._pool = self._make_pool()
+                pool = self._pool
+                try:
+                    result, compute = await asyncio.get_running_loop().run_in_executor(pool, _timed, fn, args)
+                except BrokenProcessPool:
+                    # процесс умер (OOM, segfault в парсере) - следующий вызов получит новый пул
+                    self.logger.error("process pool is broken on stage %s, recreating", stage)
+                    if self._pool is pool:
+                        self._pool = None
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+        except Exception:
+            st.errors += 1
+            raise
+
+        elapsed = time.perf_counter() - t0
+        st.calls += 1
+        st.total_sec += elapsed
+        st.compute_sec += compute
+        st.max_sec = max(st.max_sec, elapsed)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "processes": self.processes,
+            "stages": {name: st.as_dict() for name, st in self._stats.items()},
+        }
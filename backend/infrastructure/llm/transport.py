@@ -0,0 +1,322 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+import asyncio
+import logging
+import random
+import threading
+import time
+
+import httpx
+
+from settings.settings import settings
+
+T = TypeVar("T")
+
+# сколько последних попыток на endpoint держим для перцентилей
+_WINDOW = 512
+# перцентиль для хеджирования считаем не раньше, чем наберётся столько удачных попыток
+_MIN_SAMPLES = 20
+
+
+@dataclass(frozen=True)
+class Endpoint:
+    url: str
+    model: str
+    api_key: str = field(default="", repr=False, compare=False)
+
+    @property
+    def name(self) -> str:
+        return f"{self.model}@{self.url}"
+
+
+class CircuitOpenError(Exception):
+    """Предохранитель открыт на всех endpoint'ах - запрос не отправлялся."""
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Имеет ли смысл повтор: таймауты, обрывы соединения, 429 и 5xx. Ошибки клиента (4xx,
+    невалидный ответ) повтор не исправит. Понимает httpx и исключения SDK openai/langchain
+    (по status_code и имени класса - без импорта SDK).
+    """
+    if isinstance(exc, (httpx.TimeoutException, httpx.TransportError, TimeoutError, ConnectionError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return type(exc).__name__.endswith(("TimeoutError", "ConnectionError"))
+
+
+class CircuitBreaker:
+    """
+    Предохранитель endpoint'а: после failures подряд неудач (повторяемых) открывается и
+    reset_sec не пропускает запросы, затем пропускает одну пробную попытку - удачная
+    закрывает его, неудачная открывает снова.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failures: int = 5, reset_sec: float = 30.0):
+        self.failures = failures
+        self.reset_sec = reset_sec
+        self.state = self.CLOSED
+        self._count = 0
+        self._opened_at = 0.0
+        self._probe = False
+        # интервьюер вызывает модель синхронно - не обязательно из потока event loop
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_sec:
+                self.state, self._probe = self.HALF_OPEN, False
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.HALF_OPEN and not self._probe:
+                self._probe = True
+                return True
+            return False
+
+    def success(self) -> None:
+        with self._lock:
+            self.state, self._count, self._probe = self.CLOSED, 0, False
+
+    def failure(self) -> None:
+        with self._lock:
+            self._count += 1
+            if self.state == self.HALF_OPEN or self._count >= self.failures:
+                self.state, self._opened_at, self._probe = self.OPEN, time.monotonic(), False
+
+    def release(self) -> None:
+        # попытка отменена (проиграла хедж) - ни успех, ни неудача; пробу можно повторить
+        with self._lock:
+            self._probe = False
+
+
+class _EndpointState:
+    def __init__(self, breaker: CircuitBreaker):
+        self.breaker = breaker
+        self.outcomes: Dict[str, int] = {}
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+        self.rejected = 0
+        # (исход, латентность) последних попыток
+        self.attempts: Deque[tuple] = deque(maxlen=_WINDOW)
+
+    def record(self, outcome: str, latency: float) -> None:
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+        self.attempts.append((outcome, latency))
+
+    def percentile(self, q: float, outcome: str = "ok") -> Optional[float]:
+        values = sorted(lat for o, lat in self.attempts if o == outcome)
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def as_dict(self) -> Dict[str, Any]:
+        ms = lambda v: round(v * 1000, 1) if v is not None else None
+        return {
+            "breaker": self.breaker.state,
+            "attempts": dict(self.outcomes),
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "rejected_open": self.rejected,
+            "ok_p50_ms": ms(self.percentile(0.5)),
+            "ok_p90_ms": ms(self.percentile(0.9)),
+            "ok_p99_ms": ms(self.percentile(0.99)),
+            "error_p50_ms": ms(self.percentile(0.5, "error")),
+        }
+
+
+# состояние по endpoint'ам общее для всех транспортов процесса: анализатор и интервьюер,
+# идущие в один и тот же upstream, видят один предохранитель и одну статистику
+_states: Dict[str, _EndpointState] = {}
+_states_lock = threading.Lock()
+
+
+def _state(endpoint: Endpoint, failures: int, reset_sec: float) -> _EndpointState:
+    with _states_lock:
+        st = _states.get(endpoint.name)
+        if st is None:
+            st = _states[endpoint.name] = _EndpointState(CircuitBreaker(failures, reset_sec))
+        return st
+
+
+def endpoint_stats() -> Dict[str, Dict[str, Any]]:
+    """Статистика попыток по endpoint'ам (для /llm/stats)."""
+    with _states_lock:
+        return {name: st.as_dict() for name, st in _states.items()}
+
+
+class LlmTransport:
+    """
+    Политика вызовов LLM поверх любой функции попытки attempt(endpoint):
+    - повторы повторяемых ошибок (is_retryable) с экспоненциальной паузой и полным джиттером;
+    - хеджирование (только call): если попытка не ответила дольше hedge_percentile удачных
+      попыток endpoint'а, параллельно уходит дубль - на alternate, если задан, - и побеждает
+      первый ответ, второй отменяется;
+    - предохранитель на endpoint: при открытом запрос сразу уходит на alternate или
+      завершается CircuitOpenError, не занимая воркер на таймаут.
+    Латентность и исход каждой попытки пишутся в статистику endpoint'а (endpoint_stats).
+    """
+
+    def __init__(self, primary: Endpoint, alternate: Endpoint | None = None, retries: int = 2,
+                 backoff_base_sec: float = 0.5, backoff_max_sec: float = 8.0,
+                 hedge_percentile: float | None = None, hedge_min_delay_sec: float = 1.0,
+                 breaker_failures: int = 5, breaker_reset_sec: float = 30.0):
+        self.primary = primary
+        self.alternate = alternate
+        self.retries = retries
+        self.backoff_base_sec = backoff_base_sec
+        self.backoff_max_sec = backoff_max_sec
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_sec = hedge_min_delay_sec
+        self._breaker = (breaker_failures, breaker_reset_sec)
+        self.logger = logging.getLogger(__name__)
+
+    def _st(self, endpoint: Endpoint) -> _EndpointState:
+        return _state(endpoint, *self._breaker)
+
+    def _backoff(self, retry: int) -> float:
+        return random.uniform(0, min(self.backoff_max_sec, self.backoff_base_sec * 2 ** (retry - 1)))
+
+    def _pick(self, prefer_alternate: bool = False) -> Endpoint | None:
+        order = [self.primary, self.alternate]
+        if prefer_alternate:
+            order.reverse()
+        for ep in order:
+            if ep is None:
+                continue
+            st = self._st(ep)
+            if st.breaker.allow():
+                return ep
+            st.rejected += 1
+        return None
+
+    def _hedge_delay(self, endpoint: Endpoint) -> float | None:
+        if self.hedge_percentile is None:
+            return None
+        st = self._st(endpoint)
+        if sum(1 for o, _ in st.attempts if o == "ok") < _MIN_SAMPLES:
+            return None
+        return max(self.hedge_min_delay_sec, st.percentile(self.hedge_percentile))
+
+    def _done(self, st: _EndpointState, t0: float, exc: BaseException | None) -> None:
+        latency = time.monotonic() - t0
+        if exc is None:
+            st.breaker.success()
+            st.record("ok", latency)
+        elif isinstance(exc, asyncio.CancelledError):
+            st.breaker.release()
+            st.record("cancelled", latency)
+        elif is_retryable(exc):
+            st.breaker.failure()
+            st.record("error", latency)
+        else:
+            # upstream ответил (4xx, невалидный ответ) - он жив
+            st.breaker.success()
+            st.record("client_error", latency)
+
+    async def _timed(self, endpoint: Endpoint, attempt: Callable[[Endpoint], Awaitable[T]]) -> T:
+        st, t0 = self._st(endpoint), time.monotonic()
+        try:
+            result = await attempt(endpoint)
+        except BaseException as e:
+            self._done(st, t0, e)
+            raise
+        self._done(st, t0, None)
+        return result
+
+    def _spawn(self, endpoint: Endpoint, attempt: Callable[[Endpoint], Awaitable[T]]) -> asyncio.Future:
+        task = asyncio.ensure_future(self._timed(endpoint, attempt))
+        # ошибка проигравшей попытки никому не нужна - забираем, чтобы asyncio не ругался
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
+
+    async def _hedged(self, attempt: Callable[[Endpoint], Awaitable[T]], hedge: bool) -> T:
+        endpoint = self._pick()
+        if endpoint is None:
+            raise CircuitOpenError("LLM недоступна: предохранитель открыт")
+        first = self._spawn(endpoint, attempt)
+        tasks = {first: endpoint}
+        try:
+            delay = self._hedge_delay(endpoint) if hedge else None
+            if delay is not None:
+                done, _ = await asyncio.wait([first], timeout=delay)
+                if not done:
+                    backup = self._pick(prefer_alternate=True)
+                    if backup is not None:
+                        self._st(endpoint).hedges += 1
+                        tasks[self._spawn(backup, attempt)] = backup
+            error: BaseException | None = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._st(endpoint).hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def call(self, attempt: Callable[[Endpoint], Awaitable[T]], hedge: bool = True) -> T:
+        """
+        attempt(endpoint) - одна попытка: результат или исключение. hedge=False - без дублей
+        (например, потоковый ответ, части которого уже отданы наружу).
+        """
+        for retry in range(self.retries + 1):
+            if retry:
+                self._st(self.primary).retries += 1
+                await asyncio.sleep(self._backoff(retry))
+            try:
+                return await self._hedged(attempt, hedge)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                if not is_retryable(e) or retry == self.retries:
+                    raise
+                self.logger.warning("LLM attempt failed (%s), retry %d/%d", e, retry + 1, self.retries)
+        raise AssertionError("unreachable")
+
+    def call_sync(self, attempt: Callable[[Endpoint], T]) -> T:
+        """То же для синхронных клиентов (интервьюер): повторы и предохранитель, без хеджирования."""
+        for retry in range(self.retries + 1):
+            if retry:
+                self._st(self.primary).retries += 1
+                time.sleep(self._backoff(retry))
+            endpoint = self._pick()
+            if endpoint is None:
+                raise CircuitOpenError("LLM недоступна: предохранитель открыт")
+            st, t0 = self._st(endpoint), time.monotonic()
+            try:
+                result = attempt(endpoint)
+            except Exception as e:
+                self._done(st, t0, e)
+                if not is_retryable(e) or retry == self.retries:
+                    raise
+                self.logger.warning("LLM attempt failed (%s), retry %d/%d", e, retry + 1, self.retries)
+                continue
+            self._done(st, t0, None)
+            return result
+        raise AssertionError("unreachable")
+
+    @classmethod
+    def from_settings(cls, primary: Endpoint) -> "LlmTransport":
+        cfg = settings.llm
+        alternate = None
+        if cfg.alt_url or cfg.alt_model:
+            alternate = Endpoint(cfg.alt_url or primary.url, cfg.alt_model or primary.model,
+                                 cfg.alt_api_key or primary.api_key)
+        return cls(primary, alternate, retries=cfg.retries, backoff_base_sec=cfg.backoff_base_sec,
+                   backoff_max_sec=cfg.backoff_max_sec, hedge_percentile=cfg.hedge_percentile,
+                   hedge_min_delay_sec=cfg.hedge_min_delay_sec, breaker_failures=cfg.breaker_failures,
+                   breaker_reset_sec=cfg.breaker_reset_sec)
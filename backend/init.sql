@@ -3,9 +3,89 @@ CREATE TABLE "user"(
     summary TEXT,
     meta TEXT,
     hard_topics JSONB NOT NULL DEFAULT '[]'::jsonb,
-    soft_topics JSONB NOT NULL DEFAULT '[]'::jsonb
+    soft_topics JSONB NOT NULL DEFAULT '[]'::jsonb,
+    pending JSONB,
+    claimed_at TIMESTAMPTZ
 );
 
 ALTER TABLE "user"
 ADD CONSTRAINT hard_topics_is_array CHECK (jsonb_typeof(hard_topics) = 'array');
-ADD CONSTRAINT soft_topics_is_array CHECK (jsonb_typeof(soft_topics) = 'array');
\ No newline at end of file
+ADD CONSTRAINT soft_topics_is_array CHECK (jsonb_typeof(soft_topics) = 'array');
+
+CREATE TABLE compare_cache(
+    key TEXT PRIMARY KEY,
+    response JSONB NOT NULL,
+    interview JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX compare_cache_expires_at_idx ON compare_cache(expires_at);
+
+CREATE TABLE vacancy(
+    id UUID PRIMARY KEY,
+    title TEXT NOT NULL,
+    profile JSONB NOT NULL,
+    text TEXT NOT NULL,
+    features JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE vacancy_text(
+    text_hash TEXT PRIMARY KEY,
+    text_z BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE cv_features(
+    id UUID PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    text_z BYTEA NOT NULL,
+    contacts JSONB NOT NULL DEFAULT '{}'::jsonb,
+    skills TEXT[] NOT NULL DEFAULT '{}',
+    experience_years DOUBLE PRECISION,
+    english_level TEXT,
+    features_version TEXT NOT NULL,
+    minhash BYTEA,
+    bm25_tf JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE job(
+    id UUID PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    cv BYTEA,
+    vacancy BYTEA,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    locked_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX job_queued_idx ON job(created_at) WHERE status = 'queued';
+CREATE INDEX job_running_idx ON job(locked_at) WHERE status = 'running';
+
+CREATE TABLE embedding(
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (model, text_hash)
+);
+
+CREATE TABLE bulk_result(
+    run_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    vacancy TEXT NOT NULL,
+    decision TEXT,
+    score DOUBLE PRECISION,
+    result JSONB NOT NULL,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (run_id, file, vacancy)
+);
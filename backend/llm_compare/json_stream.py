@@ -0,0 +1,137 @@
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# внутри строки важны только кавычка и экранирование, вне строки - структурные символы
+_STRING_RX = re.compile(r'["\\]')
+_VALUE_RX = re.compile(r'["{}\[\],]')
+
+_START, _KEY, _KEY_STRING, _COLON, _VALUE_START, _VALUE, _END = range(7)
+
+
+class IncrementalJsonParser:
+    """
+    Потоковый разбор JSON-объекта верхнего уровня по кускам текста (ответ LLM в режиме stream).
+    feed() возвращает поля, значения которых завершились в этом куске, - (ключ, значение)
+    в порядке появления; готовые поля копятся в fields. Текст до первой "{" (```json и т.п.)
+    пропускается. Каждый символ просматривается один раз: незавершённая строка не
+    пересканируется с начала при следующем куске.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._key: str | None = None
+        self._start = 0
+        self._depth = 0
+        self._in_string = False
+
+    def _scan_string(self) -> bool:
+        # _pos внутри строки; True - дошли до закрывающей кавычки (_pos сразу за ней)
+        buf = self._buf
+        while True:
+            m = _STRING_RX.search(buf, self._pos)
+            if m is None:
+                self._pos = len(buf)
+                return False
+            if m.group() == "\\":
+                if m.end() >= len(buf):
+                    self._pos = m.start()
+                    return False
+                self._pos = m.end() + 1
+                continue
+            self._pos = m.end()
+            return True
+
+    def _skip_ws(self) -> bool:
+        buf, pos = self._buf, self._pos
+        while pos < len(buf) and buf[pos] in " \t\r\n":
+            pos += 1
+        self._pos = pos
+        return pos < len(buf)
+
+    def _finish_value(self, end: int) -> Tuple[str, Any]:
+        value = json.loads(self._buf[self._start:end])
+        self.fields[self._key] = value
+        return self._key, value
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Добавляет кусок текста. ValueError - текст не JSON-объект."""
+        if self.done:
+            return []
+        self._buf += chunk
+        out: List[Tuple[str, Any]] = []
+        while self._pos < len(self._buf):
+            buf = self._buf
+            if self._state == _START:
+                i = buf.find("{", self._pos)
+                if i < 0:
+                    self._pos = len(buf)
+                    break
+                self._pos = i + 1
+                self._state = _KEY
+            elif self._state == _KEY:
+                # уже разобранное не нужно - буфер не растёт на длинных ответах
+                self._buf, self._pos = buf[self._pos:], 0
+                if not self._skip_ws():
+                    break
+                c = self._buf[self._pos]
+                if c == '"':
+                    self._start = self._pos
+                    self._pos += 1
+                    self._state = _KEY_STRING
+                elif c == "}":
+                    self._pos += 1
+                    self._state = _END
+                elif c == ",":
+                    self._pos += 1
+                else:
+                    raise ValueError(f"ожидался ключ, получено {c!r}")
+            elif self._state == _KEY_STRING:
+                if not self._scan_string():
+                    break
+                self._key = json.loads(buf[self._start:self._pos])
+                self._state = _COLON
+            elif self._state == _COLON:
+                if not self._skip_ws():
+                    break
+                if buf[self._pos] != ":":
+                    raise ValueError(f"ожидалось ':', получено {buf[self._pos]!r}")
+                self._pos += 1
+                self._state = _VALUE_START
+            elif self._state == _VALUE_START:
+                if not self._skip_ws():
+                    break
+                self._start, self._depth, self._in_string = self._pos, 0, False
+                self._state = _VALUE
+            elif self._state == _VALUE:
+                if self._in_string:
+                    if not self._scan_string():
+                        break
+                    self._in_string = False
+                    continue
+                m = _VALUE_RX.search(buf, self._pos)
+                if m is None:
+                    self._pos = len(buf)
+                    break
+                c, self._pos = m.group(), m.end()
+                if c == '"':
+                    self._in_string = True
+                elif c in "{[":
+                    self._depth += 1
+                elif self._depth > 0 and c in "}]":
+                    self._depth -= 1
+                elif self._depth == 0 and c in ",}":
+                    out.append(self._finish_value(m.start()))
+                    self._state = _KEY if c == "," else _END
+                elif self._depth == 0:
+                    raise ValueError(f"лишний {c!r} в значении {self._key!r}")
+            else:
+                self.done = True
+                break
+        if self._state == _END:
+            self.done = True
+        return out
@@ -1,7 +1,19 @@
 import time
 import httpx
 import json
+from typing import Any, Callable
 from settings.settings import settings
+from schemas.docs import ParsedDocument
+from llm_compare.json_stream import IncrementalJsonParser
+from llm_compare.prompt_builder import PromptBuilder, estimate_tokens
+from infrastructure.llm.transport import Endpoint, LlmTransport
+
+# вызывается по завершении каждого поля ответа верхнего уровня: (имя поля, значение)
+FieldCallback = Callable[[str, Any], None]
+
+
+class StreamInterruptedError(Exception):
+    """Поток оборвался после того, как часть полей уже отдана в on_field, - не повторяем."""
 
 
 """
@@ -10,6 +22,8 @@ analyzer = LLMAnalyzer(api_key=API_KEY)
 analyzer.set_data(resume, vacancy)
 
 if analyzer.analyze(): // Отображение результата в формате json. Можно просто обращаться к полям объекта класса
+  if analyzer.decision == "True": // темы интервью, meta и сжатые копии - вторым вызовом
+    analyzer.prepare_interview()
   results = analyzer.get_results()
   print(json.dumps(results, ensure_ascii=False, indent=2))
 """
@@ -53,8 +67,19 @@ class LLMAnalyzer:
         self.prompt_tokens = 0
         self.completion_tokens = 0
         self.speed_tokens_per_second = 0
+        self.first_token_seconds = 0 # только в режиме stream
+        # оценка токенов промпта до и после PromptBuilder (estimate_tokens, не usage провайдера)
+        self.prompt_tokens_original = 0
+        self.prompt_tokens_final = 0
+        self.prompt_dropped_sections = []
+
+        self.prompt_builder = (PromptBuilder(settings.analyzer.prompt_budget_tokens)
+                               if settings.analyzer.prompt_compact else None)
+
+        # повторы, дубли и предохранитель вызовов (settings.llm)
+        self.transport = LlmTransport.from_settings(Endpoint(settings.analyzer.url, self.model_name, self.api_key))
         
-        # Системный промт 
+        # Системный промт вердикта: первый вызов - короткий ответ, его ждёт /compare
         self.SYSTEM_PROMPT = """
 # ROLE
 Ты — AI-рекрутер. Твоя задача — проанализировать текст резюме и текст вакансии, чтобы принять обоснованное решение о допуске кандидата на собеседование.
@@ -72,26 +97,55 @@ class LLMAnalyzer:
     -   Если процент >= 70% -> доступ на собеседование **TRUE**.
     -   Если процент < 70% -> доступ **FALSE**.
 4.  **ФИДБЕК:** Сгенерируй два текста:
-    -   **Аргументация:** Детальный отчет для рекрутера с ходом мыслей.
+    -   **Аргументация:** Краткий отчет для рекрутера с ходом мыслей.
     -   **Видбек:** Краткая, вежливая и конструктивная выжимка для кандидата (3-4 предложения).
-5.   **ТЕМЫ ДЛЯ СОБЕСЕДОВАНИЯ:**
-    -   Если решение "Доступ на собеседование предоставлен" -> сгенерируй 20 тем для обсуждения на интервью.
+
+# ФОРМАТ ОТВЕТА
+Верни ответ ТОЛЬКО в виде JSON-объекта со следующей структурой. Никакого другого текста.
+"""
+       # Пользовательский промт
+        self.USER_PROMPT_TEMPLATE = """
+Проведи анализ и сгенерируй отчет на основе предоставленных текстов.
+
+**ТЕКСТ ВАКАНСИИ:**
+{vacancy_text}
+
+**ТЕКСТ РЕЗЮМЕ:**
+{resume_text}
+
+**СГЕНЕРИРУЙ ОТЧЕТ СЛЕДУЮЩЕГО ВИДА:**
+{{
+  "vacancy_title":"Название вакансии c БОЛЬШОЙ буквы",
+  "decision": "True", // Или "False",
+  "match_percentage": 75, // Рассчитанный процент соответствия (целое число),
+  "reasoning_report": "Развернутый текст на 3-5 предложений. Аргументируй решение: главные strengths кандидата, ключевые пробелы (gaps), как были применены веса критериев.",
+  "candidate_feedback": "Краткий видбек для кандидата (3-4 предложения). Вежливый и конструктивный. Если доступ предоставлен — сообщи об этом и укажи сильные стороны. Если нет — вежливо откажи, укажи ДВЕ - ТРИ главных причины и дай рекомендацию для улучшения (например, 'Рекомендуем обратить внимание на изучение Kubernetes')."
+  }}
+"""
+        # Системный промт материалов интервью: второй вызов, только для допущенных кандидатов
+        self.INTERVIEW_SYSTEM_PROMPT = """
+# ROLE
+Ты — AI-рекрутер. Кандидат по резюме уже допущен на собеседование с вакансией. Твоя задача — подготовить материалы для собеседования.
+
+# ИНСТРУКЦИИ
+1.   **ТЕМЫ ДЛЯ СОБЕСЕДОВАНИЯ:**
+    -   Сгенерируй 20 тем для обсуждения на интервью.
     -   **Формат:** 10 тем по hard skills + 10 тем по soft skills.
     -   **Hard skills вопросы:** Должны проверять общие профессиональные компетенции и умения.
     -   **Soft skills вопросы:** Должны оценивать личностные качества, коммуникативные навыки и teamwork.
     -   **Баланс тем для Hard skills:**
-        -   5 тем на обнаружение  **наиболее слабых мест или пробелов** кандидата, выявленных во время анализа.
+        -   5 тем на обнаружение  **наиболее слабых мест или пробелов** кандидата (сопоставь резюме с требованиями вакансии, учти итоги отбора).
         -   2 темы на выявление *противоречий с резюме и красных флагов* в процессе собеседования.\
         -   3 общих темы, соответствующих вакансии.
      -   **Баланс тем для Soft skills:**
-        -   3 тем на обнаружение  **наиболее слабых мест или пробелов** кандидата, выявленных во время анализа.
+        -   3 тем на обнаружение  **наиболее слабых мест или пробелов** кандидата.
         -   7 общих темы, соответствующих вакансии.
     -   **Конкретность:** Темы должны быть конкретными и проверяемыми, охватывать разные аспекты резюме и требований вакансии.
-6.  **ОСНОВНАЯ ИНФОРМАЦИЯ О ВАКАНСИИ:**
+2.  **ОСНОВНАЯ ИНФОРМАЦИЯ О ВАКАНСИИ:**
     -   Извлеки основные атрибуты вакансии в структурированном виде. Вот *ЧЕТКИЙ И ОГРАНИЧЕННЫЙ* список полей, из которых нужно извлечь информацию: Название, Город, Тип трудового, График работы, Доход, Оклад макс., Оклад мин., Годовая премия, Тип премирования, Уровень образования, Требуемый опыт работы, Навыки работы на компьютере, Знание иностранных языков, Уровень владения языками, Наличие командировок, Дополнительная информация
     -   **Формат:** "СВЯЗНЫЙ РАЗВЕРНУТЫЙ ТЕКСТ в формате живой речи". Представь, что ты *сообщаешь основные требования кандидату в процессе собеседования*. *НЕ ИСПОЛЬЗУЙ ОБРАЩЕНИЯ*, просто озвучивай информацию. Ячейки, где данные отсутсвуют, *НЕ ВКЛЮЧАЙ* в итоговы ответ.
     -   **Фокус:** *НЕ АНАЛИЗИРУЙ И НЕ ФАНТАЗРУЙ*, строго извлекай данные из соответсвующих ячеек - если ячейка пустая, пропускай. Используй **ТОЛЬКО РУССКИЕ** буквы, англицизмы **ЗАМЕНЯЙ РУССКИМИ АНАЛОГАМИ** (Пример, python = питон/пайтон),
-7.  **СЖАТЫЕ КОПИИ РЕЗЮМЕ И ВАКАНСИИ ДЛЯ СЛЕДУЮЩЕГО ЭТАПА:**,
+3.  **СЖАТЫЕ КОПИИ РЕЗЮМЕ И ВАКАНСИИ ДЛЯ СЛЕДУЮЩЕГО ЭТАПА:**,
     -   Подготовь сжатые представления РЕЗЮМЕ и ВАКАНСИИ для этапа собеседования.
     -   **Степень сжатия:** Адаптивная. Определи на основе богатства опыта (для РЕЗЮМЕ) и списка требований (для ВАКАНСИИ).
     -   **При обработке РЕЗЮМЕ обрати внимание**:
@@ -99,14 +153,13 @@ class LLMAnalyzer:
         -   Для простых или коротких резюме -> более сильное сжатие (сжатие на 30 - 40 %)
         -   РЕЗЮМЕ *ПОСЛЕ* сжатия должно содержать *НЕ МЕНЕЕ 30%* символов от *ИЗНАЧАЛЬНОЙ* версии.
     -   **Формат:** Текст в формате структурированного списка. 
-    -   **Фокус:** Сохрани всё, что важно для оценки квалификации и проведения собеседования. Обращай внимание на *ключевые навыки, опыт и технологии, важные для собеседования* (для РЕЗЮМЕ) и *основные требования и обязанности* (для ВАКАНСИИ). Делай акцент на том, что ты *посчитал важным на этапе резюме и вакансии*.
+    -   **Фокус:** Сохрани всё, что важно для оценки квалификации и проведения собеседования. Обращай внимание на *ключевые навыки, опыт и технологии, важные для собеседования* (для РЕЗЮМЕ) и *основные требования и обязанности* (для ВАКАНСИИ).
 
 # ФОРМАТ ОТВЕТА
 Верни ответ ТОЛЬКО в виде JSON-объекта со следующей структурой. Никакого другого текста.
 """
-       # Пользовательский промт
-        self.USER_PROMPT_TEMPLATE = """
-Проведи анализ и сгенерируй отчет на основе предоставленных текстов.
+        self.INTERVIEW_PROMPT_TEMPLATE = """
+Подготовь материалы для собеседования на основе предоставленных текстов.
 
 **ТЕКСТ ВАКАНСИИ:**
 {vacancy_text}
@@ -114,17 +167,16 @@ class LLMAnalyzer:
 **ТЕКСТ РЕЗЮМЕ:**
 {resume_text}
 
-**СГЕНЕРИРУЙ ОТЧЕТ СЛЕДУЮЩЕГО ВИДА:**
+**ИТОГИ ОТБОРА:**
+Процент соответствия: {match_percentage}
+{candidate_feedback}
+
+**СГЕНЕРИРУЙ МАТЕРИАЛЫ СЛЕДУЮЩЕГО ВИДА:**
 {{
-  "vacancy_title":"Название вакансии c БОЛЬШОЙ буквы",
-  "decision": "True", // Или "False",
-  "match_percentage": 75, // Рассчитанный процент соответствия (целое число),
-  "reasoning_report": "Детальный развернутый текст на 5-10 предложений. Аргументируй решение. Укажи: 1) Главные strengths кандидата, соотнесенные с требованиями. 2) Ключевые пробелы (gaps), которые повлияли на решение. 3) Как были применены веса критериев при оценке. 4) Общую логику вывода процента.",
-  "candidate_feedback": "Краткий видбек для кандидата (3-4 предложения). Вежливый и конструктивный. Если доступ предоставлен — сообщи об этом и укажи сильные стороны. Если нет — вежливо откажи, укажи ДВЕ - ТРИ главных причины и дай рекомендацию для улучшения (например, 'Рекомендуем обратить внимание на изучение Kubernetes').",
-  "hard_interview_topics": [{{"name": "Краткое название темы1", "type": TopicType.HARD_SKILL}}, {{"name": "Краткое название темы2", "type": TopicType.HARD_SKILL}}], // ЗАПОЛНЯТЬ ТОЛЬКО ЕСЛИ ДОСТУП ПРЕДОСТАВЛЕН. Иначе - пустой массив [],
-  "soft_interview_topics":[{{"name": "Краткое название темы1", "type": TopicType.SOFT_SKILL}}, {{"name": "Краткое название темы2", "type": TopicType.SOFT_SKILL}}], // ЗАПОЛНЯТЬ ТОЛЬКО ЕСЛИ ДОСТУП ПРЕДОСТАВЛЕН. Иначе - пустой массив [],
+  "hard_interview_topics": [{{"name": "Краткое название темы1", "type": TopicType.HARD_SKILL}}, {{"name": "Краткое название темы2", "type": TopicType.HARD_SKILL}}],
+  "soft_interview_topics":[{{"name": "Краткое название темы1", "type": TopicType.SOFT_SKILL}}, {{"name": "Краткое название темы2", "type": TopicType.SOFT_SKILL}}],
   "vacancy_meta":"*СВЯЗНЫЙ* текст в формате *ЖИВОГО* общения",
-  "compressed_data": "РЕЗЮМЕ\n- Ключевой навык 1 с контекстом\n- Ключевой навык 2 с контекстом\n- Основной опыт работы\ВАКАНСИЯ\n- Основное требование 1\n- Основное требование 2\n- Ключевая обязанность"".
+  "compressed_data": "РЕЗЮМЕ\n- Ключевой навык 1 с контекстом\n- Ключевой навык 2 с контекстом\n- Основной опыт работы\nВАКАНСИЯ\n- Основное требование 1\n- Основное требование 2\n- Ключевая обязанность"
   }}
 """
     def set_data(self, resume_text: str, vacancy_text: str):
@@ -138,6 +190,16 @@ class LLMAnalyzer:
         self.resume_text = resume_text
         self.vacancy_text = vacancy_text
 
+    def set_documents(self, cv: ParsedDocument, vacancy: ParsedDocument):
+        """
+        Установка данных из уже распарсенных документов (текст должен быть извлечён).
+
+        Args:
+            cv (ParsedDocument): Распарсенное резюме
+            vacancy (ParsedDocument): Распарсенная вакансия
+        """
+        self.set_data(cv.text, vacancy.text)
+
     def set_weights(self, hard_weight: float, soft_weight: float):
       """
         Установка весов для навыков.
@@ -150,9 +212,18 @@ class LLMAnalyzer:
       self.hard_weight = hard_weight
       self.soft_weight = soft_weight
     
-    async def analyze(self, client: httpx.AsyncClient | None = None) -> bool:
+    async def analyze(self, client: httpx.AsyncClient | None = None, timeout: float | None = None,
+                      on_field: FieldCallback | None = None) -> bool:
         """
-        Запуск анализа соответствия резюме и вакансии.
+        Запуск анализа соответствия резюме и вакансии - только вердикт (решение, процент, фидбек),
+        небольшой ответ (settings.analyzer.verdict_max_tokens). Темы интервью, meta и сжатые копии -
+        отдельным вызовом prepare_interview, только для допущенных кандидатов.
+
+        Args:
+            client (httpx.AsyncClient | None): Общий http-клиент
+            timeout (float | None): Таймаут запроса к LLM, секунд (None - таймаут клиента)
+            on_field (FieldCallback | None): Колбэк готовых полей ответа. В режиме stream
+                (settings.analyzer.stream) вызывается по мере генерации; иначе - все поля после ответа
 
         Returns:
             bool: True если анализ успешен, False если произошла ошибка
@@ -161,18 +232,45 @@ class LLMAnalyzer:
             raise ValueError("Не установлены текст резюме или вакансии")
 
         # Формируем пользовательский промт
-        user_prompt = self.USER_PROMPT_TEMPLATE.format(
-            vacancy_text=self.vacancy_text,
-            resume_text=self.resume_text
-        )
+        user_prompt = self.build_prompt()
 
         # Отправляем запрос к LLM
-        result = await self._send_to_llm(user_prompt, client=client)
+        max_tokens = settings.analyzer.verdict_max_tokens
+        if settings.analyzer.stream:
+            result = await self._stream_llm(user_prompt, on_field, max_tokens, client=client, timeout=timeout)
+        else:
+            result = await self._send_to_llm(user_prompt, max_tokens, client=client, timeout=timeout)
         
         if not result['success']:
             return False
 
         # Парсим результат
+        if not self._parse_result(result['content']):
+            return False
+        if on_field is not None and not settings.analyzer.stream:
+            for key, value in json.loads(result['content']).items():
+                on_field(key, value)
+        return True
+
+    async def prepare_interview(self, client: httpx.AsyncClient | None = None,
+                                timeout: float | None = None) -> bool:
+        """
+        Второй вызов: темы интервью, vacancy_meta и compressed_data. Итоги отбора берутся из
+        match_percentage и candidate_feedback (после analyze или выставленные из кэша).
+
+        Returns:
+            bool: True если материалы получены, False если произошла ошибка
+        """
+        if not self.resume_text or not self.vacancy_text:
+            raise ValueError("Не установлены текст резюме или вакансии")
+
+        user_prompt = self.build_prompt(self.INTERVIEW_PROMPT_TEMPLATE, self.INTERVIEW_SYSTEM_PROMPT,
+                                        match_percentage=self.match_percentage,
+                                        candidate_feedback=self.candidate_feedback or "")
+        result = await self._send_to_llm(user_prompt, settings.analyzer.interview_max_tokens, client=client,
+                                         timeout=timeout, system_prompt=self.INTERVIEW_SYSTEM_PROMPT)
+        if not result['success']:
+            return False
         return self._parse_result(result['content'])
 
     async def _send_to_llm(
@@ -180,25 +278,14 @@ class LLMAnalyzer:
         user_prompt: str,
         max_tokens: int = 10000,
         client: httpx.AsyncClient | None = None,
+        timeout: float | None = None,
+        system_prompt: str | None = None,
     ) -> dict:
         """
         Отправляет запрос к LLM через OpenRouter API (асинхронно, httpx).
-        Логика полностью сохранена.
+        Логика полностью сохранена; попытки - через self.transport.
         """
-        url = settings.analyzer.url
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
-        data = {
-            "model": self.model_name,
-            "messages": [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt},
-            ],
-            "temperature": self.temperature,
-            "max_tokens": max_tokens,
-        }
+        data = self._request_data(user_prompt, max_tokens, system_prompt)
 
         start_time = time.time()
         owns_client = False
@@ -207,11 +294,15 @@ class LLMAnalyzer:
             client = httpx.AsyncClient()
             owns_client = True
 
-        try:
-            response = await client.post(url, headers=headers, json=data)
+        async def attempt(endpoint: Endpoint) -> dict:
+            response = await client.post(endpoint.url, headers=self._headers(endpoint),
+                                         json={**data, "model": endpoint.model},
+                                         timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT)
             response.raise_for_status()
+            return response.json()
 
-            result = response.json()
+        try:
+            result = await self.transport.call(attempt)
             end_time = time.time()
 
             # Извлекаем информацию
@@ -248,22 +339,157 @@ class LLMAnalyzer:
             if owns_client:
                 await client.aclose()
 
+    def build_prompt(self, template: str | None = None, system_prompt: str | None = None, **extra) -> str:
+        """
+        Пользовательский промт (по умолчанию - вердикта): тексты резюме и вакансии - через
+        prompt_builder (без повторов, лишних разделов, в бюджете токенов), оценки токенов
+        до/после - в метрики. extra - остальные поля шаблона.
+        """
+        template = template or self.USER_PROMPT_TEMPLATE
+        raw = template.format(vacancy_text=self.vacancy_text, resume_text=self.resume_text, **extra)
+        system = estimate_tokens(system_prompt or self.SYSTEM_PROMPT)
+        self.prompt_tokens_original = system + estimate_tokens(raw)
+        if self.prompt_builder is None:
+            self.prompt_tokens_final = self.prompt_tokens_original
+            return raw
+
+        built = self.prompt_builder.build(self.vacancy_text, self.resume_text)
+        prompt = template.format(vacancy_text=built.vacancy_text, resume_text=built.resume_text, **extra)
+        self.prompt_tokens_final = system + estimate_tokens(prompt)
+        self.prompt_dropped_sections = built.dropped_sections
+        return prompt
+
+    def _headers(self, endpoint: Endpoint) -> dict:
+        return {
+            "Authorization": f"Bearer {endpoint.api_key or self.api_key}",
+            "Content-Type": "application/json",
+        }
+
+    def _request_data(self, user_prompt: str, max_tokens: int, system_prompt: str | None = None) -> dict:
+        return {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt or self.SYSTEM_PROMPT},
+                {"role": "user", "content": user_prompt},
+            ],
+            "temperature": self.temperature,
+            "max_tokens": max_tokens,
+        }
+
+    async def _stream_llm(
+        self,
+        user_prompt: str,
+        on_field: FieldCallback | None = None,
+        max_tokens: int = 10000,
+        client: httpx.AsyncClient | None = None,
+        timeout: float | None = None,
+    ) -> dict:
+        """
+        То же, что _send_to_llm, но с "stream": true: ответ приходит кусками (SSE), куски
+        разбираются IncrementalJsonParser и готовые поля сразу уходят в on_field.
+        Результат - как у _send_to_llm, content - весь текст ответа. Повторы - только пока
+        ни одно поле не отдано; дублей (хеджирования) нет: два потока отдавали бы поля дважды.
+        """
+        data = {**self._request_data(user_prompt, max_tokens), "stream": True,
+                "stream_options": {"include_usage": True}}
+
+        start_time = time.time()
+        owns_client = False
+
+        if client is None:
+            client = httpx.AsyncClient()
+            owns_client = True
+
+        async def attempt(endpoint: Endpoint):
+            parser = IncrementalJsonParser()
+            parts = []
+            usage = {}
+            emitted = False
+            try:
+                async with client.stream("POST", endpoint.url, headers=self._headers(endpoint),
+                                         json={**data, "model": endpoint.model},
+                                         timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        # SSE: "data: {...}", пустые строки и комментарии (": keep-alive") пропускаем
+                        if not line.startswith("data:"):
+                            continue
+                        payload = line[5:].strip()
+                        if payload == "[DONE]":
+                            break
+                        event = json.loads(payload)
+                        usage = event.get("usage") or usage
+                        choices = event.get("choices") or []
+                        delta = (choices[0].get("delta") or {}).get("content") if choices else None
+                        if not delta:
+                            continue
+                        if not parts:
+                            self.first_token_seconds = round(time.time() - start_time, 2)
+                        parts.append(delta)
+                        for key, value in parser.feed(delta):
+                            emitted = True
+                            self._apply_field(key, value)
+                            if on_field is not None:
+                                on_field(key, value)
+            except Exception as e:
+                if emitted:
+                    raise StreamInterruptedError(str(e)) from e
+                raise
+            return parser, parts, usage
+
+        try:
+            parser, parts, usage = await self.transport.call(attempt, hedge=False)
+            end_time = time.time()
+
+            # сохраняем метрики
+            self.response_time_seconds = round(end_time - start_time, 2)
+            self.prompt_tokens = usage.get("prompt_tokens", 0)
+            self.completion_tokens = usage.get("completion_tokens", 0)
+            self.total_tokens = usage.get("total_tokens", 0)
+            self.speed_tokens_per_second = (
+                round(usage.get("completion_tokens", 0) / (end_time - start_time), 2)
+                if (end_time - start_time) > 0
+                else 0
+            )
+
+            content = "".join(parts)
+            return {
+                "success": True,
+                # объект уже разобран потоком (в том числе обёрнутый в ```json) - отдаём его чистым
+                "content": json.dumps(parser.fields, ensure_ascii=False) if parser.done else content,
+                "model_used": self.model_name,
+            }
+
+        except httpx.TimeoutException as e:
+            self.response_time_seconds = round(time.time() - start_time, 2)
+            return {"success": False, "error": f"Timeout: {e}"}
+        except Exception as e:
+            self.response_time_seconds = round(time.time() - start_time, 2)
+            return {"success": False, "error": str(e)}
+        finally:
+            if owns_client:
+                await client.aclose()
+
+    def _apply_field(self, key: str, value: Any) -> None:
+        if key == 'hard_interview_topics':
+            value = self.choose_hard_soft_skills_topics(self.hard_weight, value or [])
+        elif key == 'soft_interview_topics':
+            value = self.choose_hard_soft_skills_topics(self.soft_weight, value or [])
+        elif key not in ('vacancy_title', 'decision', 'match_percentage', 'reasoning_report',
+                         'candidate_feedback', 'vacancy_meta', 'compressed_data'):
+            return
+        setattr(self, key, value)
+
     def _parse_result(self, content: str) -> bool:
         """
         Парсит результат от LLM.
         """
         try:
             data = json.loads(content)
-            
-            self.vacancy_title = data.get('vacancy_title')
-            self.decision = data.get('decision')
-            self.match_percentage = data.get('match_percentage')
-            self.reasoning_report = data.get('reasoning_report')
-            self.candidate_feedback = data.get('candidate_feedback')
-            self.hard_interview_topics = self.choose_hard_soft_skills_topics(self.hard_weight, data.get('hard_interview_topics', []))
-            self.soft_interview_topics = self.choose_hard_soft_skills_topics(self.soft_weight, data.get('soft_interview_topics', []))
-            self.vacancy_meta = data.get('vacancy_meta')
-            self.compressed_data = data.get('compressed_data')
+
+            # ответы вердикта и материалов интервью - разные наборы полей, трогаем только пришедшие
+            for key, value in data.items():
+                self._apply_field(key, value)
 
             return True
             
@@ -300,7 +526,11 @@ class LLMAnalyzer:
                 'total_tokens': self.total_tokens,
                 'prompt_tokens': self.prompt_tokens,
                 'completion_tokens': self.completion_tokens,
-                'speed_tokens_per_second': self.speed_tokens_per_second
+                'speed_tokens_per_second': self.speed_tokens_per_second,
+                'first_token_seconds': self.first_token_seconds,
+                'prompt_tokens_original': self.prompt_tokens_original,
+                'prompt_tokens_final': self.prompt_tokens_final,
+                'prompt_dropped_sections': self.prompt_dropped_sections
             },
             'compressed_data': self.compressed_data,
             'vacancy_meta': self.vacancy_meta
@@ -335,3 +565,7 @@ class LLMAnalyzer:
         self.prompt_tokens = 0
         self.completion_tokens = 0
         self.speed_tokens_per_second = 0
+        self.first_token_seconds = 0
+        self.prompt_tokens_original = 0
+        self.prompt_tokens_final = 0
+        self.prompt_dropped_sections = []
@@ -0,0 +1,230 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import re
+
+from matching.extract import find_date_ranges, find_english_levels, find_years
+from matching.skills import current_matcher
+from utils.vacancy_extract import COMPILED as VACANCY_KEYS
+
+# разделы резюме по заголовкам - в стиле KEY_SYNONYMS вакансии (utils/vacancy_extract.py)
+CV_SECTIONS: Dict[str, List[str]] = {
+    "experience": [
+        r"опыт\s+работы", r"опыт", r"трудовая\s+деятельность", r"места\s+работы",
+        r"(?:work\s+|professional\s+)?experience", r"employment(?:\s+history)?",
+    ],
+    "skills": [
+        r"(?:ключевые\s+|профессиональные\s+)?навыки", r"стек(?:\s+технологий)?", r"технологии",
+        r"(?:key\s+|technical\s+)?skills",
+    ],
+    "languages": [
+        r"знание\s+языков", r"(?:иностранные\s+)?языки", r"languages",
+    ],
+    "education": [
+        r"(?:высшее\s+)?образование", r"education",
+    ],
+    "courses": [
+        r"курсы", r"повышение\s+квалификации", r"сертификаты", r"тесты,?\s+экзамены",
+        r"courses", r"certificat(?:es|ions)",
+    ],
+    "about": [
+        r"о\s+себе", r"обо\s+мне", r"дополнительная\s+информация", r"about(?:\s+me)?", r"summary",
+    ],
+    # не влияют на мэтчинг - в промпт не идут
+    "hobbies": [
+        r"хобби", r"увлечения", r"интересы", r"hobbies", r"interests",
+    ],
+    "references": [
+        r"рекомендации", r"рекомендатели", r"references",
+    ],
+    "personal": [
+        r"личная\s+информация", r"личные\s+данные", r"семейное\s+положение", r"personal(?:\s+information)?",
+    ],
+}
+CV_COMPILED = {canon: [re.compile(pat, re.I) for pat in pats] for canon, pats in CV_SECTIONS.items()}
+IRRELEVANT = frozenset({"hobbies", "references", "personal"})
+
+# 0 - не режем; чем больше число, тем раньше раздел режется при нехватке бюджета
+CV_PRIORITY = {"header": 0, "skills": 1, "languages": 1, "experience": 2, "education": 3,
+               "about": 4, "courses": 4, "other": 4}
+VACANCY_PRIORITY = {"header": 0, "title": 0, "experience_text": 0, "langs_text": 0, "langs_level_text": 0,
+                    "requirements_md": 1, "duties_md": 2, "other": 3}
+# разделы с таким приоритетом и ниже можно выкинуть целиком, остальные - не короче заголовка и строки
+_DROPPABLE = 3
+
+_WS_RX = re.compile(r"\s+")
+_HEADING_MAX_WORDS = 6
+_CUT = "…"
+_DEDUPE_MIN_LEN = 8
+_BOILERPLATE = 3
+_PERIOD_MAX_LEN = 40
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Грубая оценка токенов BPE-моделей для смеси русского и английского: ~3 символа на токен
+    (без токенизатора конкретной модели; для сравнения "до/после" этого достаточно).
+    """
+    return (len(text) + 2) // 3
+
+
+@dataclass
+class _Section:
+    kind: str
+    priority: int
+    lines: List[str] = field(default_factory=list)
+
+    def tokens(self) -> int:
+        return sum(estimate_tokens(line) + 1 for line in self.lines)
+
+    def cut_to(self, allowance: int, min_lines: int) -> None:
+        keep = self._anchors()
+        used = sum(estimate_tokens(self.lines[i]) + 1 for i in keep)
+        for i, line in enumerate(self.lines):
+            if i in keep:
+                continue
+            cost = estimate_tokens(line) + 1
+            if used + cost > allowance and len(keep) >= min_lines:
+                break
+            keep.add(i)
+            used += cost
+        if len(keep) == len(self.lines):
+            return
+        # выкинутые строки подряд - одно "…"
+        out: List[str] = []
+        for i, line in enumerate(self.lines):
+            if i in keep:
+                out.append(line)
+            elif out and out[-1] != _CUT:
+                out.append(_CUT)
+        self.lines = out if keep else []
+
+    def _anchors(self) -> set:
+        """
+        Строки, которые не режем ни в одном разделе: с навыком из таксономии, уровнем английского
+        или периодом работы (и строка после периода - компания, должность). По ним считают навыки,
+        стаж и язык и мэтчер, и LLM - без них обрезка меняет признаки и решение.
+        """
+        matcher = current_matcher()
+        keep = set()
+        for i, line in enumerate(self.lines):
+            # "2016 - 2019" интервалом не считается - короткую строку с годом тоже берём
+            if find_date_ranges(line) or (len(line) <= _PERIOD_MAX_LEN and find_years(line)):
+                keep.update((i, i + 1) if i + 1 < len(self.lines) else (i,))
+            elif next(iter(matcher.finditer(line)), None) is not None or find_english_levels(line):
+                keep.add(i)
+        return keep
+
+
+def _dedupe(text: str) -> List[str]:
+    """
+    Строки без пустых и повторов (сравнение без регистра и лишних пробелов). Строка, которая
+    встречается _BOILERPLATE раз и больше, - колонтитул страницы, выкидывается целиком:
+    даты в нём ("обновлено 12 марта 2024") сбивают подсчёт стажа.
+    """
+    lines = [_WS_RX.sub(" ", raw).strip() for raw in text.splitlines()]
+    counts = Counter(line.lower() for line in lines if len(line) >= _DEDUPE_MIN_LEN)
+    seen, out = set(), []
+    for line in lines:
+        if not line:
+            continue
+        key = line.lower()
+        # короткие строки (даты, "Москва") повторяются законно - их не трогаем
+        if len(key) >= _DEDUPE_MIN_LEN:
+            if key in seen or counts[key] >= _BOILERPLATE:
+                continue
+            seen.add(key)
+        out.append(line)
+    return out
+
+
+def _heading(line: str, compiled: Dict[str, List[re.Pattern]], fullmatch: bool) -> Optional[str]:
+    # заголовок резюме - строка целиком ("Ключевые навыки:"), ключ вакансии - как в _canon_key (поиск)
+    if len(line.split()) > _HEADING_MAX_WORDS:
+        return None
+    key = line.strip(" :.").lower()
+    for canon, regexes in compiled.items():
+        if any((rx.fullmatch(key) if fullmatch else rx.search(key)) for rx in regexes):
+            return canon
+    return None
+
+
+def _sections(lines: List[str], compiled: Dict[str, List[re.Pattern]], priority: Dict[str, int],
+              fullmatch: bool) -> List[_Section]:
+    sections = [_Section("header", priority["header"])]
+    for line in lines:
+        kind = _heading(line, compiled, fullmatch)
+        if kind is not None:
+            sections.append(_Section(kind, priority.get(kind, priority["other"])))
+        sections[-1].lines.append(line)
+    return [s for s in sections if s.lines]
+
+
+def _fit(sections: List[_Section], budget: int) -> None:
+    """Режет разделы с конца по приоритету (менее важные и более поздние - первыми), пока не влезет в budget."""
+    need = sum(s.tokens() for s in sections) - budget
+    order = sorted(range(len(sections)), key=lambda i: (-sections[i].priority, -i))
+    for i in order:
+        if need <= 0:
+            break
+        sec = sections[i]
+        if sec.priority == 0:
+            continue
+        before = sec.tokens()
+        sec.cut_to(max(0, before - need), 0 if sec.priority >= _DROPPABLE else 2)
+        need -= before - sec.tokens()
+
+
+def _join(sections: List[_Section]) -> str:
+    return "\n".join(line for s in sections for line in s.lines)
+
+
+@dataclass
+class BuiltPrompt:
+    vacancy_text: str
+    resume_text: str
+    # оценки токенов текстов до и после сжатия (estimate_tokens)
+    original_tokens: int
+    final_tokens: int
+    dropped_sections: List[str] = field(default_factory=list)
+
+
+class PromptBuilder:
+    """
+    Тексты резюме и вакансии для промпта LLMAnalyzer в бюджете токенов:
+    - повторяющиеся строки (шаблонные колонтитулы, раздутые таблицы) - один раз;
+    - разделы резюме, не влияющие на мэтчинг (хобби, рекомендации, личные данные), - выкидываются;
+    - если тексты всё равно больше budget_tokens, разделы режутся с конца по приоритету:
+      сначала курсы/"о себе"/прочее, потом образование, опыт (старые места работы), навыки.
+      Шапка, короткие поля вакансии (название, опыт, языки) и строки с навыками, уровнем
+      английского и периодами работы не режутся - бюджет тогда может и не выдерживаться.
+    Разделы резюме - по заголовкам CV_SECTIONS, вакансии - по ключам её таблицы (KEY_SYNONYMS).
+    budget_tokens=0 - без обрезки (только повторы и лишние разделы).
+    """
+
+    def __init__(self, budget_tokens: int = 0, vacancy_share: float = 0.4):
+        self.budget_tokens = budget_tokens
+        # гарантированная доля бюджета вакансии, если оба текста не влезают
+        self.vacancy_share = vacancy_share
+
+    def build(self, vacancy_text: str, resume_text: str) -> BuiltPrompt:
+        original = estimate_tokens(vacancy_text) + estimate_tokens(resume_text)
+        vac = _sections(_dedupe(vacancy_text), VACANCY_KEYS, VACANCY_PRIORITY, fullmatch=False)
+        cv = _sections(_dedupe(resume_text), CV_COMPILED, CV_PRIORITY, fullmatch=True)
+        dropped = [s.kind for s in cv if s.kind in IRRELEVANT]
+        cv = [s for s in cv if s.kind not in IRRELEVANT]
+
+        if self.budget_tokens > 0:
+            v, c = sum(s.tokens() for s in vac), sum(s.tokens() for s in cv)
+            if v + c > self.budget_tokens:
+                vac_budget = min(v, max(self.budget_tokens - c, int(self.budget_tokens * self.vacancy_share)))
+                _fit(vac, vac_budget)
+                _fit(cv, self.budget_tokens - sum(s.tokens() for s in vac))
+
+        vacancy_out, resume_out = _join(vac), _join(cv)
+        return BuiltPrompt(vacancy_out, resume_out, original,
+                           estimate_tokens(vacancy_out) + estimate_tokens(resume_out), dropped)
+
+    def sections(self, resume_text: str) -> List[Tuple[str, int]]:
+        """(раздел, токены) резюме - для отладки разбиения."""
+        return [(s.kind, s.tokens()) for s in _sections(_dedupe(resume_text), CV_COMPILED, CV_PRIORITY, True)]
@@ -1,9 +1,41 @@
 from langchain_openai import ChatOpenAI
 from settings.settings import settings
+from infrastructure.llm.transport import Endpoint, LlmTransport
 
-llm = ChatOpenAI(
-    base_url="https://openrouter.ai/api/v1",
-    api_key=settings.analyzer.api_key,
-    model="openai/gpt-oss-20b:free", 
-    temperature=0.3,
-)
\ No newline at end of file
+
+class ResilientLLM:
+    """
+    Модель интервьюера с политикой вызовов LlmTransport (повторы, предохранитель, запасной
+    endpoint): invoke идёт через transport.call_sync, остальное - к основной модели.
+    Повторы самого SDK выключены (max_retries=0), чтобы политика была в одном месте.
+    """
+
+    def __init__(self, transport: LlmTransport):
+        self.transport = transport
+        self._models = {ep: self._model(ep) for ep in (transport.primary, transport.alternate) if ep is not None}
+
+    @staticmethod
+    def _model(endpoint: Endpoint) -> ChatOpenAI:
+        return ChatOpenAI(
+            base_url=endpoint.url,
+            api_key=endpoint.api_key,
+            model=endpoint.model,
+            temperature=0.3,
+            max_retries=0,
+            timeout=settings.llm.interviewer_timeout_sec,
+        )
+
+    def invoke(self, *args, **kwargs):
+        return self.transport.call_sync(lambda endpoint: self._models[endpoint].invoke(*args, **kwargs))
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._models[self.transport.primary], name)
+
+
+llm = ResilientLLM(LlmTransport.from_settings(Endpoint(
+    "https://openrouter.ai/api/v1",
+    "openai/gpt-oss-20b:free",
+    settings.analyzer.api_key,
+)))
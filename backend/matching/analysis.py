@@ -0,0 +1,93 @@
+from collections import Counter
+from datetime import date
+from functools import cached_property, lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from .score import bm25_weights, tokenize
+from .skills import extract_skills, taxonomy_version
+from .extract import find_date_ranges, find_years, experience_from, find_english_levels, best_english_level
+
+# символы, которые rapidfuzz (в отличие от str.split) не считает пробелами в не-latin1 строках
+_RAPIDFUZZ_NON_SPACE = ("\xa0", "\x85")
+
+
+class AnalyzedText:
+    """
+    Разбор текста, общий для всех скореров мэтчера: нижний регистр, токены и их частоты,
+    навыки с позициями, интервалы дат, упоминания английского. Каждая часть считается
+    лениво и один раз - скореры берут готовое вместо повторного прохода по тексту.
+
+    Токенизация - score.tokenize, как у BM25 и у сохранённых bm25_tf (иначе веса вакансии
+    и токены резюме не сойдутся).
+    """
+
+    def __init__(self, text: str):
+        self.text = text or ""
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> List[str]:
+        return tokenize(self.text)
+
+    @cached_property
+    def token_counts(self) -> Dict[str, int]:
+        # то же, что bm25_doc_stats, но без повторной токенизации
+        return dict(Counter(self.tokens))
+
+    @cached_property
+    def bm25_weights(self) -> Dict[str, float]:
+        return bm25_weights(self.token_counts)
+
+    @cached_property
+    def fuzzy_text(self) -> str:
+        """
+        Текст для token_set_ratio: уникальные токены, отсортированные и склеенные пробелом.
+        token_set_ratio сам сводит текст к этому множеству, так что результат тот же,
+        а повторная токенизация и сортировка на каждую пару уходят.
+        """
+        if any(ch in self.text for ch in _RAPIDFUZZ_NON_SPACE):
+            # здесь токены rapidfuzz и str.split расходятся - отдаём как есть
+            return self.text
+        return " ".join(sorted(set(self.text.split())))
+
+    @cached_property
+    def skills(self) -> Dict[str, List[Tuple[int, int]]]:
+        """Канон -> позиции вхождений (см. skills.extract_skills)."""
+        return extract_skills(self.text)
+
+    @cached_property
+    def skill_set(self) -> Set[str]:
+        return set(self.skills)
+
+    @cached_property
+    def date_ranges(self) -> List[Tuple[date, date]]:
+        return find_date_ranges(self.text)
+
+    @cached_property
+    def experience_years(self) -> Optional[float]:
+        # годы нужны только как запасной вариант, когда интервалов нет
+        ranges = self.date_ranges
+        return experience_from(ranges, [] if ranges else find_years(self.text))
+
+    @cached_property
+    def english_levels(self) -> List[str]:
+        return find_english_levels(self.text)
+
+    @cached_property
+    def english_level(self) -> Optional[str]:
+        return best_english_level(self.english_levels)
+
+
+def analyzed(text: str) -> AnalyzedText:
+    """
+    Разбор с кэшем по тексту - для вакансий, которые сравниваются со многими резюме.
+    """
+    # версия таксономии в ключе: после её замены навыки разбираются заново
+    return _analyzed(text, taxonomy_version())
+
+@lru_cache(maxsize=256)
+def _analyzed(text: str, version: str) -> AnalyzedText:
+    return AnalyzedText(text)
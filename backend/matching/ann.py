@@ -0,0 +1,132 @@
+from typing import Dict, Generic, Hashable, List, Tuple, TypeVar
+
+import numpy as np
+
+K = TypeVar("K", bound=Hashable)
+
+
+class FlatIndex(Generic[K]):
+    """
+    Точный поиск ближайших по косинусу (векторы уже нормированы): матрица float32 и одно
+    умножение на запрос. До сотен тысяч векторов обычно быстрее, чем кажется, и не требует
+    зависимостей; удаление - пометкой, как в BM25Index.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._keys: List[K | None] = []
+        self._slot: Dict[K, int] = {}
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._pending: List[np.ndarray] = []
+        self._dead: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slot
+
+    def add(self, key: K, vector: np.ndarray) -> None:
+        if key in self._slot:
+            self.remove(key)
+        self._slot[key] = len(self._keys)
+        self._keys.append(key)
+        self._pending.append(np.asarray(vector, dtype=np.float32).reshape(self.dim))
+
+    def remove(self, key: K) -> bool:
+        slot = self._slot.pop(key, None)
+        if slot is None:
+            return False
+        self._keys[slot] = None
+        self._dead.append(slot)
+        if len(self._dead) > max(64, len(self._keys) // 4):
+            self._compact()
+        return True
+
+    def _matrix(self) -> np.ndarray:
+        if self._pending:
+            self._vectors = np.vstack([self._vectors, np.stack(self._pending)])
+            self._pending = []
+        return self._vectors
+
+    def _compact(self) -> None:
+        vectors = self._matrix()
+        alive = [s for s, k in enumerate(self._keys) if k is not None]
+        self._keys = [self._keys[s] for s in alive]
+        self._slot = {k: i for i, k in enumerate(self._keys)}
+        self._vectors = vectors[alive]
+        self._dead = []
+
+    def search(self, vector: np.ndarray, k: int = 10) -> List[Tuple[K, float]]:
+        if k <= 0 or not self._slot:
+            return []
+        sims = self._matrix() @ np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        if self._dead:
+            sims[self._dead] = -np.inf
+        k = min(k, len(self._slot))
+        idx = np.argpartition(-sims, k - 1)[:k]
+        idx = idx[np.lexsort((idx, -sims[idx]))]
+        return [(self._keys[i], float(sims[i])) for i in idx]
+
+
+class HnswIndex(Generic[K]):
+    """
+    Приближённый поиск (HNSW, hnswlib) - для пулов, где полный проход по матрице уже дорог.
+    Метрика - скалярное произведение; удаление - mark_deleted, место переиспользуется.
+    """
+
+    def __init__(self, dim: int, m: int = 16, ef_construction: int = 200, ef: int = 64, capacity: int = 1024):
+        import hnswlib
+
+        self.dim = dim
+        self.ef = ef
+        self._index = hnswlib.Index(space="ip", dim=dim)
+        self._index.init_index(max_elements=capacity, ef_construction=ef_construction, M=m, allow_replace_deleted=True)
+        self._index.set_ef(ef)
+        self._keys: Dict[int, K] = {}
+        self._label: Dict[K, int] = {}
+        self._next = 0
+
+    def __len__(self) -> int:
+        return len(self._label)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._label
+
+    def add(self, key: K, vector: np.ndarray) -> None:
+        if key in self._label:
+            self.remove(key)
+        if self._index.get_current_count() >= self._index.get_max_elements():
+            self._index.resize_index(2 * self._index.get_max_elements())
+        label = self._next
+        self._next += 1
+        self._index.add_items(np.asarray(vector, dtype=np.float32).reshape(1, self.dim), [label],
+                              replace_deleted=True)
+        self._keys[label] = key
+        self._label[key] = label
+
+    def remove(self, key: K) -> bool:
+        label = self._label.pop(key, None)
+        if label is None:
+            return False
+        self._index.mark_deleted(label)
+        del self._keys[label]
+        return True
+
+    def search(self, vector: np.ndarray, k: int = 10) -> List[Tuple[K, float]]:
+        k = min(k, len(self._label))
+        if k <= 0:
+            return []
+        # ef не меньше k, иначе hnswlib не найдёт k соседей
+        self._index.set_ef(max(self.ef, k))
+        labels, distances = self._index.knn_query(np.asarray(vector, dtype=np.float32).reshape(1, self.dim), k=k)
+        # для space="ip" distance = 1 - <a, b>
+        return [(self._keys[int(l)], float(1.0 - d)) for l, d in zip(labels[0], distances[0])]
+
+
+def make_index(kind: str, dim: int, **params) -> "FlatIndex | HnswIndex":
+    if kind == "flat":
+        return FlatIndex(dim)
+    if kind == "hnsw":
+        return HnswIndex(dim, **params)
+    raise ValueError(f"Неизвестный тип ANN-индекса: {kind}")
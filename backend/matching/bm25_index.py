@@ -0,0 +1,189 @@
+import math
+from typing import Dict, Generic, Hashable, List, Mapping, Tuple, TypeVar
+
+import numpy as np
+
+from .score import BM25_K1, BM25_B, BM25_EPSILON, bm25_doc_stats
+
+K = TypeVar("K", bound=Hashable)
+
+
+class BM25Index(Generic[K]):
+    """
+    Инвертированный индекс BM25Okapi по корпусу документов (вакансии реестра или пул резюме)
+    с настоящими корпусными df/avgdl - в отличие от bm25_score, где корпус из одного документа.
+    Формулы те же, что у rank_bm25 (отрицательный idf -> eps * средний idf), токенизация - score.tokenize.
+
+    Документы добавляются и удаляются по одному. Удалённые помечаются и вычищаются из постингов
+    при накоплении. Запрос скорится сразу против всех документов: постинги терминов запроса
+    склеиваются в массивы и суммируются одним np.bincount.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B, epsilon: float = BM25_EPSILON):
+        self.k1, self.b, self.epsilon = k1, b, epsilon
+
+        # слоты документов: slot -> ключ / длина / частоты (нужны для удаления и компактизации)
+        self._keys: List[K | None] = []
+        self._lens: List[int] = []
+        self._tfs: List[Dict[str, int] | None] = []
+        self._slot: Dict[K, int] = {}
+        self._total_len = 0
+        self._dead = 0
+
+        # постинги: термин -> слоты и частоты (с мёртвыми слотами до компактизации)
+        self._post_slots: Dict[str, List[int]] = {}
+        self._post_tf: Dict[str, List[int]] = {}
+        self._df: Dict[str, int] = {}
+
+        # numpy-копии постингов (дописываются хвостом) и ленивые величины, сбрасываемые при изменениях
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._norm: np.ndarray | None = None
+        self._alive: np.ndarray | None = None
+        self._eps: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slot
+
+    @staticmethod
+    def term_freqs(text: str) -> Dict[str, int]:
+        return bm25_doc_stats(text)
+
+    def add(self, key: K, tf: Mapping[str, int]) -> None:
+        """
+        Добавляет (или заменяет) документ по частотам токенов - см. term_freqs / bm25_doc_stats.
+        """
+        if key in self._slot:
+            self.remove(key)
+        tf = {t: int(f) for t, f in tf.items() if f > 0}
+
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._lens.append(sum(tf.values()))
+        self._tfs.append(tf)
+        self._slot[key] = slot
+        self._total_len += self._lens[slot]
+
+        for term, f in tf.items():
+            posting = self._post_slots.get(term)
+            if posting is None:
+                self._post_slots[term] = [slot]
+                self._post_tf[term] = [f]
+            else:
+                posting.append(slot)
+                self._post_tf[term].append(f)
+            self._df[term] = self._df.get(term, 0) + 1
+        self._invalidate()
+
+    def add_text(self, key: K, text: str) -> None:
+        self.add(key, self.term_freqs(text))
+
+    def remove(self, key: K) -> bool:
+        slot = self._slot.pop(key, None)
+        if slot is None:
+            return False
+        tf = self._tfs[slot] or {}
+        for term in tf:
+            df = self._df[term] - 1
+            if df:
+                self._df[term] = df
+            else:
+                del self._df[term]
+        self._total_len -= self._lens[slot]
+        self._keys[slot] = None
+        self._tfs[slot] = None
+        self._dead += 1
+        self._invalidate()
+
+        if self._dead > max(64, len(self._keys) // 4):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Пересобирает индекс из живых документов (в порядке добавления)."""
+        docs = [(k, tf) for k, tf in zip(self._keys, self._tfs) if k is not None]
+        self.__init__(self.k1, self.b, self.epsilon)
+        for k, tf in docs:
+            self.add(k, tf)
+
+    def _invalidate(self) -> None:
+        self._norm = None
+        self._alive = None
+        self._eps = None
+
+    def _prepare(self) -> None:
+        n = len(self._slot)
+        lens = np.asarray(self._lens, dtype=np.float64)
+        avgdl = self._total_len / n if n else 1.0
+        self._norm = self.k1 * (1 - self.b + self.b * lens / avgdl)
+        self._alive = np.fromiter((k is not None for k in self._keys), dtype=bool, count=len(self._keys))
+
+        # средний idf по словарю, как в rank_bm25: нужен только для замены отрицательных idf
+        df = np.fromiter(self._df.values(), dtype=np.float64, count=len(self._df))
+        idf_sum = float(np.sum(np.log(n - df + 0.5) - np.log(df + 0.5)))
+        self._eps = self.epsilon * (idf_sum / len(df)) if len(df) else 0.0
+
+    def idf(self, term: str) -> float:
+        df = self._df.get(term)
+        if not df:
+            return 0.0
+        if self._eps is None:
+            self._prepare()
+        n = len(self._slot)
+        value = math.log(n - df + 0.5) - math.log(df + 0.5)
+        return self._eps if value < 0 else value
+
+    def _postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        slots, tfs = self._post_slots[term], self._post_tf[term]
+        arr = self._arrays.get(term)
+        done = 0 if arr is None else len(arr[0])
+        if done < len(slots):
+            # после add в numpy переводим только новый хвост постинга
+            tail = (np.asarray(slots[done:], dtype=np.intp), np.asarray(tfs[done:], dtype=np.float64))
+            arr = tail if arr is None else (np.concatenate((arr[0], tail[0])), np.concatenate((arr[1], tail[1])))
+            self._arrays[term] = arr
+        return arr
+
+    def _raw_scores(self, query: Mapping[str, int]) -> np.ndarray:
+        if self._norm is None:
+            self._prepare()
+        slots, tfs, weights = [], [], []
+        for term, count in query.items():
+            if term not in self._df:
+                continue
+            s, f = self._postings(term)
+            slots.append(s)
+            tfs.append(f)
+            weights.append(np.full(len(s), count * self.idf(term)))
+        if not slots:
+            return np.zeros(len(self._keys))
+
+        s = np.concatenate(slots)
+        f = np.concatenate(tfs)
+        contrib = np.concatenate(weights) * (f * (self.k1 + 1) / (f + self._norm[s]))
+        return np.bincount(s, weights=contrib, minlength=len(self._keys))
+
+    def scores(self, text: str) -> Tuple[List[K], np.ndarray]:
+        """
+        BM25 запроса против всех документов: (ключи, скоры) в порядке добавления.
+        """
+        raw = self._raw_scores(self.term_freqs(text))
+        alive = self._alive
+        keys = [k for k in self._keys if k is not None]
+        return keys, raw[alive] if self._dead else raw
+
+    def top_k(self, text: str, k: int = 10) -> List[Tuple[K, float]]:
+        """
+        k лучших документов по BM25, по убыванию скора.
+        """
+        if k <= 0 or not self._slot:
+            return []
+        raw = self._raw_scores(self.term_freqs(text))
+        if self._dead:
+            raw = np.where(self._alive, raw, -np.inf)
+        k = min(k, len(self._slot))
+        idx = np.argpartition(-raw, k - 1)[:k]
+        idx = idx[np.lexsort((idx, -raw[idx]))]
+        return [(self._keys[i], float(raw[i])) for i in idx]
@@ -0,0 +1,142 @@
+import hashlib
+import re
+import zlib
+from functools import lru_cache
+from typing import List, Protocol, Sequence
+
+import numpy as np
+
+_WORD_RX = re.compile(r"\w+", re.U)
+
+
+class Embedder(Protocol):
+    """
+    Бэкенд эмбеддингов: строки -> матрица float32 (n, dim) с L2-нормированными строками,
+    так что косинусная близость - скалярное произведение. name входит в ключ кэша векторов.
+    """
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray: ...
+
+
+def _normalize(m: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(m, axis=1, keepdims=True)
+    return (m / np.where(norms == 0, 1.0, norms)).astype(np.float32, copy=False)
+
+
+class HashingEmbedder:
+    """
+    Без зависимостей и без модели: слова и символьные n-граммы слов хешируются (crc32)
+    в dim корзин со знаком, tf сглаживается логарифмом. Семантики синонимов не знает,
+    но устойчив к словоформам и опечаткам - годится для тестов и как запасной бэкенд.
+    """
+
+    def __init__(self, dim: int = 512, ngram: int = 3):
+        self.dim = dim
+        self.ngram = ngram
+        self.name = embedder_name("hashing", dim=dim, ngram=ngram)
+
+    def _features(self, text: str) -> List[str]:
+        feats: List[str] = []
+        n = self.ngram
+        for word in _WORD_RX.findall(text.lower()):
+            feats.append(word)
+            padded = f"<{word}>"
+            feats.extend(padded[i:i + n] for i in range(len(padded) - n + 1))
+        return feats
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float64)
+        for row, text in enumerate(texts):
+            hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in self._features(text or "")), dtype=np.uint32)
+            if not len(hashes):
+                continue
+            # младшие биты - корзина, старший - знак (коллизии гасят друг друга, а не копятся)
+            signs = np.where(hashes >> 31, -1.0, 1.0)
+            vec = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim)
+            out[row] = np.sign(vec) * np.log1p(np.abs(vec))
+        return _normalize(out)
+
+
+class OnnxEmbedder:
+    """
+    Sentence-эмбеддинги моделью-энкодером в ONNX (например, экспорт multilingual-e5 / MiniLM):
+    токенизатор HuggingFace (tokenizer.json), mean pooling по attention_mask, L2-нормировка.
+    onnxruntime и tokenizers импортируются лениво - модуль работает и без них.
+    """
+
+    def __init__(self, model_path: str, tokenizer_path: str, max_length: int = 256,
+                 batch_size: int = 16, prefix: str = "", threads: int = 1):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        opts = ort.SessionOptions()
+        opts.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self.tokenizer = Tokenizer.from_file(tokenizer_path)
+        self.tokenizer.enable_truncation(max_length)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+        self.prefix = prefix
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        self.dim = int(self.session.get_outputs()[0].shape[-1])
+        self.name = embedder_name("onnx", model_path=model_path, max_length=max_length, prefix=prefix)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = [self.prefix + (t or "") for t in texts[start:start + self.batch_size]]
+            enc = self.tokenizer.encode_batch(batch)
+            feed = {
+                "input_ids": np.array([e.ids for e in enc], dtype=np.int64),
+                "attention_mask": np.array([e.attention_mask for e in enc], dtype=np.int64),
+                "token_type_ids": np.array([e.type_ids for e in enc], dtype=np.int64),
+            }
+            hidden = self.session.run(None, {k: v for k, v in feed.items() if k in self._inputs})[0]
+            if hidden.ndim == 3:
+                # last_hidden_state -> среднее по настоящим (не padding) токенам
+                mask = feed["attention_mask"][..., None].astype(np.float32)
+                hidden = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+            out[start:start + len(batch)] = hidden
+        return _normalize(out)
+
+
+@lru_cache(maxsize=16)
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()[:12]
+
+
+def embedder_name(backend: str, dim: int = 512, ngram: int = 3, model_path: str = "",
+                  max_length: int = 256, prefix: str = "", **_) -> str:
+    """
+    Имя бэкенда для ключа кэша векторов - без загрузки модели (для onnx - хеш файла модели):
+    другая модель или параметры дают другие векторы и не должны брать чужие из кэша.
+    """
+    if backend == "hashing":
+        return f"hashing-{dim}-{ngram}"
+    if backend == "onnx":
+        return f"onnx-{_file_digest(model_path)}-{max_length}-{text_hash(prefix)[:8]}"
+    raise ValueError(f"Неизвестный бэкенд эмбеддингов: {backend}")
+
+
+@lru_cache(maxsize=4)
+def get_embedder(backend: str = "hashing", dim: int = 512, model_path: str = "", tokenizer_path: str = "",
+                 max_length: int = 256, prefix: str = "") -> Embedder:
+    """
+    Бэкенд по имени (из настроек). Кэшируется на процесс: модель грузится один раз.
+    """
+    if backend == "hashing":
+        return HashingEmbedder(dim=dim)
+    if backend == "onnx":
+        return OnnxEmbedder(model_path, tokenizer_path, max_length=max_length, prefix=prefix)
+    raise ValueError(f"Неизвестный бэкенд эмбеддингов: {backend}")
+
+
+def text_hash(text: str) -> str:
+    """Ключ кэша вектора документа (вместе с именем бэкенда)."""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
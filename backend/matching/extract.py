@@ -1,9 +1,6 @@
 import re
 from datetime import date
-from typing import Optional, List, Tuple
-
-import re
-from datetime import date
+from functools import lru_cache
 from typing import Optional, List, Tuple
 
 # RU месяцы (полные и краткие формы)
@@ -62,13 +59,19 @@ def _en_month_to_num(word: str) -> Optional[int]:
 _WORD_RU = r"[А-Яа-яЁё\.]+"
 _WORD_EN = r"[A-Za-z\.]+"
 
-_DATE_TOKEN = rf"""
+def _date_token(p: str, guard: bool = False) -> str:
+    # те же альтернативы в том же порядке, что и раньше, но с группами: дату собираем
+    # прямо из совпадения, а не повторным разбором строки (p - префикс имён групп).
+    # Слово и пробелы притяжательные: отдать символ назад всё равно нельзя - за словом
+    # должен идти пробел, за пробелами цифра. guard - см. _RANGE_SEARCH_RX.
+    ru = rf"(?<![А-Яа-яЁё\.]){_WORD_RU}+" if guard else rf"{_WORD_RU}+"
+    en = rf"(?<![A-Za-z\.]){_WORD_EN}+" if guard else rf"{_WORD_EN}+"
+    return rf"""
     (?:
-        {_WORD_RU}\s+\d{{4}}        # RU месяц + год
-      | {_WORD_EN}\s+\d{{4}}        # EN месяц + год
-      | \d{{1,2}}[./-]\d{{4}}       # 02.2021
-      | \d{{4}}[./-]\d{{1,2}}       # 2021-02
-      | \d{{4}}                     # 2019
+        (?P<{p}w>{ru}|{en})\s++(?P<{p}wy>\d{{4}})             # RU/EN месяц + год
+      | (?P<{p}m>\d{{1,2}})[./-](?P<{p}my>\d{{4}})          # 02.2021
+      | (?P<{p}ym>\d{{4}})[./-](?P<{p}ymm>\d{{1,2}})        # 2021-02
+      | (?P<{p}y>\d{{4}})                                   # 2019
     )
 """
 
@@ -77,46 +80,48 @@ _DASH = r"[-–—]"
 
 _PRESENT = r"(?:present|now|current|по\s+наст\.?|н\.в\.|настоящее\s+время|по\s+настоящее\s+время)"
 
-RANGE_RX = re.compile(
-    rf"(?P<d1>{_DATE_TOKEN})\s*{_DASH}\s*(?P<d2>{_DATE_TOKEN}|{_PRESENT})",
-    re.I | re.X | re.U
-)
+def _range_pattern(guard: bool) -> str:
+    return rf"(?P<d1>{_date_token('l', guard)})\s*{_DASH}\s*(?P<d2>{_date_token('r')}|(?P<present>{_PRESENT}))"
+
+RANGE_RX = re.compile(_range_pattern(False), re.I | re.X | re.U)
+
+# То же для поиска: слово-месяц не начинается посреди слова своего алфавита. Если с такой
+# позиции есть совпадение, то оно есть и с предыдущей (слово на букву длиннее), а её finditer
+# уже проверил - иначе бы сюда не дошёл. Не проверена она только сразу после прошлого
+# совпадения, поэтому там _iter_ranges пробует RANGE_RX без ограничения.
+# Так слова не сканируются с каждой буквы - это и было основной ценой разбора.
+_RANGE_SEARCH_RX = re.compile(_range_pattern(True), re.I | re.X | re.U)
+
+_DATE_RX = re.compile(_date_token(""), re.I | re.X | re.U)
 
 _YEAR_FALLBACK = re.compile(r"\b(19|20)\d{2}\b")
 
+@lru_cache(maxsize=1024)
+def _month_num(word: str) -> Optional[int]:
+    # слово из одних букв одного алфавита (или точек), поэтому словари RU/EN не пересекаются
+    return _ru_month_to_num(word) or _en_month_to_num(word)
+
+def _date_from(m: re.Match, p: str) -> Optional[date]:
+    """Дата из групп _date_token(p) в совпадении (None - не дата, например "опыт 2014")."""
+    g = m.group
+    word = g(p + "w")
+    if word is not None:
+        mon = _month_num(word)
+        return date(int(g(p + "wy")), mon, 1) if mon else None
+    mm = g(p + "m")
+    if mm is not None:
+        mm = int(mm)
+        return date(int(g(p + "my")), mm, 1) if 1 <= mm <= 12 else None
+    yy = g(p + "ym")
+    if yy is not None:
+        mm = int(g(p + "ymm"))
+        return date(int(yy), mm, 1) if 1 <= mm <= 12 else None
+    return date(int(g(p + "y")), 1, 1)
+
 def _parse_date_str(s: str) -> Optional[date]:
     """Пытается распарсить единичную дату из строки (RU/EN месяц-год, разные форматы)."""
-    s = s.strip()
-    # RU month yyyy
-    m = re.fullmatch(rf"\s*({_WORD_RU})\s+(\d{{4}})\s*", s, flags=re.I | re.U)
-    if m:
-        mon = _ru_month_to_num(m.group(1))
-        if mon:
-            return date(int(m.group(2)), mon, 1)
-    # EN month yyyy
-    m = re.fullmatch(rf"\s*({_WORD_EN})\s+(\d{{4}})\s*", s, flags=re.I)
-    if m:
-        mon = _en_month_to_num(m.group(1))
-        if mon:
-            return date(int(m.group(2)), mon, 1)
-    # 02.2021
-    m = re.fullmatch(r"\s*(\d{1,2})[./-](\d{4})\s*", s)
-    if m:
-        mm, yy = int(m.group(1)), int(m.group(2))
-        if 1 <= mm <= 12:
-            return date(yy, mm, 1)
-    # 2021-02
-    m = re.fullmatch(r"\s*(\d{4})[./-](\d{1,2})\s*", s)
-    if m:
-        yy, mm = int(m.group(1)), int(m.group(2))
-        if 1 <= mm <= 12:
-            return date(yy, mm, 1)
-    # 2019
-    m = re.fullmatch(r"\s*(\d{4})\s*", s)
-    if m:
-        yy = int(m.group(1))
-        return date(yy, 1, 1)
-    return None
+    m = _DATE_RX.fullmatch(s.strip())
+    return _date_from(m, "") if m else None
 
 def _month_diff(a: date, b: date) -> int:
     return (b.year - a.year) * 12 + (b.month - a.month)
@@ -135,40 +140,59 @@ def _merge(intervals: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
             merged.append((s, e))
     return merged
 
-def estimate_total_experience(md: str) -> Optional[float]:
+def _iter_ranges(md: str):
+    """Те же совпадения, что RANGE_RX.finditer(md)."""
+    pos, after_match = 0, False
+    while True:
+        m = (RANGE_RX.match(md, pos) if after_match else None) or _RANGE_SEARCH_RX.search(md, pos)
+        if m is None:
+            return
+        yield m
+        pos, after_match = m.end(), True
+
+def find_date_ranges(md: str) -> List[Tuple[date, date]]:
     """
-    Сумма интервалов (в годах, с точностью до месяцев).
-    Понимает: 'Сентябрь 2014 — Декабрь 2014', любые тире, RU/EN месяцы, числовые форматы, 'н.в.'/'present'.
+    Все интервалы дат из текста ('Сентябрь 2014 — Декабрь 2014', любые тире, RU/EN месяцы,
+    числовые форматы, 'н.в.'/'present') - в порядке появления, без слияния.
+    Один проход по тексту: обе даты и 'н.в.' берутся из групп совпадения.
     """
     today = date.today()
     intervals: List[Tuple[date, date]] = []
 
-    for m in RANGE_RX.finditer(md):
-        left_raw = m.group("d1")
-        right_raw = m.group("d2")
-        # 'present' / 'н.в.'
-        if re.fullmatch(_PRESENT, right_raw.strip(), flags=re.I | re.U):
-            left = _parse_date_str(left_raw)
-            right = today
-        else:
-            # правую дату выделяем как строку и парсим общей функцией
-            left = _parse_date_str(left_raw)
-            right = _parse_date_str(right_raw)
-
-        if left and right and right >= left:
+    for m in _iter_ranges(md):
+        left = _date_from(m, "l")
+        if left is None:
+            continue
+        right = today if m.group("present") is not None else _date_from(m, "r")
+        if right and right >= left:
             intervals.append((left, right))
+    return intervals
+
+def find_years(md: str) -> List[int]:
+    return [int(x.group(0)) for x in _YEAR_FALLBACK.finditer(md)]
 
+def experience_from(intervals: List[Tuple[date, date]], years: List[int]) -> Optional[float]:
+    """
+    Сумма интервалов (в годах, с точностью до месяцев); без интервалов - разница между min/max годом.
+    """
     if not intervals:
-        # разница между min/max годом
-        years = [int(x.group(0)) for x in _YEAR_FALLBACK.finditer(md)]
         if not years:
             return None
         return max(0.0, float(max(years) - min(years)))
 
-    merged = _merge(intervals)
+    merged = _merge(list(intervals))
     months = sum(_month_diff(s, e) + 1 for s, e in merged)
     return round(months / 12.0, 2)
 
+def estimate_total_experience(md: str) -> Optional[float]:
+    """
+    Сумма интервалов (в годах, с точностью до месяцев).
+    Понимает: 'Сентябрь 2014 — Декабрь 2014', любые тире, RU/EN месяцы, числовые форматы, 'н.в.'/'present'.
+    """
+    intervals = find_date_ranges(md)
+    # годы нужны только как запасной вариант
+    return experience_from(intervals, [] if intervals else find_years(md))
+
 # язык
 
 EN_RX = re.compile(
@@ -190,12 +214,11 @@ EN_LEVEL_MAP = {
     "свободн": "C1",  # "свободно" и т.п.
 }
 
-def detect_english_level(md: str) -> Optional[str]:
+def find_english_levels(md: str) -> List[str]:
     """
-    Возвращает 'A1'...'C2', если в тексте явно указан уровень английского.
-    Если уровня нет/не найден — вернёт None (а не просто факт наличия английского).
+    Уровни CEFR всех упоминаний английского с уровнем, в порядке появления.
     """
-    best = None
+    levels: List[str] = []
     for m in EN_RX.finditer(md):
         raw = m.group(2).lower()
         # нормализуем "upper intermediate" -> "upper-intermediate"
@@ -206,10 +229,24 @@ def detect_english_level(md: str) -> Optional[str]:
             # для кириллического "свободно" хватит префикса
             if raw.startswith("свободн"):
                 lvl = "C1"
-        if lvl and (_cefr_rank(lvl) > _cefr_rank(best)):
+        if lvl:
+            levels.append(lvl)
+    return levels
+
+def best_english_level(levels: List[str]) -> Optional[str]:
+    best = None
+    for lvl in levels:
+        if _cefr_rank(lvl) > _cefr_rank(best):
             best = lvl
     return best
 
+def detect_english_level(md: str) -> Optional[str]:
+    """
+    Возвращает 'A1'...'C2', если в тексте явно указан уровень английского.
+    Если уровня нет/не найден — вернёт None (а не просто факт наличия английского).
+    """
+    return best_english_level(find_english_levels(md))
+
 def _cefr_rank(lvl: Optional[str]) -> int:
     order = {"A1":1, "A2":2, "B1":3, "B2":4, "C1":5, "C2":6}
     return order.get(lvl or "", 0)
\ No newline at end of file
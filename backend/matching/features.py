@@ -0,0 +1,29 @@
+from typing import Any, Dict
+from .analysis import AnalyzedText
+from .skills import taxonomy_version, BUILTIN_VERSION
+
+# версия извлекателей признаков резюме: поднимать при любом изменении
+# normalize_skills / estimate_total_experience / detect_english_level / ALIASES,
+# / токенизации BM25, тогда сохранённые признаки старой версии пересчитываются из текста
+FEATURES_VERSION = "2"
+
+def features_version() -> str:
+    """
+    Версия признаков с учётом таксономии навыков: признаки, посчитанные на другой
+    версии таксономии (см. taxonomy.py), тоже считаются устаревшими и пересчитываются.
+    """
+    version = taxonomy_version()
+    return FEATURES_VERSION if version == BUILTIN_VERSION else f"{FEATURES_VERSION}+{version}"
+
+def cv_features(text: str) -> Dict[str, Any]:
+    """
+    Признаки резюме, которые мэтчер может брать готовыми вместо повторного разбора текста;
+    bm25_tf - частоты токенов для BM25 (пересчёт пула с вакансией обходится без токенизации).
+    """
+    analysis = AnalyzedText(text)
+    return {
+        "skills": sorted(analysis.skill_set),
+        "experience_years": analysis.experience_years,
+        "english_level": analysis.english_level,
+        "bm25_tf": analysis.token_counts,
+    }
@@ -1,36 +1,56 @@
-from typing import Dict, Any, List
-from .skills import normalize_skills
-from .score import bm25_score, fuzzy_score, coverage_score
-from .extract import estimate_total_experience, detect_english_level
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Dict, Any, List, Optional, Sequence, Set
+import numpy as np
+from rapidfuzz import fuzz, process
+from .score import BM25_TOKENS_VERSION, bm25_score_counts, bm25_doc_stats, fuzzy_score, coverage_score
+from .analysis import AnalyzedText, analyzed
 
 WEIGHTS = { "bm25":0.01, "fuzzy":0.05, "must_coverage":0.10, "nice_coverage":0.10, "experience":0.85 }
 INVITE_THR = 0.65
 REJECT_THR  = 0.40
 
+def vacancy_text(vac: Dict[str, Any]) -> str:
+    """Текст вакансии, с которым работают bm25/fuzzy."""
+    return f"{vac.get('title','')}\n{vac.get('description_md','')}"
+
+def vacancy_features(vac: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Признаки вакансии, которые не зависят от резюме и могут храниться вместе с ней:
+    частоты токенов для BM25 и версия токенизации, по которой они посчитаны.
+    """
+    return {"bm25_tf": bm25_doc_stats(vacancy_text(vac)), "bm25_version": BM25_TOKENS_VERSION}
+
 def decide(vac: Dict[str, Any], cv: Dict[str, Any]) -> Dict[str, Any]:
     """
     vac ожидает ключи:
-      title, description_md, must_have, nice_to_have, min_years_total, english_min_level (опц.)
+      title, description_md, must_have, nice_to_have, min_years_total, english_min_level (опц.),
+      bm25_weights (опц., предрасчитанные веса BM25 - см. vacancy_features/bm25_weights)
     cv ожидает ключи:
-      markdown, (sections?, detected_meta?) - еще не реализовано
+      text, detected_meta (опц.),
+      analysis (опц., готовый AnalyzedText для text),
+      skills, experience_years, english_level, bm25_tf (опц., готовые признаки - см. features.cv_features)
     """
-    vac_text = f"{vac.get('title','')}\n{vac.get('description_md','')}"
-    cv_text  = cv["text"]
+    # текст вакансии разбирается один раз на все резюме, резюме - один раз на все скореры
+    va = analyzed(vacancy_text(vac))
+    ca = cv.get("analysis") or AnalyzedText(cv["text"])
 
     # уровень английского в CV (A1..C2 или None)
-    cv_en_level = detect_english_level(cv_text)
+    cv_en_level = cv["english_level"] if "english_level" in cv else ca.english_level
 
     # similarity
-    s_bm25 = bm25_score(vac_text, cv_text)
-    s_fuzzy = fuzzy_score(vac_text, cv_text)
+    weights = vac.get("bm25_weights")
+    s_bm25 = bm25_score_counts(weights if weights is not None else va.bm25_weights,
+                               cv["bm25_tf"] if "bm25_tf" in cv else ca.token_counts)
+    s_fuzzy = fuzzy_score(va.fuzzy_text, ca.fuzzy_text)
 
     # coverage по навыкам
-    cv_skills = normalize_skills(cv_text)
+    cv_skills = set(cv["skills"]) if "skills" in cv else ca.skill_set
     must_cov  = coverage_score(vac.get("must_have", []), cv_skills)
     nice_cov  = coverage_score(vac.get("nice_to_have", []), cv_skills)
 
     # опыт (годы)
-    exp_years = estimate_total_experience(cv_text) or 0.0
+    exp_years = (cv["experience_years"] if "experience_years" in cv else ca.experience_years) or 0.0
     min_req   = vac.get("min_years_total")
     exp_ok    = 1.0 if (min_req is None or exp_years >= float(min_req)) else (exp_years / max(1.0, float(min_req)))
 
@@ -42,14 +62,140 @@ def decide(vac: Dict[str, Any], cv: Dict[str, Any]) -> Dict[str, Any]:
         "experience": exp_ok,
     }
     score = sum(details[k] * WEIGHTS[k] for k in WEIGHTS)
+    reasons = _reasons(vac, must_cov, cv_skills, exp_years, exp_ok, cv_en_level)
+    return _result(score, details, reasons, _decision(score))
 
-    if score >= INVITE_THR:
-        decision = "invite"
-    elif score <= REJECT_THR:
-        decision = "reject"
+@dataclass
+class BatchScores:
+    """Скоры одной вакансии против пачки резюме: массивы длины N в порядке резюме."""
+    details: Dict[str, np.ndarray]
+    score: np.ndarray
+    exp_years: np.ndarray
+    skills: List[Set[str]]
+    english_levels: List[Optional[str]]
+
+def _bm25_many(weights: Dict[str, float], tfs: Sequence[Dict[str, int]]) -> np.ndarray:
+    """
+    BM25 пачки - разреженная матрица "резюме x термин вакансии" (частоты токенов резюме)
+    на вектор весов терминов. Столбцы - только термины вакансии, остальные дали бы ноль;
+    строки собираются пересечением ключей словарей (в C), без прохода по токенам.
+    Термины строки складываются по порядку, как в bm25_score_counts.
+    """
+    n = len(tfs)
+    col = {t: j for j, t in enumerate(weights)}
+    w = np.fromiter(weights.values(), dtype=np.float64, count=len(weights))
+
+    # COO: (строка, столбец, частота) для каждого совпавшего термина
+    rows: List[int] = []
+    cols: List[int] = []
+    counts: List[int] = []
+    for i, tf in enumerate(tfs):
+        hits = weights.keys() & tf.keys()
+        rows.extend(repeat(i, len(hits)))
+        cols.extend(map(col.__getitem__, hits))
+        counts.extend(map(tf.__getitem__, hits))
+    if not rows:
+        return np.zeros(n)
+
+    s = np.bincount(rows, weights=w[cols] * np.array(counts, dtype=np.float64), minlength=n)
+    return np.minimum(1.0, s / 5.0)
+
+def _coverage_many(req: Sequence[str], skills: Sequence[Set[str]]) -> np.ndarray:
+    n = len(skills)
+    if not req:
+        return np.ones(n)
+    # битовая матрица "резюме x уникальное требование" (разреженно) на кратности требований = число закрытых
+    names = [r.lower() for r in req]
+    col: Dict[str, int] = {}
+    for name in names:
+        col.setdefault(name, len(col))
+    mult = np.bincount([col[name] for name in names])
+
+    rows: List[int] = []
+    cols: List[int] = []
+    for i, s in enumerate(skills):
+        hits = col.keys() & s
+        rows.extend(repeat(i, len(hits)))
+        cols.extend(map(col.__getitem__, hits))
+    got = np.bincount(rows, weights=mult[cols], minlength=n) if rows else np.zeros(n)
+    return got / len(req)
+
+def score_many(vac: Dict[str, Any], cvs: Sequence[Dict[str, Any]], workers: int = 1) -> BatchScores:
+    """
+    Скоринг одной вакансии против N резюме массивами numpy; ключи cv - как у decide.
+    Рассчитан на сохранённые признаки (features.cv_features, в т.ч. bm25_tf): тогда из текста
+    нужен только fuzzy. Признаки совпадают с decide, скор - с точностью до последних битов.
+    workers - потоки rapidfuzz для fuzzy (-1 - все ядра).
+    """
+    va = analyzed(vacancy_text(vac))
+    analyses = [cv.get("analysis") or AnalyzedText(cv["text"]) for cv in cvs]
+
+    weights = vac.get("bm25_weights")
+    bm25 = _bm25_many(weights if weights is not None else va.bm25_weights,
+                      [cv["bm25_tf"] if "bm25_tf" in cv else a.token_counts for cv, a in zip(cvs, analyses)])
+    if analyses:
+        # резюме здесь скорится один раз - токены, множество и сортировку (AnalyzedText.fuzzy_text)
+        # token_set_ratio делает сам в C++, результат тот же
+        fuzzy = process.cdist([va.fuzzy_text], [a.text for a in analyses], scorer=fuzz.token_set_ratio,
+                              dtype=np.float64, workers=workers)[0] / 100.0
     else:
-        decision = "manual_review"
+        fuzzy = np.zeros(0)
+
+    skills = [set(cv["skills"]) if "skills" in cv else a.skill_set for cv, a in zip(cvs, analyses)]
+    must_cov = _coverage_many(vac.get("must_have", []), skills)
+    nice_cov = _coverage_many(vac.get("nice_to_have", []), skills)
+
+    exp_years = np.fromiter(((cv["experience_years"] if "experience_years" in cv else a.experience_years) or 0.0
+                             for cv, a in zip(cvs, analyses)), dtype=np.float64, count=len(cvs))
+    min_req = vac.get("min_years_total")
+    if min_req is None:
+        exp_ok = np.ones(len(cvs))
+    else:
+        exp_ok = np.where(exp_years >= float(min_req), 1.0, exp_years / max(1.0, float(min_req)))
+
+    details = {
+        "bm25": bm25,
+        "fuzzy": fuzzy,
+        "must_coverage": must_cov,
+        "nice_coverage": nice_cov,
+        "experience": exp_ok,
+    }
+    score = np.zeros(len(cvs))
+    for k in WEIGHTS:
+        score = score + details[k] * WEIGHTS[k]
+
+    english = [cv["english_level"] if "english_level" in cv else a.english_level for cv, a in zip(cvs, analyses)]
+    return BatchScores(details=details, score=score, exp_years=exp_years, skills=skills, english_levels=english)
+
+def decide_many(vac: Dict[str, Any], cvs: Sequence[Dict[str, Any]], workers: int = 1) -> List[Dict[str, Any]]:
+    """
+    decide для одной вакансии и N резюме (ключи vac/cv - как у decide), результаты в порядке cvs.
+    Решения те же, что у decide; скор может отличаться в последних битах (порядок сложения).
+    """
+    b = score_many(vac, cvs, workers=workers)
+    decisions = np.select([b.score >= INVITE_THR, b.score <= REJECT_THR], ["invite", "reject"],
+                          "manual_review").tolist()
+    scores = b.score.tolist()
+    exp_years = b.exp_years.tolist()
+    columns = {k: v.tolist() for k, v in b.details.items()}
+    out: List[Dict[str, Any]] = []
+    for i in range(len(cvs)):
+        details = {k: v[i] for k, v in columns.items()}
+        reasons = _reasons(vac, details["must_coverage"], b.skills[i], exp_years[i],
+                           details["experience"], b.english_levels[i])
+        out.append(_result(scores[i], details, reasons, decisions[i]))
+    return out
+
+def _decision(score: float) -> str:
+    if score >= INVITE_THR:
+        return "invite"
+    if score <= REJECT_THR:
+        return "reject"
+    return "manual_review"
 
+def _reasons(vac: Dict[str, Any], must_cov: float, cv_skills: Set[str],
+             exp_years: float, exp_ok: float, cv_en_level: Optional[str]) -> List[str]:
+    min_req = vac.get("min_years_total")
     reasons: List[str] = []
     if must_cov < 1.0 and vac.get("must_have"):
         miss = [m for m in vac["must_have"] if m.lower() not in cv_skills]
@@ -59,7 +205,9 @@ def decide(vac: Dict[str, Any], cv: Dict[str, Any]) -> Dict[str, Any]:
         reasons.append(f"Стаж {exp_years:.1f} < требуемых {float(min_req):.1f}")
     if vac.get("english_min_level"):
         reasons.append(f"English level (CV): {cv_en_level or 'не указан'}")
+    return reasons
 
+def _result(score: float, details: Dict[str, float], reasons: List[str], decision: str) -> Dict[str, Any]:
     return {
         "decision": decision,
         "score": round(score, 3),
@@ -0,0 +1,165 @@
+import re
+import zlib
+from typing import Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+K = TypeVar("K", bound=Hashable)
+
+# параметры подписи - часть формата хранимых подписей (cv_features.minhash):
+# при их смене старые подписи несравнимы с новыми
+NUM_PERM = 128
+SHINGLE = 3
+_SEED = 20240917
+# короче этого текст не подписываем: на паре строк "почти дубликат" ничего не значит
+MIN_TOKENS = 20
+
+_TOKEN_RX = re.compile(r"\w+", re.U)
+# контакты в подпись не входят: новый телефон или почта - то же резюме
+_CONTACT_RX = re.compile(r"(?:\+|\b)(?:[\w.+-]+@[\w-]+(?:\.[\w-]+)+|\d[\d\s()\-]{8,}\d)", re.U)
+_MASK32 = np.uint64(0xFFFFFFFF)
+
+
+def _params(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rnd = np.random.default_rng(seed)
+    # multiply-shift: старшие 32 бита (a*x + b) mod 2^64, a нечётное
+    a = rnd.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rnd.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return a[:, None], b[:, None]
+
+
+_A, _B = _params(NUM_PERM, _SEED)
+# множители для склейки хешей слов в хеш шингла
+_MIX = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0xD6E8FEB86659FD93][:SHINGLE],
+                dtype=np.uint64)
+
+
+def shingle_hashes(text: str) -> np.ndarray:
+    """32-битные хеши словесных шинглов (по SHINGLE слов) текста без контактов, без повторов."""
+    tokens = _TOKEN_RX.findall(_CONTACT_RX.sub(" ", text.lower()))
+    if len(tokens) < max(SHINGLE, MIN_TOKENS):
+        return np.zeros(0, dtype=np.uint64)
+    t = np.fromiter((zlib.crc32(w.encode("utf-8")) for w in tokens), dtype=np.uint64, count=len(tokens))
+    n = len(tokens) - SHINGLE + 1
+    h = np.zeros(n, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        for i in range(SHINGLE):
+            h ^= t[i:i + n] * _MIX[i]
+    return np.unique((h >> np.uint64(32)) ^ (h & _MASK32))
+
+
+def signature(text: str) -> Optional[np.ndarray]:
+    """
+    MinHash-подпись (NUM_PERM минимумов uint32) очищенного текста; None - текст слишком короткий.
+    Доля совпавших позиций двух подписей - оценка коэффициента Жаккара их множеств шинглов.
+    """
+    h = shingle_hashes(text)
+    if not len(h):
+        return None
+    with np.errstate(over="ignore"):
+        return ((_A * h[None, :] + _B) >> np.uint64(32)).min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def to_bytes(sig: np.ndarray) -> bytes:
+    return np.asarray(sig, dtype="<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> Optional[np.ndarray]:
+    sig = np.frombuffer(data, dtype="<u4")
+    return sig if len(sig) == NUM_PERM else None
+
+
+class LshIndex(Generic[K]):
+    """
+    LSH по полосам MinHash-подписи: подпись режется на bands полос, у дубликатов хотя бы одна
+    полоса совпадает целиком с высокой вероятностью (при 16 x 8 и Жаккаре 0.9 - 0.9999,
+    при 0.5 - 6%). Кандидаты проверяются оценкой по всей подписи.
+
+    Компактно для сотен тысяч подписей: подписи - одна матрица uint32, полосы - отсортированные
+    массивы 64-битных хешей (поиск - searchsorted), новые добавляются в буфер и сливаются
+    при запросе, удалённые помечаются, как в FlatIndex.
+    """
+
+    def __init__(self, bands: int = 16, num_perm: int = NUM_PERM):
+        if num_perm % bands:
+            raise ValueError("num_perm должно делиться на bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.num_perm = num_perm
+        self._keys: List[K | None] = []
+        self._slot: Dict[K, int] = {}
+        self._sigs = np.zeros((0, num_perm), dtype=np.uint32)
+        # band -> (отсортированные хеши полосы, слоты в том же порядке)
+        self._bands = [(np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)) for _ in range(bands)]
+        self._pending: List[np.ndarray] = []
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slot
+
+    def _band_hashes(self, sigs: np.ndarray) -> np.ndarray:
+        # (n, num_perm) -> (n, bands): полоса из rows значений uint32 -> один uint64
+        parts = sigs.reshape(len(sigs), self.bands, self.rows).astype(np.uint64)
+        h = np.zeros(parts.shape[:2], dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            for r in range(self.rows):
+                h = (h * np.uint64(0x100000001B3)) ^ parts[:, :, r]
+        return h
+
+    def add(self, key: K, sig: np.ndarray) -> None:
+        if key in self._slot:
+            self.remove(key)
+        self._slot[key] = len(self._keys)
+        self._keys.append(key)
+        self._pending.append(np.asarray(sig, dtype=np.uint32).reshape(self.num_perm))
+
+    def remove(self, key: K) -> bool:
+        slot = self._slot.pop(key, None)
+        if slot is None:
+            return False
+        self._keys[slot] = None
+        return True
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        start = len(self._sigs)
+        new = np.stack(self._pending)
+        self._pending = []
+        self._sigs = np.vstack([self._sigs, new])
+        hashes = self._band_hashes(new)
+        slots = np.arange(start, start + len(new), dtype=np.int64)
+        for b in range(self.bands):
+            keys, idx = self._bands[b]
+            keys = np.concatenate([keys, hashes[:, b]])
+            idx = np.concatenate([idx, slots])
+            order = np.argsort(keys, kind="stable")
+            self._bands[b] = (keys[order], idx[order])
+
+    def query(self, sig: np.ndarray, threshold: float = 0.0, limit: int = 5) -> List[Tuple[K, float]]:
+        """Ключи с оценкой Жаккара >= threshold, по убыванию сходства."""
+        self._flush()
+        if not self._slot:
+            return []
+        sig = np.asarray(sig, dtype=np.uint32).reshape(self.num_perm)
+        hashes = self._band_hashes(sig[None, :])[0]
+        found = []
+        for b in range(self.bands):
+            keys, idx = self._bands[b]
+            lo, hi = np.searchsorted(keys, hashes[b], side="left"), np.searchsorted(keys, hashes[b], side="right")
+            if hi > lo:
+                found.append(idx[lo:hi])
+        if not found:
+            return []
+        slots = np.unique(np.concatenate(found))
+        sims = (self._sigs[slots] == sig).mean(axis=1)
+        out = [(self._keys[s], float(v)) for s, v in zip(slots, sims)
+               if v >= threshold and self._keys[s] is not None]
+        out.sort(key=lambda kv: -kv[1])
+        return out[:limit]
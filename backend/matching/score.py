@@ -1,16 +1,100 @@
-from rank_bm25 import BM25Okapi
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+import numpy as np
 from rapidfuzz import fuzz
 from .skills import normalize_skills
+from .embeddings import get_embedder
 
-def bm25_score(vac_text: str, res_text: str) -> float:
-    docs = [vac_text.lower().split()]
-    bm25 = BM25Okapi(docs)
-    s = bm25.get_scores(res_text.lower().split())[0]
+# параметры BM25Okapi (как в rank_bm25)
+BM25_K1 = 1.5
+BM25_B = 0.75
+BM25_EPSILON = 0.25
+
+# версия токенизации: сохранённые bm25_tf другой версии пересчитываются (см. VacancyService)
+BM25_TOKENS_VERSION = 2
+# слово без пунктуации по краям; + и # внутри/в конце оставляем - иначе c++ и c# станут "c"
+_TOKEN_RX = re.compile(r"\w[\w+#]*")
+
+def tokenize(text: str) -> List[str]:
+    """Токены BM25: "Python," и "python" - один термин."""
+    return _TOKEN_RX.findall(text.lower())
+
+def bm25_doc_stats(text: str) -> Dict[str, int]:
+    """Частоты токенов документа - всё, что нужно BM25 от вакансии (можно хранить заранее)."""
+    return dict(Counter(tokenize(text)))
+
+def bm25_weights(tf: Dict[str, int]) -> Dict[str, float]:
+    """
+    Вклад каждого термина документа в BM25Okapi для корпуса из одного документа.
+    Повторяет вычисления rank_bm25 операция в операцию, поэтому скор совпадает побитно -
+    если rank_bm25 дать те же токены (tokenize, а не его обычный split()).
+    """
+    if not tf:
+        return {}
+    corpus_size, doc_freq = 1, 1
+    doc_len = sum(tf.values())
+    avgdl = doc_len / corpus_size
+
+    idf: Dict[str, float] = {}
+    idf_sum = 0
+    negative = []
+    for word in tf:
+        value = math.log(corpus_size - doc_freq + 0.5) - math.log(doc_freq + 0.5)
+        idf[word] = value
+        idf_sum += value
+        if value < 0:
+            negative.append(word)
+    eps = BM25_EPSILON * (idf_sum / len(idf))
+    for word in negative:
+        idf[word] = eps
+
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_len / avgdl)
+    return {w: idf[w] * (f * (BM25_K1 + 1) / (f + norm)) for w, f in tf.items()}
+
+def bm25_score_weights(weights: Dict[str, float], res_text: str) -> float:
+    return bm25_score_tokens(weights, tokenize(res_text))
+
+def bm25_score_tokens(weights: Dict[str, float], tokens: Iterable[str]) -> float:
+    """То же по уже токенизированному резюме (см. AnalyzedText.tokens)."""
+    s = 0.0
+    for q in tokens:
+        w = weights.get(q)
+        if w is not None:
+            s += w
+    return float(min(1.0, s / 5.0))
+
+def bm25_score_counts(weights: Dict[str, float], tf: Dict[str, int]) -> float:
+    """
+    То же по частотам токенов резюме (AnalyzedText.token_counts или сохранённые bm25_tf):
+    вклад термина умножается на его частоту. Порядок сложения другой, чем у цикла по токенам, -
+    скор может разойтись с bm25_score_tokens в последних битах.
+    """
+    s = 0.0
+    for q in weights.keys() & tf.keys():
+        s += weights[q] * tf[q]
     return float(min(1.0, s / 5.0))
 
+def bm25_score(vac_text: str, res_text: str) -> float:
+    return bm25_score_weights(bm25_weights(bm25_doc_stats(vac_text)), res_text)
+
 def fuzzy_score(vac_text: str, res_text: str) -> float:
     return fuzz.token_set_ratio(vac_text, res_text) / 100.0
 
+def semantic_score_vectors(vac_vec: np.ndarray, res_vec: np.ndarray) -> float:
+    """Косинусная близость эмбеддингов (векторы Embedder нормированы), отрицательная -> 0."""
+    return max(0.0, float(np.dot(vac_vec, res_vec)))
+
+def semantic_score(vac_text: str, res_text: str, config: Optional[Dict[str, Any]] = None) -> float:
+    """
+    Смысловая близость текстов бэкендом embeddings.get_embedder(**config) - config тот же,
+    что у EmbeddingService (hashing / onnx); без config - hashing по умолчанию.
+    Векторы считаются здесь же, без кэша - для пула и реестра см. EmbeddingService.similarity.
+    """
+    vecs = get_embedder(**(config or {})).embed([vac_text, res_text])
+    return semantic_score_vectors(vecs[0], vecs[1])
+
 def coverage_score(req: list[str], res_skills: set[str]) -> float:
     if not req:
         return 1.0
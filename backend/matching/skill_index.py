@@ -0,0 +1,183 @@
+from typing import Any, Dict, Generic, Hashable, Iterable, List, Sequence, Set, Tuple, TypeVar
+
+import numpy as np
+
+from .matcher import WEIGHTS
+
+K = TypeVar("K", bound=Hashable)
+
+# сколько к скору decide могут добавить bm25 и fuzzy (каждый в [0, 1]) - их индекс не знает
+SIMILARITY_SLACK = WEIGHTS["bm25"] + WEIGHTS["fuzzy"]
+# короткий список для полного decide при поиске top-k - столько вакансий на каждое место
+SHORTLIST_FACTOR = 4
+
+
+class RequirementIndex(Generic[K]):
+    """
+    Обратный мэтчинг: инвертированный индекс "канонический навык -> вакансии" с заранее
+    посчитанными весами must_have / nice_to_have. Для резюме индекс даёт оценку вакансий
+    без текста - покрытие требований и опыт, как в decide, без bm25/fuzzy:
+
+        prescore <= score decide <= prescore + SIMILARITY_SLACK
+
+    Поэтому полный decide нужен только короткому списку лучших по оценке (см. candidates / best_k).
+    Вакансии добавляются и удаляются по одному, как в BM25Index.
+    """
+
+    def __init__(self):
+        self._keys: List[K | None] = []
+        self._reqs: List[Tuple[Dict[str, float], float] | None] = []
+        self._min_years: List[float] = []
+        # покрытие пустого списка требований = 1.0 (как coverage_score) - константа вакансии
+        self._base: List[float] = []
+        self._slot: Dict[K, int] = {}
+        self._dead = 0
+
+        # постинги: навык -> слоты и веса (с мёртвыми слотами до компактизации)
+        self._post_slots: Dict[str, List[int]] = {}
+        self._post_w: Dict[str, List[float]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._dense: Tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._slot
+
+    @staticmethod
+    def _weights(must_have: Iterable[str], nice_to_have: Iterable[str]) -> Tuple[Dict[str, float], float]:
+        weights: Dict[str, float] = {}
+        base = 0.0
+        for part, req in (("must_coverage", must_have), ("nice_coverage", nice_to_have)):
+            names = [r.lower() for r in req or []]
+            if not names:
+                base += WEIGHTS[part]
+                continue
+            # каждое вхождение требования - 1/len доли покрытия (дубликаты считаются, как в coverage_score)
+            for name in names:
+                weights[name] = weights.get(name, 0.0) + WEIGHTS[part] / len(names)
+        return weights, base
+
+    def add(self, key: K, must_have: Iterable[str], nice_to_have: Iterable[str],
+            min_years_total: float | None = None) -> None:
+        if key in self._slot:
+            self.remove(key)
+        weights, base = self._weights(must_have, nice_to_have)
+        self._insert(key, weights, base, np.nan if min_years_total is None else float(min_years_total))
+
+    def _insert(self, key: K, weights: Dict[str, float], base: float, min_years: float) -> None:
+        slot = len(self._keys)
+        self._keys.append(key)
+        self._reqs.append((weights, base))
+        self._min_years.append(min_years)
+        self._base.append(base)
+        self._slot[key] = slot
+
+        for skill, w in weights.items():
+            posting = self._post_slots.get(skill)
+            if posting is None:
+                self._post_slots[skill] = [slot]
+                self._post_w[skill] = [w]
+            else:
+                posting.append(slot)
+                self._post_w[skill].append(w)
+        self._dense = None
+
+    def remove(self, key: K) -> bool:
+        slot = self._slot.pop(key, None)
+        if slot is None:
+            return False
+        self._keys[slot] = None
+        self._reqs[slot] = None
+        self._dead += 1
+        self._dense = None
+        if self._dead > max(64, len(self._keys) // 4):
+            self._compact()
+        return True
+
+    def _compact(self) -> None:
+        """Пересобирает индекс из живых вакансий (в порядке добавления)."""
+        docs = [(k, self._reqs[s], self._min_years[s]) for s, k in enumerate(self._keys) if k is not None]
+        self.__init__()
+        for k, (weights, base), min_years in docs:
+            self._insert(k, weights, base, min_years)
+
+    def _postings(self, skill: str) -> Tuple[np.ndarray, np.ndarray]:
+        slots, ws = self._post_slots[skill], self._post_w[skill]
+        arr = self._arrays.get(skill)
+        done = 0 if arr is None else len(arr[0])
+        if done < len(slots):
+            # после add в numpy переводим только новый хвост постинга
+            tail = (np.asarray(slots[done:], dtype=np.intp), np.asarray(ws[done:], dtype=np.float64))
+            arr = tail if arr is None else (np.concatenate((arr[0], tail[0])), np.concatenate((arr[1], tail[1])))
+            self._arrays[skill] = arr
+        return arr
+
+    def _prepare(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._dense is None:
+            alive = np.fromiter((k is not None for k in self._keys), dtype=bool, count=len(self._keys))
+            self._dense = (np.asarray(self._base, dtype=np.float64),
+                           np.asarray(self._min_years, dtype=np.float64), alive)
+        return self._dense
+
+    def prescores(self, skills: Set[str], exp_years: float | None) -> np.ndarray:
+        """
+        Оценка всех вакансий (по слотам, мёртвые - -inf) для навыков и стажа резюме.
+        """
+        base, min_years, alive = self._prepare()
+        n = len(self._keys)
+
+        # покрытие: только постинги навыков резюме, сложенные одним bincount
+        slots, ws = [], []
+        for skill in skills:
+            if skill in self._post_slots:
+                s, w = self._postings(skill)
+                slots.append(s)
+                ws.append(w)
+        scores = base.copy()
+        if slots:
+            scores += np.bincount(np.concatenate(slots), weights=np.concatenate(ws), minlength=n)
+
+        # опыт - та же формула, что в decide
+        exp = float(exp_years or 0.0)
+        with np.errstate(invalid="ignore"):
+            exp_ok = np.where(np.isnan(min_years) | (exp >= min_years), 1.0, exp / np.maximum(1.0, min_years))
+        scores += WEIGHTS["experience"] * exp_ok
+
+        if self._dead:
+            scores[~alive] = -np.inf
+        return scores
+
+    def shortlist(self, skills: Set[str], exp_years: float | None, m: int) -> Tuple[List[Tuple[K, float]], float]:
+        """
+        m лучших вакансий по оценке (по убыванию) и лучшая оценка среди остальных (-inf, если их нет).
+        Если k-й скор decide в списке не ниже этой оценки + SIMILARITY_SLACK, top-k по decide точный.
+        """
+        if m <= 0 or not self._slot:
+            return [], -np.inf
+        scores = self.prescores(skills, exp_years)
+        m = min(m, len(self._slot))
+        if m < len(scores):
+            part = np.argpartition(-scores, m)
+            idx, rest = part[:m], scores[part[m]]
+        else:
+            idx, rest = np.arange(len(scores)), -np.inf
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        return [(self._keys[i], float(scores[i])) for i in idx if self._keys[i] is not None], float(rest)
+
+    def candidates(self, skills: Set[str], exp_years: float | None, k: int, exclude: K | None = None) -> List[K]:
+        """
+        Вакансии для полного decide при поиске top-k: SHORTLIST_FACTOR * k лучших по оценке
+        (без exclude). Список не растёт до доказанной точности - top-k по нему точен, когда
+        оценки отделены больше чем на SIMILARITY_SLACK, иначе это приближение.
+        """
+        if k <= 0:
+            return []
+        shortlist, _ = self.shortlist(skills, exp_years, SHORTLIST_FACTOR * k + (exclude is not None))
+        return [key for key, _ in shortlist if key != exclude][:SHORTLIST_FACTOR * k]
+
+
+def best_k(keys: Sequence[K], results: Sequence[Dict[str, Any]], k: int) -> List[Tuple[K, Dict[str, Any]]]:
+    """top-k по скору decide для короткого списка (при равенстве - в порядке списка)."""
+    return sorted(zip(keys, results), key=lambda kv: -kv[1]["score"])[:k]
@@ -1,18 +1,214 @@
+import json
+import os
 import re
-from functools import lru_cache
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 from .aliases import ALIASES
 
-@lru_cache(maxsize=1)
-def _compiled():
-    pats = {}
-    for canon, variants in ALIASES.items():
-        pats[canon] = re.compile(r"\b(?:{})\b".format("|".join(map(re.escape, variants))), re.I)
-    return pats
+# версия встроенной таксономии (ALIASES); у загруженных из файла - своя, см. taxonomy.py
+BUILTIN_VERSION = "builtin"
+# заголовок файла скомпилированного матчера
+_MAGIC = b"SKILLMATCHER/1\n"
+# как часто процесс проверяет, не заменили ли файл матчера
+_CHECK_SEC = 2.0
+
+
+@dataclass(slots=True)
+class SkillHit:
+    skill: str
+    alias: str
+    start: int
+    end: int
+
+
+def _is_word(ch: str) -> bool:
+    # то же определение \w, что у re для str-паттернов
+    return ch.isalnum() or ch == "_"
+
+def _boundary(text: str, pos: int) -> bool:
+    left = pos > 0 and _is_word(text[pos - 1])
+    right = pos < len(text) and _is_word(text[pos])
+    return left != right
+
+
+class SkillMatcher:
+    """
+    Все алиасы таксономии в одном регулярном выражении-дереве (trie): текст сканируется один раз,
+    стоимость позиции зависит от длины совпадения, а не от числа алиасов.
+
+    Семантика та же, что у прежнего "\\b(?:алиасы канона)\\b" на каждый канон: алиас найден,
+    если совпадает без учёта регистра и с границами слова с обеих сторон. Выражение стоит
+    в lookahead, поэтому проверяется каждая позиция (перекрывающиеся совпадения не теряются),
+    а из самого длинного совпадения в позиции восстанавливаются и более короткие алиасы-префиксы.
+    """
+
+    def __init__(self, aliases: Mapping[str, Iterable[str]], version: str = BUILTIN_VERSION):
+        self.version = version
+        # алиас (в нижнем регистре) -> каноны
+        self.canon: Dict[str, List[str]] = {}
+        for canon, variants in aliases.items():
+            for v in variants:
+                key = v.lower()
+                if key and canon not in self.canon.setdefault(key, []):
+                    self.canon[key].append(canon)
+
+        # алиас -> он сам и все алиасы, являющиеся его префиксами (от длинного к короткому)
+        self._prefixes: Dict[str, List[str]] = {
+            key: [key[:n] for n in range(len(key), 0, -1) if key[:n] in self.canon]
+            for key in self.canon
+        }
+        self._pattern = r"\b(?=({})\b)".format(self._trie_pattern(self.canon)) if self.canon else ""
+        self._rx = re.compile(self._pattern, re.I) if self._pattern else None
+
+    def dump(self, path: str) -> None:
+        """
+        Сохраняет матчер (алиасы, префиксы и готовое выражение-дерево) в файл. Запись атомарная:
+        во временный файл рядом и os.replace, так что читатели видят либо старый файл, либо новый.
+        """
+        payload = json.dumps({"version": self.version, "canon": self.canon, "prefixes": self._prefixes,
+                              "pattern": self._pattern}, ensure_ascii=False).encode("utf-8")
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(_MAGIC)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillMatcher":
+        """
+        Матчер из файла dump без построения дерева: чтение файла, разбор JSON и компиляция
+        готового выражения (её каждый процесс делает сам - re.Pattern не переносится между процессами).
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data.startswith(_MAGIC):
+            raise ValueError(f"{path}: не файл скомпилированного матчера навыков")
+        state = json.loads(data[len(_MAGIC):])
+        m = cls.__new__(cls)
+        m.version = state["version"]
+        m.canon = state["canon"]
+        m._prefixes = state["prefixes"]
+        m._pattern = state["pattern"]
+        m._rx = re.compile(m._pattern, re.I) if m._pattern else None
+        return m
+
+    @staticmethod
+    def _trie_pattern(words: Iterable[str]) -> str:
+        trie: Dict[str, dict] = {}
+        for w in words:
+            node = trie
+            for ch in w:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+
+        def build(node: Dict[str, dict]) -> str:
+            terminal = "" in node
+            branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            if terminal:
+                # жадная необязательная часть: сначала пробуем более длинный алиас
+                return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+            return body
+
+        return build(trie)
+
+    def finditer(self, text: str) -> Iterable[SkillHit]:
+        """
+        Все вхождения алиасов по порядку позиций. В одной позиции может быть несколько
+        алиасов ("windows" и "windows server") - отдаются от длинного к короткому.
+        """
+        if self._rx is None or not text:
+            return
+        for m in self._rx.finditer(text):
+            start = m.start()
+            longest = m.group(1)
+            for alias in self._prefixes.get(longest.lower(), ()):
+                end = start + len(alias)
+                # граница слова после более короткого алиаса (после самого длинного её проверил regex)
+                if len(alias) != len(longest) and not _boundary(text, end):
+                    continue
+                for canon in self.canon[alias]:
+                    yield SkillHit(canon, alias, start, end)
+
+    def extract(self, text: str) -> Dict[str, List[Tuple[int, int]]]:
+        """
+        Канон -> позиции (start, end) вхождений. Вхождение, перекрытое предыдущим того же канона
+        ("airflow" внутри "apache airflow"), не считается. Количество вхождений - длина списка.
+        """
+        found: Dict[str, List[Tuple[int, int]]] = {}
+        for hit in self.finditer(text):
+            spans = found.setdefault(hit.skill, [])
+            if not spans or hit.start >= spans[-1][1]:
+                spans.append((hit.start, hit.end))
+        return found
+
+
+class _CurrentMatcher:
+    """
+    Матчер процесса: встроенные ALIASES или файл скомпилированной таксономии (use_compiled).
+    Файл проверяется не чаще _CHECK_SEC; если его заменили (новая версия таксономии),
+    матчер перечитывается и подменяется одной ссылкой - без рестарта и без блокировок.
+    """
+
+    def __init__(self):
+        self.path: Optional[str] = None
+        self.matcher: Optional[SkillMatcher] = None
+        self._stamp: Optional[Tuple[int, int, int]] = None
+        self._checked_at = 0.0
+
+    def use(self, path: Optional[str]) -> None:
+        self.path = path
+        self._stamp = None
+        self._checked_at = 0.0
+        if path is None:
+            self.matcher = None
+
+    def _reload(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if stamp != self._stamp:
+            self.matcher = SkillMatcher.load(self.path)
+            self._stamp = stamp
+
+    def get(self) -> SkillMatcher:
+        if self.path is not None:
+            now = time.monotonic()
+            if now - self._checked_at >= _CHECK_SEC:
+                self._checked_at = now
+                self._reload()
+        if self.matcher is None:
+            self.matcher = SkillMatcher(ALIASES)
+        return self.matcher
+
+
+_current = _CurrentMatcher()
+
+def use_compiled(path: Optional[str]) -> None:
+    """
+    Брать навыки из файла скомпилированной таксономии (None - встроенные ALIASES).
+    Вызывается в каждом процессе - и в основном, и в процессах пула (initializer).
+    """
+    _current.use(path)
+
+def current_matcher() -> SkillMatcher:
+    return _current.get()
+
+def taxonomy_version() -> str:
+    return current_matcher().version
+
+def extract_skills(text: str) -> Dict[str, List[Tuple[int, int]]]:
+    return current_matcher().extract(text)
+
+def skill_counts(text: str) -> Dict[str, int]:
+    return {canon: len(spans) for canon, spans in extract_skills(text).items()}
 
 def normalize_skills(text: str) -> set[str]:
-    pats = _compiled()
-    found = set()
-    for canon, rx in pats.items():
-        if rx.search(text):
-            found.add(canon)
-    return found
+    return set(extract_skills(text))
@@ -0,0 +1,65 @@
+"""
+Таксономия навыков вне кода: JSON {"version": "...", "aliases": {канон: [алиасы]}}.
+Исходник компилируется в файл матчера (SkillMatcher.dump), который процессы читают
+через use_compiled и подхватывают после замены без рестарта.
+
+Из backend/:
+    python -m matching.taxonomy export taxonomy.json            # встроенные ALIASES как исходник
+    python -m matching.taxonomy compile taxonomy.json taxonomy.json.bin
+"""
+import argparse
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+from .aliases import ALIASES
+from .skills import SkillMatcher
+
+
+def load_taxonomy(path: str) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    (версия, канон -> алиасы) из исходника. Без явной версии - хеш содержимого,
+    чтобы любая правка давала новую версию (и пересчёт признаков резюме).
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    data = json.loads(raw)
+    aliases = data.get("aliases")
+    if not isinstance(aliases, dict) or not all(isinstance(v, list) for v in aliases.values()):
+        raise ValueError(f"{path}: ожидается {{'aliases': {{канон: [алиасы]}}}}")
+    version = str(data.get("version") or hashlib.sha256(raw).hexdigest()[:12])
+    return version, aliases
+
+
+def compile_taxonomy(src: str, out: str) -> str:
+    """Компилирует исходник в файл матчера (атомарно). Возвращает версию."""
+    version, aliases = load_taxonomy(src)
+    SkillMatcher(aliases, version).dump(out)
+    return version
+
+
+def export_builtin(out: str, version: str = "1") -> None:
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump({"version": version, "aliases": {k: sorted(v) for k, v in sorted(ALIASES.items())}},
+                  f, ensure_ascii=False, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Таксономия навыков")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("compile", help="исходник JSON -> файл матчера")
+    p.add_argument("src")
+    p.add_argument("out")
+    p = sub.add_parser("export", help="встроенные ALIASES -> исходник JSON")
+    p.add_argument("out")
+    p.add_argument("--version", default="1")
+    args = parser.parse_args()
+
+    if args.cmd == "compile":
+        print(compile_taxonomy(args.src, args.out))
+    else:
+        export_builtin(args.out, args.version)
+
+
+if __name__ == "__main__":
+    main()
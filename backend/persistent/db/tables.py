@@ -1,6 +1,6 @@
 from persistent.db.base import Base, WithId, With_created_at, With_updated_at
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy import Column, Text, INTEGER
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY, DOUBLE_PRECISION
+from sqlalchemy import Column, Text, INTEGER, DateTime, LargeBinary
 
 
 class User(Base, With_created_at, With_updated_at):
@@ -10,4 +10,87 @@ class User(Base, With_created_at, With_updated_at):
     meta = Column(Text, nullable=False)
     hard_topics = Column(JSONB, nullable=False)
     soft_topics = Column(JSONB, nullable=False)
-    
\ No newline at end of file
+    # ссылки на входы генерации материалов интервью (cv_features.id, хеш текста вакансии, вердикт),
+    # пока она не закончилась; NULL - материалы готовы
+    pending = Column(JSONB, nullable=True)
+    # когда генерацию взял на себя процесс (API, воркер) - остальные ждут, а не генерируют заново
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# кэш результатов /compare: ключ - хеш нормализованных текстов резюме и вакансии
+class CompareCache(Base, With_created_at):
+    __tablename__ = "compare_cache"
+    key = Column(Text, primary_key=True)
+    response = Column(JSONB, nullable=False)
+    interview = Column(JSONB, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+
+# реестр вакансий: профиль и признаки для мэтчера считаются один раз при загрузке
+class Vacancy(Base, WithId, With_created_at):
+    __tablename__ = "vacancy"
+    title = Column(Text, nullable=False)
+    profile = Column(JSONB, nullable=False)
+    text = Column(Text, nullable=False)
+    features = Column(JSONB, nullable=False)
+
+
+# тексты вакансий по хешу (zlib) для отложенной генерации материалов интервью:
+# вакансия, пришедшая файлом в /compare, в реестр не попадает
+class VacancyText(Base, With_created_at):
+    __tablename__ = "vacancy_text"
+    text_hash = Column(Text, primary_key=True)
+    text_z = Column(LargeBinary, nullable=False)
+
+
+# признаки резюме для повторного мэтчинга без DOCX: текст хранится сжатым (zlib),
+# features_version - версия извлекателей, которыми посчитаны skills/experience/english,
+# minhash - MinHash-подпись текста (uint32 x NUM_PERM) для поиска почти-дубликатов
+class CvFeatures(Base, WithId, With_created_at):
+    __tablename__ = "cv_features"
+    text_hash = Column(Text, nullable=False, unique=True)
+    filename = Column(Text, nullable=True)
+    text_z = Column(LargeBinary, nullable=False)
+    contacts = Column(JSONB, nullable=False)
+    skills = Column(ARRAY(Text), nullable=False)
+    experience_years = Column(DOUBLE_PRECISION, nullable=True)
+    english_level = Column(Text, nullable=True)
+    features_version = Column(Text, nullable=False)
+    minhash = Column(LargeBinary, nullable=True)
+    # частоты токенов BM25 (features.cv_features); NULL - запись старой версии признаков
+    bm25_tf = Column(JSONB, nullable=True)
+
+
+# очередь фоновых задач (compare и т.п.): воркеры забирают задачи через FOR UPDATE SKIP LOCKED
+class Job(Base, WithId, With_created_at, With_updated_at):
+    __tablename__ = "job"
+    kind = Column(Text, nullable=False)
+    status = Column(Text, nullable=False, default="queued")
+    payload = Column(JSONB, nullable=False, default=dict)
+    cv = Column(LargeBinary, nullable=True)
+    vacancy = Column(LargeBinary, nullable=True)
+    result = Column(JSONB, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(INTEGER, nullable=False, default=0)
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+
+# кэш эмбеддингов документов: ключ - бэкенд (имя модели) и sha256 текста, вектор - float32 байтами
+class Embedding(Base, With_created_at):
+    __tablename__ = "embedding"
+    model = Column(Text, primary_key=True)
+    text_hash = Column(Text, primary_key=True)
+    vector = Column(LargeBinary, nullable=False)
+
+
+# результаты оффлайн-скрининга (screen.py): строка на пару файл резюме / вакансия в прогоне run_id;
+# повторная запись той же пары (после возобновления с контрольной точки) перезаписывает строку
+class BulkResult(Base, With_created_at):
+    __tablename__ = "bulk_result"
+    run_id = Column(Text, primary_key=True)
+    file = Column(Text, primary_key=True)
+    vacancy = Column(Text, primary_key=True)
+    decision = Column(Text, nullable=True)
+    score = Column(DOUBLE_PRECISION, nullable=True)
+    result = Column(JSONB, nullable=False)
+    error = Column(Text, nullable=True)
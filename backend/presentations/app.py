@@ -1,16 +1,44 @@
-from fastapi import UploadFile, File, Path, FastAPI, HTTPException, status, WebSocket, Request, WebSocketDisconnect
+from fastapi import UploadFile, File, Form, Path, FastAPI, HTTPException, status, WebSocket, Request, WebSocketDisconnect
 from contextlib import asynccontextmanager
 from utils.websocket import ConnectionManager
 from services.parsing_service import ParsingService
 from services.match_service import MatchService
-from llm_compare.llm_module import LLMAnalyzer
 from services.user import UserService
+from services.interview_service import InterviewService
+from services.compare_cache import CompareCacheService
+from services.analysis_service import AnalysisService
+from services.screening_service import ScreeningService, CvSource
+from repositories.db.compare_cache import CompareCacheRepository
 from utils.voice.сhunk_processor import chunk_processor
 from settings.settings import settings
 from repositories.db.repository import Repository
-from schemas.docs import ParsingAndLLMResponse, InterviewDTO
+from schemas.docs import ParsingAndLLMResponse, InterviewDTO, ParsedDocument
+from schemas.vacancy import VacancyResponse, VacancyRankItem, VacancySuggestion
+from services.vacancy_service import VacancyService
+from repositories.db.vacancy import VacancyRepository
+from schemas.candidate import CandidateDTO, CandidateResponse, RescreenResponse, CandidateRankItem
+from services.candidate_service import CandidateService
+from services.near_duplicate_service import NearDuplicateService
+from repositories.db.cv_features import CvFeaturesRepository
+from services.embedding_service import EmbeddingService
+from services.taxonomy_service import TaxonomyService
+from repositories.db.embedding import EmbeddingRepository
+from matching.matcher import vacancy_text
+from repositories.db.job import JobRepository, JOB_NEW_CHANNEL, JOB_DONE_CHANNEL, DONE, FAILED
+from infrastructure.db.notify import PgNotifier
+from services.job_service import JobService, JobWorker, compare_job_handler, COMPARE_JOB
+from schemas.job import JobDTO, JobResponse
+from infrastructure.executor.pool import CpuExecutor
+from infrastructure.llm.transport import endpoint_stats
+from utils.deadline import Deadline
 from utils.websocket import ConnectionManager, AudioConnectionManager, MessageType
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from utils.docx_extract import MAX_DOCX_BYTES
+from typing import List
+from uuid import UUID
+from io import BytesIO
+import zipfile
 from pydantic import BaseModel
 from repositories.db.repository import Repository
 import asyncio
@@ -28,8 +56,23 @@ async_client: httpx.AsyncClient | None = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     app.state.http_client = httpx.AsyncClient(timeout=settings.analyzer.timeout_sec)
+    taxonomy_service.prepare()
+    await cpu_executor.start()
+
+    # очередь задач: LISTEN/NOTIFY и воркеры в этом же процессе (отдельно - см. worker.py)
+    await job_notifier.start()
+    stop = asyncio.Event()
+    handlers = {COMPARE_JOB: compare_job_handler(parsing_service, vacancy_service, screening_service,
+                                                 app.state.http_client)}
+    workers = [asyncio.create_task(JobWorker(JobRepository(), handlers, job_notifier).run(stop))
+               for _ in range(settings.jobs.workers)]
+    taxonomy_watch = asyncio.create_task(taxonomy_service.watch(stop))
     yield
+    stop.set()
+    await asyncio.gather(*workers, taxonomy_watch, return_exceptions=True)
+    await job_notifier.stop()
     await app.state.http_client.aclose()
+    cpu_executor.shutdown()
 
 app = FastAPI(title="ВТБ хак",
               docs_url='/docs',
@@ -48,9 +91,26 @@ app.add_middleware(
 
 # экземпляры классов сервисов и репозитория
 repository = Repository()
-parsing_service = ParsingService(repository)
+taxonomy_service = TaxonomyService(settings.taxonomy.path, settings.taxonomy.compiled_path,
+                                   settings.taxonomy.poll_interval_sec)
+cpu_executor = CpuExecutor(settings.executor.processes, settings.executor.start_method,
+                           settings.executor.max_tasks_per_child,
+                           initializers=taxonomy_service.initializers())
+parsing_service = ParsingService(repository, cpu_executor)
 matching_service = MatchService(parsing_service)
 user_service = UserService()
+compare_cache = CompareCacheService(CompareCacheRepository())
+near_duplicates = NearDuplicateService(CvFeaturesRepository(), settings.near_duplicates.threshold,
+                                       settings.near_duplicates.bands) if settings.near_duplicates.enabled else None
+analysis_service = AnalysisService(compare_cache, near_duplicates)
+vacancy_service = VacancyService(parsing_service, VacancyRepository())
+candidate_service = CandidateService(parsing_service, vacancy_service, CvFeaturesRepository(), near_duplicates)
+embedding_service = EmbeddingService(cpu_executor, EmbeddingRepository() if settings.cache.pg_enabled else None,
+                                     VacancyRepository(), CvFeaturesRepository())
+interview_service = InterviewService(analysis_service, user_service, CvFeaturesRepository(), VacancyRepository())
+screening_service = ScreeningService(parsing_service, matching_service, analysis_service, interview_service)
+job_notifier = PgNotifier([JOB_NEW_CHANNEL, JOB_DONE_CHANNEL])
+job_service = JobService(JobRepository(), job_notifier)
 
 @app.get("/")
 async def test_endpoint() -> str:
@@ -60,56 +120,392 @@ async def test_endpoint() -> str:
     return "ok"
 
 
+def _check_docx(f: UploadFile) -> None:
+    if not f.filename.lower().endswith(".docx"):
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                            detail=f"Только .docx. Недопустим файл: {f.filename}")
+
+
+async def _read_vacancy(vacancy: UploadFile | None, vacancy_id: UUID | None) -> bytes | None:
+    """
+    Вакансию передают либо файлом, либо id из реестра (тогда возвращаем None).
+    """
+    if (vacancy is None) == (vacancy_id is None):
+        raise HTTPException(status_code=400, detail="Нужно передать либо файл vacancy, либо vacancy_id")
+    if vacancy is None:
+        return None
+    _check_docx(vacancy)
+    vac_bytes = await vacancy.read()
+    if not vac_bytes:
+        raise HTTPException(status_code=400, detail="Файл вакансии пустой")
+    return vac_bytes
+
+
+async def _vacancy_document(vac_bytes: bytes | None, vacancy_id: UUID | None,
+                            deadline: Deadline | None = None) -> ParsedDocument:
+    if vac_bytes is None:
+        return await vacancy_service.get_document(vacancy_id)
+    return await parsing_service.parse_vacancy(vac_bytes, deadline)
+
+
 @app.post("/compare", response_model=ParsingAndLLMResponse)
-async def compare_docs(request: Request, cv: UploadFile = File(...), vacancy: UploadFile = File(...)):
+async def compare_docs(request: Request,
+                       cv: UploadFile = File(...),
+                       vacancy: UploadFile | None = File(default=None),
+                       vacancy_id: UUID | None = Form(default=None),
+                       budget_sec: float | None = Form(default=None),
+                       force: bool = Form(default=False)):
     """
-    сравнение резюме и вакансии
+    сравнение резюме и вакансии (файлом или по vacancy_id из реестра).
+    budget_sec - бюджет времени ответа (по умолчанию settings.compare.budget_sec): если LLM
+    не успел, возвращается решение мэтчера с provisional=true и job_id для полного результата.
+    Вердикт почти-дубликата уже проверенного резюме переиспользуется (reused_from в ответе);
+    force=true - анализ заново
     """
-    for f in (cv, vacancy):
-        if not f.filename.lower().endswith(".docx"):
-            raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
-                                detail=f"Только .docx. Недопустим файл: {f.filename}")
-    
+    _check_docx(cv)
+    vac_bytes = await _read_vacancy(vacancy, vacancy_id)
     cv_bytes = await cv.read()
-    vac_bytes = await vacancy.read()
-    if not cv_bytes or not vac_bytes:
+    if not cv_bytes:
         raise HTTPException(status_code=400, detail="Один из файлов пустой")    
-        
-    text = await matching_service.docs_to_text(cv_bytes, vac_bytes)
-    dto = await matching_service.compare_docs(cv_bytes, vac_bytes)
-    dto.text = text
-
-    resp = ParsingAndLLMResponse(details=dto.decision.get("details", None))
-
-    if dto.decision["decision"] != "reject":
-        analyzer = LLMAnalyzer()
-        analyzer.set_data(text.cv_text, text.vac_text)
-        ok = await analyzer.analyze(request.app.state.http_client)
-        if not ok:
-            raise HTTPException(status_code=502, detail="LLM не смогло вернуть валидный JSON")
-        else:
-            resp.decision = analyzer.decision
-            resp.score = analyzer.match_percentage
-            resp.reasons = analyzer.candidate_feedback
-            
-            interview_dto = InterviewDTO(
-                summary=analyzer.compressed_data,
-                meta=analyzer.vacancy_meta,
-                hard_topics=analyzer.hard_interview_topics,
-                soft_topics=analyzer.soft_interview_topics
-            )
-            
-            user_id = await user_service.put_user(interview_dto)
-            encrypted_user_id = await user_service.get_encrypted_id(user_id)
-            resp.link = f"http://localhost/interview/{encrypted_user_id}"
-            
-            return resp
 
-    resp.decision = dto.decision["decision"]
-    resp.score = dto.decision["score"]*100
-    resp.reasons = dto.decision["reasons"][0] if dto.decision["reasons"] else None
+    budget = settings.compare.budget_sec if budget_sec is None else min(budget_sec, settings.analyzer.timeout_sec)
+    deadline = Deadline(budget) if budget > 0 else None
+    cv_doc, vac_doc = await asyncio.gather(
+        parsing_service.parse_cv(cv_bytes, deadline),
+        _vacancy_document(vac_bytes, vacancy_id, deadline),
+    )
+    resp, pending = await screening_service.compare_within(cv_doc, vac_doc, deadline,
+                                                           request.app.state.http_client, force)
+    if pending is not None:
+        payload = {"vacancy_id": str(vacancy_id)} if vacancy_id is not None else {}
+        try:
+            resp.job_id = await job_service.track(COMPARE_JOB, payload, pending, cv=cv_bytes, vacancy=vac_bytes)
+        except Exception:
+            # без очереди LLM всё равно доработает и попадёт в кэш - повторный /compare отдаст полный ответ
+            logging.getLogger(__name__).exception("failed to track provisional compare")
     return resp
 
+
+def _sse(event: str, data: dict | BaseModel) -> str:
+    if isinstance(data, BaseModel):
+        data = data.model_dump(mode="json")
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@app.post("/compare/stream")
+async def compare_docs_stream(request: Request,
+                              cv: UploadFile = File(...),
+                              vacancy: UploadFile | None = File(default=None),
+                              vacancy_id: UUID | None = Form(default=None),
+                              force: bool = Form(default=False)):
+    """
+    то же, что /compare, но Server-Sent Events по мере готовности этапов:
+    parsed -> decision (мэтчер) -> provisional_verdict (решение и процент LLM, stream) -> verdict (LLM)
+    -> link (только допущенным) -> result; при ошибке - error
+    """
+    _check_docx(cv)
+    # загрузки закрываются до начала стриминга ответа - байты читаем сейчас
+    vac_bytes = await _read_vacancy(vacancy, vacancy_id)
+    cv_bytes = await cv.read()
+    if not cv_bytes:
+        raise HTTPException(status_code=400, detail="Один из файлов пустой")
+
+    async def events():
+        try:
+            cv_doc, vac_doc = await asyncio.gather(
+                parsing_service.parse_cv(cv_bytes),
+                _vacancy_document(vac_bytes, vacancy_id),
+            )
+            profile = vac_doc.profile or {}
+            yield _sse("parsed", {
+                "contacts": cv_doc.contacts,
+                "vacancy": {k: profile.get(k) for k in ("title", "must_have", "nice_to_have",
+                                                        "min_years_total", "english_min_level")},
+            })
+            async for event, data in screening_service.compare_events(cv_doc, vac_doc, request.app.state.http_client,
+                                                                  force=force):
+                yield _sse(event, data)
+        except HTTPException as e:
+            yield _sse("error", {"status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logging.exception("compare stream failed")
+            yield _sse("error", {"status_code": 500, "detail": str(e)})
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@app.post("/vacancies", response_model=VacancyResponse)
+async def register_vacancy(vacancy: UploadFile = File(...)):
+    """
+    загрузка вакансии в реестр: парсится один раз, дальше в /compare можно передавать vacancy_id
+    """
+    _check_docx(vacancy)
+    vac_bytes = await vacancy.read()
+    if not vac_bytes:
+        raise HTTPException(status_code=400, detail="Файл вакансии пустой")
+    dto = await vacancy_service.register(vac_bytes)
+    await embedding_service.add_vacancy(dto.id, dto.profile)
+    return VacancyResponse(vacancy_id=dto.id, title=dto.title, profile=dto.profile)
+
+
+@app.get("/vacancies", response_model=List[VacancyResponse])
+async def list_vacancies(limit: int = 100, offset: int = 0):
+    """
+    список вакансий реестра
+    """
+    dtos = await vacancy_service.list(limit=limit, offset=offset)
+    return [VacancyResponse(vacancy_id=d.id, title=d.title, profile=d.profile) for d in dtos]
+
+
+@app.post("/vacancies/rank", response_model=List[VacancyRankItem])
+async def rank_vacancies(cv: UploadFile = File(...), limit: int = 20):
+    """
+    вакансии реестра, ближайшие к резюме по BM25 (idf и средняя длина - по всему реестру)
+    """
+    _check_docx(cv)
+    cv_doc = await parsing_service.parse_cv(await cv.read())
+    return await vacancy_service.rank(cv_doc.text or "", limit=min(max(limit, 0), 1000))
+
+
+@app.post("/vacancies/suggest", response_model=List[VacancySuggestion])
+async def suggest_vacancies(cv: UploadFile | None = File(default=None),
+                            candidate_id: UUID | None = Form(default=None),
+                            exclude_vacancy_id: UUID | None = Form(default=None),
+                            limit: int = 10):
+    """
+    лучшие вакансии реестра для резюме (файлом или сохранённого кандидата) - например,
+    альтернативы после отказа по exclude_vacancy_id
+    """
+    if (cv is None) == (candidate_id is None):
+        raise HTTPException(status_code=400, detail="Нужно передать либо файл cv, либо candidate_id")
+    if cv is not None:
+        _check_docx(cv)
+        cv_input = MatchService.cv_input(await parsing_service.parse_cv(await cv.read()))
+    else:
+        cv_input = CandidateService.cv_input(await candidate_service.get(candidate_id))
+    return await vacancy_service.suggest(cv_input, limit=min(max(limit, 0), 100), exclude=exclude_vacancy_id)
+
+
+@app.post("/vacancies/semantic", response_model=List[VacancyRankItem])
+async def semantic_vacancies(cv: UploadFile | None = File(default=None),
+                             candidate_id: UUID | None = Form(default=None),
+                             limit: int = 20):
+    """
+    вакансии реестра, ближайшие к резюме по смыслу (эмбеддинги, индекс ближайших)
+    """
+    if (cv is None) == (candidate_id is None):
+        raise HTTPException(status_code=400, detail="Нужно передать либо файл cv, либо candidate_id")
+    if cv is not None:
+        _check_docx(cv)
+        text = (await parsing_service.parse_cv(await cv.read())).text or ""
+    else:
+        text = (await candidate_service.get(candidate_id)).text
+    return await embedding_service.similar_vacancies(text, limit=min(max(limit, 0), 1000))
+
+
+@app.get("/vacancies/{vacancy_id}/candidates/semantic", response_model=List[CandidateRankItem])
+async def semantic_candidates(vacancy_id: UUID, limit: int = 50):
+    """
+    сохранённые кандидаты, ближайшие к вакансии по смыслу - короткий список перед rescreen/LLM
+    """
+    vac = MatchService.vacancy_input(await vacancy_service.get_document(vacancy_id))
+    return await embedding_service.similar_candidates(vacancy_text(vac), limit=min(max(limit, 0), 1000))
+
+
+@app.get("/vacancies/{vacancy_id}", response_model=VacancyResponse)
+async def get_vacancy(vacancy_id: UUID):
+    """
+    вакансия из реестра
+    """
+    dto = await vacancy_service.get(vacancy_id)
+    return VacancyResponse(vacancy_id=dto.id, title=dto.title, profile=dto.profile)
+
+
+def _job_response(job: JobDTO) -> JobResponse:
+    return JobResponse(job_id=job.id, kind=job.kind, status=job.status, result=job.result, error=job.error)
+
+
+@app.post("/jobs/compare", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_compare_job(cv: UploadFile = File(...),
+                             vacancy: UploadFile | None = File(default=None),
+                             vacancy_id: UUID | None = Form(default=None)):
+    """
+    асинхронный /compare: задача ставится в очередь, ответ - id задачи
+    """
+    _check_docx(cv)
+    vac_bytes = await _read_vacancy(vacancy, vacancy_id)
+    cv_bytes = await cv.read()
+    if not cv_bytes:
+        raise HTTPException(status_code=400, detail="Один из файлов пустой")
+    if vacancy_id is not None:
+        # проверяем сразу, чтобы не ставить в очередь заведомо невыполнимую задачу
+        await vacancy_service.get_document(vacancy_id)
+
+    payload = {"vacancy_id": str(vacancy_id)} if vacancy_id is not None else {}
+    job_id = await job_service.submit(COMPARE_JOB, payload, cv=cv_bytes, vacancy=vac_bytes)
+    return JobResponse(job_id=job_id, kind=COMPARE_JOB, status="queued")
+
+
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: UUID, wait: float = 0.0):
+    """
+    статус и результат задачи; wait > 0 - подождать завершения (long polling), секунд
+    """
+    if wait > 0:
+        return _job_response(await job_service.wait(job_id, timeout=min(wait, 60.0)))
+    return _job_response(await job_service.get(job_id))
+
+
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: UUID):
+    """
+    Server-Sent Events: текущий статус задачи сразу и итоговый - по NOTIFY о завершении
+    """
+    job = await job_service.get(job_id)
+
+    async def events():
+        current = job
+        yield _sse("status", _job_response(current))
+        while current.status not in (DONE, FAILED):
+            current = await job_service.wait(job_id, timeout=settings.jobs.poll_interval_sec * 6)
+            yield _sse("status", _job_response(current))
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+def _candidate_response(dto: CandidateDTO) -> CandidateResponse:
+    return CandidateResponse(candidate_id=dto.id, filename=dto.filename, skills=dto.skills,
+                             experience_years=dto.experience_years, english_level=dto.english_level)
+
+
+@app.post("/candidates", response_model=CandidateResponse)
+async def register_candidate(cv: UploadFile = File(...)):
+    """
+    сохранение резюме с признаками для повторного мэтчинга без повторной загрузки DOCX
+    """
+    _check_docx(cv)
+    cv_bytes = await cv.read()
+    if not cv_bytes:
+        raise HTTPException(status_code=400, detail="Файл резюме пустой")
+    dto = await candidate_service.register(cv_bytes, cv.filename)
+    await embedding_service.add("cv", dto.id, dto.filename, dto.text)
+    return _candidate_response(dto)
+
+
+@app.get("/candidates/{candidate_id}", response_model=CandidateResponse)
+async def get_candidate(candidate_id: UUID):
+    """
+    сохранённый кандидат
+    """
+    return _candidate_response(await candidate_service.get(candidate_id))
+
+
+@app.post("/vacancies/{vacancy_id}/rescreen", response_model=RescreenResponse)
+async def rescreen_vacancy(vacancy_id: UUID, limit: int = 100):
+    """
+    мэтчинг всех сохранённых кандидатов с вакансией из реестра (только мэтчер, без LLM)
+    """
+    return await candidate_service.rescreen(vacancy_id, limit=limit)
+
+
+def _zip_sources(data: bytes) -> List[CvSource]:
+    try:
+        zf = zipfile.ZipFile(BytesIO(data))
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Архив повреждён")
+
+    sources: List[CvSource] = []
+    for info in zf.infolist():
+        name = info.filename
+        if info.is_dir() or name.startswith("__MACOSX/") or not name.lower().endswith(".docx"):
+            continue
+
+        async def load(info: zipfile.ZipInfo = info) -> bytes:
+            if info.file_size > MAX_DOCX_BYTES:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Файл слишком большой")
+            return zf.read(info)
+
+        sources.append((name, load))
+    return sources
+
+
+@app.post("/compare/batch")
+async def compare_batch(request: Request,
+                        vacancy: UploadFile | None = File(default=None),
+                        vacancy_id: UUID | None = Form(default=None),
+                        cvs: List[UploadFile] = File(default=[]),
+                        archive: UploadFile | None = File(default=None)):
+    """
+    пакетный скрининг: одна вакансия (файлом или vacancy_id) против многих резюме
+    (файлы cvs и/или zip-архив), ответ - NDJSON, по строке на кандидата по мере готовности
+    """
+    vac_bytes = await _read_vacancy(vacancy, vacancy_id)
+
+    # загрузки закрываются до начала стриминга ответа - байты читаем сейчас
+    sources: List[CvSource] = []
+    for f in cvs:
+        if not f.filename.lower().endswith(".docx"):
+            async def load(name: str = f.filename) -> bytes:
+                raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                                    detail=f"Только .docx. Недопустим файл: {name}")
+        else:
+            data = await f.read()
+
+            async def load(data: bytes = data) -> bytes:
+                return data
+        sources.append((f.filename, load))
+    if archive is not None:
+        sources.extend(_zip_sources(await archive.read()))
+
+    if not sources:
+        raise HTTPException(status_code=400, detail="Не передано ни одного резюме")
+    if len(sources) > settings.batch.max_files:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                            detail=f"Не более {settings.batch.max_files} резюме за запрос")
+
+    # вакансия парсится один раз на весь пакет
+    vac_doc = await _vacancy_document(vac_bytes, vacancy_id)
+
+    async def lines():
+        async for item in screening_service.screen_batch(vac_doc, sources, request.app.state.http_client):
+            yield json.dumps(item, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson",
+                             headers={"X-Accel-Buffering": "no"})
+
+@app.get("/cache/stats")
+async def cache_stats() -> dict:
+    """
+    счётчики попаданий/промахов кэша результатов /compare
+    """
+    return compare_cache.stats()
+
+
+@app.get("/executor/stats")
+async def executor_stats() -> dict:
+    """
+    время CPU-этапов в пуле процессов: среднее/максимум, чистое вычисление и ожидание
+    """
+    return cpu_executor.stats()
+
+
+@app.get("/llm/stats")
+async def llm_stats() -> dict:
+    """
+    вызовы LLM по endpoint'ам: исходы попыток, повторы, дубли, состояние предохранителя, латентность
+    """
+    return endpoint_stats()
+
+
+@app.get("/taxonomy")
+async def taxonomy_info() -> dict:
+    """
+    текущая версия таксономии навыков (встроенная или из файла) и число алиасов
+    """
+    return taxonomy_service.info()
+
 class TestWebSocketRequest(BaseModel):
     user_id: int = 123
     chunks_count: int = 5
@@ -124,7 +520,13 @@ async def websocket_audio_endpoint(websocket: WebSocket, encrypted_user_id: str
         await websocket.close(code=4401)
         return
 
-    dto = await user_service.get_data_by_id(user_id)
+    # материалы интервью генерируются в фоне после вердикта - дожидаемся их до начала сессии
+    try:
+        dto = await interview_service.materials(user_id, websocket.app.state.http_client)
+    except Exception:
+        logging.exception("interview materials unavailable")
+        await websocket.close(code=1011, reason="Interview materials unavailable")
+        return
     audio_manager.data = dto
     audio_manager.set()
 
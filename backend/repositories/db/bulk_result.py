@@ -0,0 +1,27 @@
+from persistent.db.tables import BulkResult
+from infrastructure.db.connect import pg_connection
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Dict, List
+
+
+class BulkResultRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def put_many(self, run_id: str, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        stmt = insert(BulkResult).values([
+            {"run_id": run_id, "file": r["file"], "vacancy": r["vacancy"], "decision": r.get("decision"),
+             "score": r.get("score"), "result": r, "error": r.get("error")}
+            for r in rows
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[BulkResult.run_id, BulkResult.file, BulkResult.vacancy],
+            set_={"decision": stmt.excluded.decision, "score": stmt.excluded.score,
+                  "result": stmt.excluded.result, "error": stmt.excluded.error},
+        )
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
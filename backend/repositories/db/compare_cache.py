@@ -0,0 +1,55 @@
+from persistent.db.tables import CompareCache
+from infrastructure.db.connect import pg_connection
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from schemas.docs import CachedAnalysis
+
+
+class CompareCacheRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def get(self, key: str) -> Optional[CachedAnalysis]:
+        stmt = (
+            select(CompareCache.response, CompareCache.interview)
+            .where(CompareCache.key == key, CompareCache.expires_at > func.now())
+            .limit(1)
+        )
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            row = res.mappings().first()
+
+        if row is None:
+            return None
+
+        return CachedAnalysis(response=row["response"], interview=row["interview"])
+
+    async def put(self, key: str, value: CachedAnalysis, ttl_sec: float) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_sec)
+        values = {
+            "key": key,
+            "response": value.response.model_dump(mode="json"),
+            # без материалов интервью - JSON null (колонка NOT NULL)
+            "interview": value.interview.model_dump(mode="json") if value.interview is not None else None,
+            "expires_at": expires_at,
+        }
+        stmt = insert(CompareCache).values(values).on_conflict_do_update(
+            index_elements=[CompareCache.key],
+            set_={"response": values["response"], "interview": values["interview"], "expires_at": expires_at},
+        )
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def purge_expired(self) -> int:
+        stmt = delete(CompareCache).where(CompareCache.expires_at <= func.now())
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            await session.commit()
+
+        return res.rowcount or 0
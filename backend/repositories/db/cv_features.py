@@ -0,0 +1,107 @@
+from persistent.db.tables import CvFeatures
+from infrastructure.db.connect import pg_connection
+from sqlalchemy import select, update
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+from schemas.candidate import CandidateDTO
+import zlib
+
+
+def _to_dto(row: CvFeatures) -> CandidateDTO:
+    return CandidateDTO(
+        id=row.id,
+        filename=row.filename,
+        text=zlib.decompress(row.text_z).decode("utf-8"),
+        contacts=row.contacts or {},
+        skills=list(row.skills or []),
+        experience_years=row.experience_years,
+        english_level=row.english_level,
+        bm25_tf=row.bm25_tf,
+        features_version=row.features_version,
+    )
+
+
+class CvFeaturesRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def put_cv(self,
+                     text_hash: str,
+                     filename: str | None,
+                     text: str,
+                     contacts: Dict[str, Any],
+                     features: Dict[str, Any],
+                     features_version: str,
+                     signature: bytes | None = None,
+                     ) -> UUID:
+        """
+        Сохраняет резюме; если такой текст уже есть - возвращает id существующей записи.
+        """
+        stmt = insert(CvFeatures).values({
+            "text_hash": text_hash,
+            "filename": filename,
+            "text_z": zlib.compress(text.encode("utf-8"), 6),
+            "contacts": contacts,
+            "skills": features["skills"],
+            "experience_years": features["experience_years"],
+            "english_level": features["english_level"],
+            "features_version": features_version,
+            "minhash": signature,
+            "bm25_tf": features.get("bm25_tf"),
+        }).on_conflict_do_nothing(index_elements=[CvFeatures.text_hash]).returning(CvFeatures.id)
+
+        async with self._sessionmaker() as session:
+            result = await session.execute(stmt)
+            cv_id = result.scalar()
+            if cv_id is None:
+                res = await session.execute(select(CvFeatures.id).where(CvFeatures.text_hash == text_hash))
+                cv_id = res.scalar()
+            await session.commit()
+
+        return cv_id
+
+    async def get_cv(self, cv_id: UUID) -> Optional[CandidateDTO]:
+        stmt = select(CvFeatures).where(CvFeatures.id == cv_id).limit(1)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            row = res.scalars().first()
+
+        return _to_dto(row) if row is not None else None
+
+    async def iter_cvs(self, batch_size: int = 500) -> AsyncIterator[List[CandidateDTO]]:
+        """
+        Потоковый проход по всему пулу резюме пачками (серверный курсор).
+        """
+        stmt = select(CvFeatures).order_by(CvFeatures.created_at).execution_options(yield_per=batch_size)
+
+        async with self._sessionmaker() as session:
+            result = await session.stream_scalars(stmt)
+            async for rows in result.partitions(batch_size):
+                yield [_to_dto(r) for r in rows]
+
+    async def iter_signatures(self, batch_size: int = 5000) -> AsyncIterator[List[Tuple[UUID, bytes]]]:
+        """
+        (id, MinHash-подпись) резюме, у которых она есть - без текстов, для индекса почти-дубликатов.
+        """
+        stmt = (select(CvFeatures.id, CvFeatures.minhash).where(CvFeatures.minhash.is_not(None))
+                .execution_options(yield_per=batch_size))
+
+        async with self._sessionmaker() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions(batch_size):
+                yield [(r[0], r[1]) for r in rows]
+
+    async def update_features(self, cv_id: UUID, features: Dict[str, Any], features_version: str) -> None:
+        stmt = update(CvFeatures).where(CvFeatures.id == cv_id).values({
+            "skills": features["skills"],
+            "experience_years": features["experience_years"],
+            "english_level": features["english_level"],
+            "bm25_tf": features.get("bm25_tf"),
+            "features_version": features_version,
+        })
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
@@ -0,0 +1,36 @@
+from persistent.db.tables import Embedding
+from infrastructure.db.connect import pg_connection
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, Iterable, Mapping
+import numpy as np
+
+
+class EmbeddingRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def get_many(self, model: str, text_hashes: Iterable[str]) -> Dict[str, np.ndarray]:
+        hashes = list(text_hashes)
+        if not hashes:
+            return {}
+        stmt = select(Embedding.text_hash, Embedding.vector).where(Embedding.model == model,
+                                                                   Embedding.text_hash.in_(hashes))
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            rows = res.all()
+
+        return {r[0]: np.frombuffer(r[1], dtype=np.float32) for r in rows}
+
+    async def put_many(self, model: str, vectors: Mapping[str, np.ndarray]) -> None:
+        if not vectors:
+            return
+        stmt = insert(Embedding).values([
+            {"model": model, "text_hash": h, "vector": np.asarray(v, dtype=np.float32).tobytes()}
+            for h, v in vectors.items()
+        ]).on_conflict_do_nothing(index_elements=[Embedding.model, Embedding.text_hash])
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
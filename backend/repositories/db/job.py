@@ -0,0 +1,140 @@
+from persistent.db.tables import Job
+from infrastructure.db.connect import pg_connection
+from sqlalchemy import insert, select, update, func, text
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+from schemas.job import JobDTO, ClaimedJob
+
+# каналы LISTEN/NOTIFY
+JOB_NEW_CHANNEL = "job_new"
+JOB_DONE_CHANNEL = "job_done"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_NOTIFY = text("SELECT pg_notify(:channel, :payload)")
+
+
+def _to_dto(row: Job, cls=JobDTO) -> JobDTO:
+    extra = {"cv": row.cv, "vacancy": row.vacancy} if cls is ClaimedJob else {}
+    return cls(id=row.id, kind=row.kind, status=row.status, payload=row.payload or {},
+               result=row.result, error=row.error, attempts=row.attempts,
+               created_at=row.created_at, updated_at=row.updated_at, **extra)
+
+
+class JobRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def create_job(self,
+                         kind: str,
+                         payload: Dict[str, Any],
+                         cv: bytes | None = None,
+                         vacancy: bytes | None = None,
+                         running: bool = False,
+                         ) -> UUID:
+        """
+        running=True - задачу уже выполняет текущий процесс: она сразу в running и не попадает
+        к воркерам, пока не зависнет (тогда requeue_stale вернёт её в очередь).
+        """
+        values = {"kind": kind,
+                  "status": RUNNING if running else QUEUED,
+                  "payload": payload,
+                  "cv": cv,
+                  "vacancy": vacancy,
+                  "attempts": 1 if running else 0,
+                  }
+        if running:
+            values["locked_at"] = func.now()
+        stmt = insert(Job).values(values).returning(Job.id)
+
+        async with self._sessionmaker() as session:
+            result = await session.execute(stmt)
+            job_id = result.scalar()
+            if not running:
+                # уведомление уйдёт только после commit - воркер не увидит незакоммиченную задачу
+                await session.execute(_NOTIFY, {"channel": JOB_NEW_CHANNEL, "payload": str(job_id)})
+            await session.commit()
+
+        return job_id
+
+    async def get_job(self, job_id: UUID) -> Optional[JobDTO]:
+        stmt = select(Job).where(Job.id == job_id).limit(1)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            row = res.scalars().first()
+
+        return _to_dto(row) if row is not None else None
+
+    async def claim_job(self) -> Optional[ClaimedJob]:
+        """
+        Забирает самую старую задачу из очереди. SKIP LOCKED - конкурирующие воркеры
+        не ждут друг друга и никогда не получают одну задачу дважды.
+        """
+        next_id = (
+            select(Job.id)
+            .where(Job.status == QUEUED)
+            .order_by(Job.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        stmt = (
+            update(Job)
+            .where(Job.id == next_id)
+            .values({"status": RUNNING, "attempts": Job.attempts + 1,
+                     "locked_at": func.now(), "updated_at": func.now()})
+            .returning(Job)
+        )
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            row = res.scalars().first()
+            job = _to_dto(row, ClaimedJob) if row is not None else None
+            await session.commit()
+
+        return job
+
+    async def finish_job(self, job_id: UUID, result: Dict[str, Any] | None = None,
+                         error: str | None = None, retry: bool = False) -> None:
+        """
+        Завершает задачу (done / failed) или возвращает её в очередь (retry).
+        Входные файлы завершённой задачи больше не нужны - освобождаем место.
+        """
+        if retry:
+            values = {"status": QUEUED, "error": error, "locked_at": None}
+        else:
+            values = {"status": DONE if error is None else FAILED, "result": result, "error": error,
+                      "locked_at": None, "cv": None, "vacancy": None}
+        values["updated_at"] = func.now()
+        stmt = update(Job).where(Job.id == job_id).values(values)
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            channel = JOB_NEW_CHANNEL if retry else JOB_DONE_CHANNEL
+            await session.execute(_NOTIFY, {"channel": channel, "payload": str(job_id)})
+            await session.commit()
+
+    async def requeue_stale(self, stale_after_sec: float, max_attempts: int) -> int:
+        """
+        Задачи, зависшие в running (воркер упал), возвращаются в очередь или помечаются failed.
+        """
+        deadline = datetime.now(timezone.utc) - timedelta(seconds=stale_after_sec)
+        base = update(Job).where(Job.status == RUNNING, Job.locked_at < deadline)
+        requeue = base.where(Job.attempts < max_attempts).values(
+            {"status": QUEUED, "locked_at": None, "updated_at": func.now()})
+        fail = base.where(Job.attempts >= max_attempts).values(
+            {"status": FAILED, "error": "Превышено число попыток", "locked_at": None,
+             "cv": None, "vacancy": None, "updated_at": func.now()}).returning(Job.id)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(requeue)
+            failed = (await session.execute(fail)).scalars().all()
+            for job_id in failed:
+                await session.execute(_NOTIFY, {"channel": JOB_DONE_CHANNEL, "payload": str(job_id)})
+            if res.rowcount:
+                await session.execute(_NOTIFY, {"channel": JOB_NEW_CHANNEL, "payload": ""})
+            await session.commit()
+
+        return res.rowcount or 0
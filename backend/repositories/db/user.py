@@ -1,7 +1,8 @@
 from persistent.db.tables import User
 from infrastructure.db.connect import pg_connection
-from sqlalchemy import insert, select, update, delete, exists
-from typing import List, Dict, Optional
+from sqlalchemy import insert, select, update, delete, exists, null, func
+from datetime import timedelta
+from typing import Any, List, Dict, Optional
 from schemas.docs import InterviewDTO
 
 
@@ -33,6 +34,75 @@ class UserRepository:
         return user_id
     
     
+    async def put_pending(self, pending: Dict[str, Any]) -> int | None:
+        """
+        Запись без материалов интервью: они генерируются в фоне, pending - ссылки на входы генерации.
+        Генерацию сразу берёт на себя создавший запись процесс (claimed_at).
+        """
+        stmp = insert(User).values({"summary": "",
+                                    "meta": "",
+                                    "hard_topics": [],
+                                    "soft_topics": [],
+                                    "pending": pending,
+                                    "claimed_at": func.now(),
+                                    }).returning(User.id)
+
+        async with self._sessionmaker() as session:
+            result = await session.execute(stmp)
+            await session.commit()
+            user_id = result.scalar()
+
+        return user_id
+
+    async def store_interview(self, user_id: int, dto: InterviewDTO) -> None:
+        stmp = update(User).where(User.id == user_id).values({"summary": dto.summary,
+                                                             "meta": dto.meta,
+                                                             "hard_topics": dto.hard_topics,
+                                                             "soft_topics": dto.soft_topics,
+                                                             "pending": null(),
+                                                             "claimed_at": None,
+                                                             })
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmp)
+            await session.commit()
+
+    async def claim_pending(self, user_id: int, stale_sec: float) -> Optional[Dict[str, Any]]:
+        """
+        Берёт генерацию материалов на себя, если она не занята (или занявший молчит дольше stale_sec):
+        pending - если взяли, None - материалы готовы или их генерирует другой процесс.
+        """
+        stmp = (
+            update(User)
+            .where(User.id == user_id, User.pending.is_not(None),
+                   (User.claimed_at.is_(None)) | (User.claimed_at < func.now() - timedelta(seconds=stale_sec)))
+            .values({"claimed_at": func.now()})
+            .returning(User.pending)
+        )
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmp)
+            pending = res.scalar()
+            await session.commit()
+
+        return pending
+
+    async def release_claim(self, user_id: int) -> None:
+        """Генерация не удалась - её может взять кто угодно, не дожидаясь stale_sec."""
+        stmp = update(User).where(User.id == user_id).values({"claimed_at": None})
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmp)
+            await session.commit()
+
+    async def get_pending(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Входы генерации материалов; None - материалы готовы (или записи нет)."""
+        stmt = select(User.pending).where(User.id == user_id).limit(1)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            return res.scalar()
+
     async def get_data_by_id(self, user_id: int) -> Optional[InterviewDTO]:
         stmt = (
             select(
@@ -0,0 +1,134 @@
+from persistent.db.tables import Vacancy, VacancyText
+from infrastructure.db.connect import pg_connection
+from sqlalchemy import any_, bindparam, case, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+from schemas.vacancy import VacancyDTO
+import zlib
+
+
+class VacancyRepository:
+    def __init__(self):
+        self._sessionmaker = pg_connection()
+
+    async def put_vacancy(self,
+                          title: str,
+                          profile: Dict[str, Any],
+                          text: str,
+                          features: Dict[str, Any],
+                          ) -> UUID:
+        stmt = insert(Vacancy).values({"title": title,
+                                       "profile": profile,
+                                       "text": text,
+                                       "features": features,
+                                       }).returning(Vacancy.id)
+
+        async with self._sessionmaker() as session:
+            result = await session.execute(stmt)
+            await session.commit()
+            vacancy_id = result.scalar()
+
+        return vacancy_id
+
+    async def put_text(self, text_hash: str, text: str) -> None:
+        """Текст вакансии по хешу (один раз на текст, сколько бы кандидатов на него ни ссылалось)."""
+        stmt = insert(VacancyText).values({
+            "text_hash": text_hash,
+            "text_z": zlib.compress(text.encode("utf-8"), 6),
+        }).on_conflict_do_nothing(index_elements=[VacancyText.text_hash])
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def get_text(self, text_hash: str) -> Optional[str]:
+        stmt = select(VacancyText.text_z).where(VacancyText.text_hash == text_hash).limit(1)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            data = res.scalar()
+
+        return zlib.decompress(data).decode("utf-8") if data is not None else None
+
+    async def get_vacancy(self, vacancy_id: UUID) -> Optional[VacancyDTO]:
+        stmt = select(Vacancy).where(Vacancy.id == vacancy_id).limit(1)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            row = res.scalars().first()
+
+        if row is None:
+            return None
+
+        return VacancyDTO(id=row.id, title=row.title, profile=row.profile, text=row.text, features=row.features)
+
+    async def get_vacancies(self, vacancy_ids: List[UUID]) -> List[VacancyDTO]:
+        """Несколько вакансий одним запросом (порядок не гарантирован, отсутствующих нет в ответе)."""
+        if not vacancy_ids:
+            return []
+        ids = bindparam("ids", list(vacancy_ids), type_=ARRAY(PG_UUID(as_uuid=True)))
+        stmt = select(Vacancy).where(Vacancy.id == any_(ids))
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            rows = res.scalars().all()
+
+        return [VacancyDTO(id=r.id, title=r.title, profile=r.profile, text=r.text, features=r.features) for r in rows]
+
+    async def list_vacancies(self, limit: int = 100, offset: int = 0) -> List[VacancyDTO]:
+        stmt = select(Vacancy).order_by(Vacancy.created_at.desc()).limit(limit).offset(offset)
+
+        async with self._sessionmaker() as session:
+            res = await session.execute(stmt)
+            rows = res.scalars().all()
+
+        return [VacancyDTO(id=r.id, title=r.title, profile=r.profile, text=r.text, features=r.features) for r in rows]
+
+    async def update_features(self, vacancy_id: UUID, features: Dict[str, Any]) -> None:
+        stmt = update(Vacancy).where(Vacancy.id == vacancy_id).values(features=features)
+
+        async with self._sessionmaker() as session:
+            await session.execute(stmt)
+            await session.commit()
+
+    async def iter_term_freqs(self, version: int, batch_size: int = 500,
+                              ) -> AsyncIterator[List[Tuple[UUID, str, Optional[Dict[str, int]]]]]:
+        """
+        Потоковый проход по реестру: (id, title, частоты токенов BM25) - всё, что нужно индексу.
+        Частоты, посчитанные другой версией токенизации, отдаются как None - их надо пересчитать.
+        """
+        stale = Vacancy.features["bm25_version"].as_integer().is_distinct_from(version)
+        stmt = (select(Vacancy.id, Vacancy.title, case((stale, None), else_=Vacancy.features["bm25_tf"]))
+                .order_by(Vacancy.created_at).execution_options(yield_per=batch_size))
+
+        async with self._sessionmaker() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions(batch_size):
+                yield [(r[0], r[1], r[2]) for r in rows]
+
+    async def iter_requirements(self, batch_size: int = 500) -> AsyncIterator[List[Tuple[UUID, str, Dict[str, Any]]]]:
+        """
+        Потоковый проход по реестру: (id, title, требования профиля) - для обратного мэтчинга.
+        """
+        stmt = (select(Vacancy.id, Vacancy.title, Vacancy.profile["must_have"], Vacancy.profile["nice_to_have"],
+                       Vacancy.profile["min_years_total"])
+                .order_by(Vacancy.created_at).execution_options(yield_per=batch_size))
+
+        async with self._sessionmaker() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions(batch_size):
+                yield [(r[0], r[1], {"must_have": r[2] or [], "nice_to_have": r[3] or [], "min_years_total": r[4]})
+                       for r in rows]
+
+    async def iter_texts(self, batch_size: int = 500) -> AsyncIterator[List[Tuple[UUID, str, str]]]:
+        """
+        Потоковый проход по реестру: (id, title, описание из профиля) - для семантического индекса.
+        """
+        stmt = (select(Vacancy.id, Vacancy.title, Vacancy.profile["description_md"].astext)
+                .order_by(Vacancy.created_at).execution_options(yield_per=batch_size))
+
+        async with self._sessionmaker() as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions(batch_size):
+                yield [(r[0], r[1], r[2] or "") for r in rows]
@@ -0,0 +1,43 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+from uuid import UUID
+
+# сохранённое резюме с признаками для мэтчера
+class CandidateDTO(BaseModel):
+    id: UUID
+    filename: str | None = None
+    text: str
+    contacts: Dict[str, Any] = {}
+    skills: List[str] = []
+    experience_years: float | None = None
+    english_level: str | None = None
+    bm25_tf: Dict[str, int] | None = None
+    features_version: str
+
+class CandidateResponse(BaseModel):
+    candidate_id: UUID
+    filename: str | None = None
+    skills: List[str] = []
+    experience_years: float | None = None
+    english_level: str | None = None
+
+# результат повторного мэтчинга сохранённого кандидата с вакансией
+class RescreenItem(BaseModel):
+    candidate_id: UUID
+    filename: str | None = None
+    decision: str
+    score: float
+    reasons: List[str] = []
+    details: Dict[str, Any] = {}
+
+class RescreenResponse(BaseModel):
+    vacancy_id: UUID
+    total: int
+    counts: Dict[str, int] = {}
+    items: List[RescreenItem] = []
+
+# кандидат в выдаче семантического поиска по пулу
+class CandidateRankItem(BaseModel):
+    candidate_id: UUID
+    filename: str | None = None
+    score: float
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Any, Dict, List
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
 
 # спаршенный документ в md и json(sections)
 # detected_meta - email и телефон
@@ -7,6 +8,20 @@ class ParsedDoc(BaseModel):
     text: str
     contacts: Dict[str, Any] | None = None
     
+# один загруженный документ, распарсенный один раз за запрос:
+# текст, пары из таблиц, контакты (для резюме) и профиль (для вакансии).
+# features - предрасчитанные признаки для мэтчера (у вакансий из реестра).
+# raw держим до тех пор, пока текст не извлечён (text=None - ещё не извлекали)
+# signature - MinHash-подпись текста резюме (matching/minhash.py) для поиска почти-дубликатов
+class ParsedDocument(BaseModel):
+    text: str | None = None
+    tables: List[Tuple[str, str]] = []
+    contacts: Dict[str, Any] | None = None
+    profile: Dict[str, Any] | None = None
+    features: Dict[str, Any] | None = None
+    raw: bytes | None = Field(default=None, exclude=True, repr=False)
+    signature: bytes | None = Field(default=None, exclude=True, repr=False)
+    
 class ParsedText(BaseModel):
     cv_text: str | None = None
     vac_text: str | None = None
@@ -21,15 +36,27 @@ class CompareResponse(BaseModel):
     vacancy: Dict[str, Any]
     text: ParsedText | None = None
     
+# provisional - бюджет времени истёк до ответа LLM: решение мэтчера, полный результат
+# (вердикт LLM и ссылка) дорабатывается в фоне и доступен по GET /jobs/{job_id}
+# reused_from - вердикт LLM взят у почти-дубликата резюме (id в cv_features), а не посчитан заново
 class ParsingAndLLMResponse(BaseModel):
     decision: str | None = None
     score: int | None = None
     reasons: str | None = None
     details: Dict[str, Any] | None = None
     link: str | None = None
+    provisional: bool = False
+    job_id: UUID | None = None
+    reused_from: UUID | None = None
     
 class InterviewDTO(BaseModel):
     summary: str
     meta: str
     hard_topics: List[Dict[str, str]]
     soft_topics: List[Dict[str, str]]
+
+# закэшированный результат анализа пары резюме/вакансия
+class CachedAnalysis(BaseModel):
+    response: ParsingAndLLMResponse
+    # материалы интервью - вторым вызовом LLM, только для допущенных; None - ещё не генерировались
+    interview: InterviewDTO | None = None
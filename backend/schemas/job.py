@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Any, Dict
+from datetime import datetime
+from uuid import UUID
+
+# задача очереди (без входных файлов)
+class JobDTO(BaseModel):
+    id: UUID
+    kind: str
+    status: str
+    payload: Dict[str, Any] = {}
+    result: Dict[str, Any] | None = None
+    error: str | None = None
+    attempts: int = 0
+    created_at: datetime | None = None
+    updated_at: datetime | None = None
+
+# задача вместе с входными файлами - то, что получает воркер
+class ClaimedJob(JobDTO):
+    cv: bytes | None = None
+    vacancy: bytes | None = None
+
+class JobResponse(BaseModel):
+    job_id: UUID
+    kind: str
+    status: str
+    result: Dict[str, Any] | None = None
+    error: str | None = None
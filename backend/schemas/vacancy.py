@@ -0,0 +1,32 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List
+from uuid import UUID
+
+# вакансия из реестра
+class VacancyDTO(BaseModel):
+    id: UUID
+    title: str
+    profile: Dict[str, Any]
+    text: str
+    features: Dict[str, Any]
+
+# ответ API реестра (без текста и признаков)
+class VacancyResponse(BaseModel):
+    vacancy_id: UUID
+    title: str
+    profile: Dict[str, Any]
+
+# вакансия в выдаче BM25 по корпусу реестра
+class VacancyRankItem(BaseModel):
+    vacancy_id: UUID
+    title: str
+    score: float
+
+# вакансия, предложенная кандидату обратным мэтчингом (полный decide по короткому списку)
+class VacancySuggestion(BaseModel):
+    vacancy_id: UUID
+    title: str
+    decision: str
+    score: float
+    reasons: List[str] = []
+    details: Dict[str, Any] = {}
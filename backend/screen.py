@@ -0,0 +1,204 @@
+from repositories.db.repository import Repository
+from repositories.db.vacancy import VacancyRepository
+from repositories.db.compare_cache import CompareCacheRepository
+from repositories.db.bulk_result import BulkResultRepository
+from repositories.db.cv_features import CvFeaturesRepository
+from services.parsing_service import ParsingService
+from services.vacancy_service import VacancyService
+from services.compare_cache import CompareCacheService
+from services.analysis_service import AnalysisService
+from services.near_duplicate_service import NearDuplicateService
+from services.taxonomy_service import TaxonomyService
+from services.bulk_screening_service import BulkScreeningService, RESULT_FIELDS
+from infrastructure.executor.pool import CpuExecutor
+from schemas.docs import ParsedDocument
+from settings.settings import settings
+from typing import Any, Dict, Iterator, List, Set, Tuple
+from uuid import UUID
+import argparse
+import asyncio
+import csv
+import hashlib
+import httpx
+import json
+import logging
+import os
+import sys
+import time
+
+
+def iter_docx_files(root: str) -> Iterator[Tuple[str, str]]:
+    """(путь относительно root, полный путь) всех .docx под root в стабильном порядке."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            if name.lower().endswith(".docx") and not name.startswith("~$"):
+                path = os.path.join(dirpath, name)
+                yield os.path.relpath(path, root), path
+
+
+class Checkpoint:
+    """
+    Контрольная точка: файл с ключами уже обработанных резюме, по строке. Ключ дописывается
+    после записи результатов, так что при обрыве резюме может обработаться повторно, но не потеряться.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        self._f = open(path, "a", encoding="utf-8")
+
+    def mark(self, key: str) -> None:
+        self._f.write(key + "\n")
+        self._f.flush()
+        self.done.add(key)
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class JsonlSink:
+    def __init__(self, path: str):
+        self._f = open(path, "a", encoding="utf-8")
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._f.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+        self._f.flush()
+
+    async def close(self) -> None:
+        self._f.close()
+
+
+class CsvSink:
+    def __init__(self, path: str):
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, "a", encoding="utf-8", newline="")
+        self._w = csv.DictWriter(self._f, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+        if new:
+            self._w.writeheader()
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._w.writerow({k: "; ".join(map(str, v)) if isinstance(v, list) else v for k, v in row.items()})
+        self._f.flush()
+
+    async def close(self) -> None:
+        self._f.close()
+
+
+class PgSink:
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.repository = BulkResultRepository()
+
+    async def write(self, rows: List[Dict[str, Any]]) -> None:
+        await self.repository.put_many(self.run_id, json.loads(json.dumps(rows, default=str)))
+
+    async def close(self) -> None:
+        return None
+
+
+def _make_sink(out: str, run_id: str):
+    if out == "pg":
+        return PgSink(run_id)
+    if out.endswith(".csv"):
+        return CsvSink(out)
+    if out.endswith(".jsonl"):
+        return JsonlSink(out)
+    raise SystemExit("--out: ожидается файл .csv / .jsonl или pg")
+
+
+class Progress:
+    def __init__(self, total: int, skipped: int, every_sec: float):
+        self.total, self.skipped, self.every_sec = total, skipped, every_sec
+        self.done = self.errors = 0
+        self.started = self._last = time.monotonic()
+
+    def update(self, rows: List[Dict[str, Any]], final: bool = False) -> None:
+        if rows:
+            self.done += 1
+            self.errors += any(r.get("error") for r in rows)
+        now = time.monotonic()
+        if not final and now - self._last < self.every_sec:
+            return
+        self._last = now
+        rate = self.done / max(now - self.started, 1e-9)
+        left = self.total - self.skipped - self.done
+        eta = f"{left / rate:.0f}s" if rate > 0 else "?"
+        print(f"{self.skipped + self.done}/{self.total} files (skipped {self.skipped}, errors {self.errors}) "
+              f"{rate:.1f} files/s, eta {eta}", file=sys.stderr, flush=True)
+
+
+async def _load_vacancies(service: BulkScreeningService, paths: List[str],
+                          ids: List[str]) -> List[Tuple[str, ParsedDocument]]:
+    vacancies = [(os.path.basename(p), await service.load_vacancy(p)) for p in paths]
+    if ids:
+        registry = VacancyService(service.parsing, VacancyRepository())
+        vacancies += [(vacancy_id, await registry.get_document(UUID(vacancy_id))) for vacancy_id in ids]
+    return vacancies
+
+
+async def run(args: argparse.Namespace) -> None:
+    taxonomy_service = TaxonomyService(settings.taxonomy.path, settings.taxonomy.compiled_path)
+    taxonomy_service.prepare()
+    executor = CpuExecutor(args.processes, settings.executor.start_method, settings.executor.max_tasks_per_child,
+                           initializers=taxonomy_service.initializers())
+    await executor.start()
+    analysis = None
+    if args.llm:
+        near_duplicates = NearDuplicateService(CvFeaturesRepository(), settings.near_duplicates.threshold,
+                                               settings.near_duplicates.bands) if settings.near_duplicates.enabled else None
+        analysis = AnalysisService(CompareCacheService(CompareCacheRepository()), near_duplicates)
+    service = BulkScreeningService(ParsingService(Repository(), executor), analysis, args.llm_concurrency)
+
+    vacancies = await _load_vacancies(service, args.vacancy, args.vacancy_id)
+    # один и тот же прогон (каталог + вакансии) по умолчанию получает тот же run_id - для возобновления
+    run_id = args.run_id or "bulk-" + hashlib.sha256(
+        "\x00".join([os.path.abspath(args.cvs)] + [label for label, _ in vacancies]).encode("utf-8")).hexdigest()[:12]
+    checkpoint = Checkpoint(args.checkpoint or (f"{run_id}.checkpoint" if args.out == "pg" else f"{args.out}.checkpoint"))
+    sink = _make_sink(args.out, run_id)
+
+    total = sum(1 for _ in iter_docx_files(args.cvs))
+    todo = ((key, path) for key, path in iter_docx_files(args.cvs) if key not in checkpoint.done)
+    progress = Progress(total, len(checkpoint.done), args.progress_sec)
+    print(f"run {run_id}: {total} files, {len(checkpoint.done)} already done, {len(vacancies)} vacancies",
+          file=sys.stderr, flush=True)
+
+    try:
+        async with httpx.AsyncClient(timeout=settings.analyzer.timeout_sec) as client:
+            async for key, rows in service.run(todo, vacancies, client):
+                await sink.write(rows)
+                checkpoint.mark(key)
+                progress.update(rows)
+    finally:
+        progress.update([], final=True)
+        await sink.close()
+        checkpoint.close()
+        executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Оффлайн-скрининг каталога резюме (.docx) против вакансий")
+    parser.add_argument("cvs", help="каталог с резюме (.docx, рекурсивно)")
+    parser.add_argument("--vacancy", action="append", default=[], help="файл вакансии .docx (можно несколько)")
+    parser.add_argument("--vacancy-id", action="append", default=[], help="id вакансии из реестра (нужен Postgres)")
+    parser.add_argument("--out", required=True, help="results.csv / results.jsonl / pg (таблица bulk_result)")
+    parser.add_argument("--checkpoint", default="", help="файл контрольной точки (по умолчанию <out>.checkpoint)")
+    parser.add_argument("--run-id", default="", help="id прогона для pg (по умолчанию - хеш каталога и вакансий)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--llm", action="store_true", help="LLM-анализ для не-reject пар")
+    parser.add_argument("--llm-concurrency", type=int, default=settings.batch.llm_concurrency)
+    parser.add_argument("--progress-sec", type=float, default=5.0)
+    args = parser.parse_args()
+    if not args.vacancy and not args.vacancy_id:
+        parser.error("нужна хотя бы одна --vacancy или --vacancy-id")
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+from services.compare_cache import CompareCacheService, compare_key
+from services.near_duplicate_service import NearDuplicateService
+from llm_compare.llm_module import LLMAnalyzer, FieldCallback
+from schemas.docs import CachedAnalysis, InterviewDTO, ParsedDocument, ParsingAndLLMResponse
+from settings.settings import settings
+from fastapi import HTTPException
+from typing import Dict
+import asyncio
+import httpx
+
+
+def accepted(response: ParsingAndLLMResponse) -> bool:
+    """Допущен ли кандидат по вердикту LLM ("True"/"False" в ответе модели)."""
+    return str(response.decision).strip().lower() == "true"
+
+
+class AnalysisService:
+    """
+    LLM-анализ пары резюме/вакансия через кэш результатов. С near_duplicates промах кэша
+    сначала ищет почти-дубликат резюме, уже проанализированный с этой же вакансией.
+    Анализ - только вердикт; материалы интервью - отдельно (interview), дописываются в ту же запись кэша.
+    """
+
+    def __init__(self, cache: CompareCacheService, near_duplicates: NearDuplicateService | None = None):
+        self.cache = cache
+        self.near_duplicates = near_duplicates
+        # генерации материалов интервью в процессе: одинаковые пары ждут одну
+        self._interviews: Dict[str, asyncio.Task] = {}
+
+    async def analyze(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                      client: httpx.AsyncClient | None = None, force: bool = False,
+                      on_field: FieldCallback | None = None) -> CachedAnalysis:
+        """
+        force - посчитать заново: без кэша и без вердиктов почти-дубликатов (результат перезаписывает кэш).
+        on_field - поля ответа LLM по мере генерации; вызывается, только если LLM запускает
+        этот вызов (при попадании в кэш или ожидании чужого вычисления сразу готов результат).
+        """
+        key = compare_key(cv.text, vacancy.text, settings.analyzer.model)
+        compute = lambda: self._run_llm(cv, vacancy, client, on_field)
+        if force:
+            value = await self.cache.refresh(key, compute)
+        elif self.near_duplicates is None:
+            return await self.cache.get_or_compute(key, compute)
+        else:
+            value = await self.cache.peek(key) or await self._reuse(cv, vacancy, key)
+            if value is None:
+                value = await self.cache.get_or_compute(key, compute)
+
+        if self.near_duplicates is not None:
+            await self.near_duplicates.remember(cv)
+        return value
+
+    async def _reuse(self, cv: ParsedDocument, vacancy: ParsedDocument, key: str) -> CachedAnalysis | None:
+        dup = await self.near_duplicates.find(cv)
+        if dup is None:
+            return None
+        dup_id, dup_text, _ = dup
+        prev = await self.cache.peek(compare_key(dup_text, vacancy.text, settings.analyzer.model))
+        if prev is None:
+            return None
+        value = prev.model_copy(update={"response": prev.response.model_copy(update={"reused_from": dup_id})})
+        await self.cache.put(key, value)
+        return value
+
+    async def interview(self, cv: ParsedDocument, vacancy: ParsedDocument, analysis: CachedAnalysis,
+                        client: httpx.AsyncClient | None = None) -> InterviewDTO:
+        """
+        Материалы интервью для уже проанализированной пары: из кэша или вторым вызовом LLM
+        (результат дописывается в запись кэша вердикта).
+        """
+        if analysis.interview is not None:
+            return analysis.interview
+        key = compare_key(cv.text, vacancy.text, settings.analyzer.model)
+        task = self._interviews.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_interview(key, cv, vacancy, analysis, client))
+            self._interviews[key] = task
+            task.add_done_callback(lambda t: self._interviews.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _run_interview(self, key: str, cv: ParsedDocument, vacancy: ParsedDocument,
+                             analysis: CachedAnalysis, client: httpx.AsyncClient | None) -> InterviewDTO:
+        analyzer = LLMAnalyzer()
+        analyzer.set_documents(cv, vacancy)
+        analyzer.match_percentage = analysis.response.score
+        analyzer.candidate_feedback = analysis.response.reasons
+        if not await analyzer.prepare_interview(client, timeout=settings.analyzer.timeout_sec):
+            raise HTTPException(status_code=502, detail="LLM не смогло вернуть валидный JSON")
+
+        dto = InterviewDTO(
+            summary=analyzer.compressed_data or "",
+            meta=analyzer.vacancy_meta or "",
+            hard_topics=analyzer.hard_interview_topics,
+            soft_topics=analyzer.soft_interview_topics,
+        )
+        # вердикт в кэше мог обновиться (force) - дописываем материалы к актуальному
+        current = await self.cache.peek(key) or analysis
+        await self.cache.put(key, current.model_copy(update={"interview": dto}))
+        return dto
+
+    async def _run_llm(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                       client: httpx.AsyncClient | None, on_field: FieldCallback | None = None) -> CachedAnalysis:
+        analyzer = LLMAnalyzer()
+        analyzer.set_documents(cv, vacancy)
+        # LLM не ограничиваем бюджетом конкретного запроса: результат общий (кэш) и после
+        # истечения бюджета /compare дорабатывается в фоне - только таймаут провайдера
+        ok = await analyzer.analyze(client, timeout=settings.analyzer.timeout_sec, on_field=on_field)
+        if not ok:
+            raise HTTPException(status_code=502, detail="LLM не смогло вернуть валидный JSON")
+
+        # материалы интервью - позже и только для допущенных (interview)
+        return CachedAnalysis(
+            response=ParsingAndLLMResponse(
+                decision=analyzer.decision,
+                score=analyzer.match_percentage,
+                reasons=analyzer.candidate_feedback,
+            ),
+        )
@@ -0,0 +1,121 @@
+from services.parsing_service import ParsingService
+from services.match_service import MatchService
+from services.analysis_service import AnalysisService
+from schemas.docs import ParsedDocument
+from services import cpu_tasks
+from utils.docx_extract import DocxLimitError, MAX_DOCX_BYTES
+from fastapi import HTTPException
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Sequence, Tuple
+import asyncio
+import httpx
+import logging
+import os
+
+# поля строки результата (порядок колонок CSV)
+RESULT_FIELDS = (
+    "file", "vacancy", "decision", "score", "reasons", "skills", "experience_years", "english_level",
+    "email", "phone", "llm_decision", "llm_score", "llm_reasons", "llm_error", "error",
+)
+
+
+def _read(path: str) -> bytes:
+    if os.path.getsize(path) > MAX_DOCX_BYTES:
+        raise DocxLimitError(f"файл больше {MAX_DOCX_BYTES // (1024 * 1024)} МБ")
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class BulkScreeningService:
+    """
+    Оффлайн-скрининг каталогов резюме без HTTP (см. screen.py): файлы читаются по мере
+    обработки, разбор и decide по всем вакансиям - один вызов в пуле процессов на резюме,
+    LLM (если передан analysis) - только для не-reject пар и не больше llm_concurrency сразу.
+    В работе держится ограниченное окно резюме, поэтому память не растёт с размером каталога.
+    """
+
+    def __init__(self, parsing: ParsingService, analysis: Optional[AnalysisService] = None,
+                 llm_concurrency: int = 4, window: int | None = None):
+        self.parsing = parsing
+        self.analysis = analysis
+        self.llm_slots = asyncio.Semaphore(max(1, llm_concurrency))
+        # в работе: загрузка процессов пула с запасом плюс ожидающие LLM
+        self.window = window or 2 * max(1, parsing.executor.processes) + (llm_concurrency if analysis else 0)
+        self.logger = logging.getLogger(__name__)
+
+    async def load_vacancy(self, path: str) -> ParsedDocument:
+        data = await asyncio.to_thread(_read, path)
+        return await self.parsing.parse_vacancy(data)
+
+    async def _llm(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                   client: httpx.AsyncClient | None) -> Dict[str, Any]:
+        try:
+            async with self.llm_slots:
+                analysis = await self.analysis.analyze(cv, vacancy, client)
+        except HTTPException as e:
+            return {"llm_error": str(e.detail)}
+        except Exception as e:
+            self.logger.exception("LLM analysis failed")
+            return {"llm_error": str(e)}
+        r = analysis.response
+        return {"llm_decision": r.decision, "llm_score": r.score, "llm_reasons": r.reasons}
+
+    async def screen_file(self, key: str, path: str, vacancies: Sequence[Tuple[str, ParsedDocument]],
+                          client: httpx.AsyncClient | None = None) -> List[Dict[str, Any]]:
+        """Строки результата одного резюме - по одной на вакансию (при ошибке разбора - с error)."""
+        try:
+            data = await asyncio.to_thread(_read, path)
+            if not data:
+                raise ValueError("файл пустой")
+            vacs = [MatchService.vacancy_input(doc) for _, doc in vacancies]
+            parsed = await self.parsing.executor.run("bulk_screen", cpu_tasks.screen_cv, data, vacs)
+        except Exception as e:
+            # битый DOCX - не повод останавливать прогон на тысячи файлов
+            error = f"{type(e).__name__}: {e}"
+            return [{"file": key, "vacancy": label, "error": error} for label, _ in vacancies]
+
+        features, contacts = parsed["features"], parsed["contacts"] or {}
+        base = {
+            "file": key,
+            "skills": features.get("skills") or [],
+            "experience_years": features.get("experience_years"),
+            "english_level": features.get("english_level"),
+            "email": contacts.get("email") or None,
+            "phone": contacts.get("phone") or None,
+        }
+        rows = [{**base, "vacancy": label, "decision": d["decision"], "score": d["score"],
+                 "reasons": d["reasons"], "details": d.get("details")}
+                for (label, _), d in zip(vacancies, parsed["decisions"])]
+
+        if self.analysis is not None:
+            cv = ParsedDocument(text=parsed["text"], contacts=contacts, features=features,
+                                signature=parsed.get("signature"))
+            todo = [(row, doc) for row, (_, doc) in zip(rows, vacancies) if row["decision"] != "reject"]
+            results = await asyncio.gather(*[self._llm(cv, doc, client) for _, doc in todo])
+            for (row, _), llm in zip(todo, results):
+                row.update(llm)
+        return rows
+
+    async def run(self, files: Iterable[Tuple[str, str]], vacancies: Sequence[Tuple[str, ParsedDocument]],
+                  client: httpx.AsyncClient | None = None) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        (ключ файла, строки) по мере готовности - не в порядке files. Новые файлы берутся
+        в работу, только когда в окне освобождается место.
+        """
+        pending: Dict[asyncio.Task, str] = {}
+        it = iter(files)
+        try:
+            while True:
+                while len(pending) < self.window:
+                    nxt = next(it, None)
+                    if nxt is None:
+                        break
+                    key, path = nxt
+                    pending[asyncio.create_task(self.screen_file(key, path, vacancies, client))] = key
+                if not pending:
+                    return
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task.result()
+        finally:
+            for task in pending:
+                task.cancel()
@@ -0,0 +1,95 @@
+from repositories.db.cv_features import CvFeaturesRepository
+from services.parsing_service import ParsingService
+from services.match_service import MatchService
+from services.vacancy_service import VacancyService
+from services.compare_cache import content_hash
+from services.near_duplicate_service import NearDuplicateService
+from schemas.candidate import CandidateDTO, RescreenItem, RescreenResponse
+from matching.features import cv_features, features_version
+from services import cpu_tasks
+from fastapi import HTTPException, status
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+import heapq
+
+
+class CandidateService:
+    """
+    Хранилище признаков резюме: текст и признаки считаются один раз при загрузке,
+    повторный мэтчинг пула с новой вакансией - проход по БД и арифметика, без DOCX.
+    """
+
+    def __init__(self, parsing: ParsingService, vacancies: VacancyService, repository: CvFeaturesRepository,
+                 near_duplicates: NearDuplicateService | None = None):
+        self.parsing = parsing
+        self.vacancies = vacancies
+        self.repository = repository
+        self.near_duplicates = near_duplicates
+
+    async def register(self, data: bytes, filename: str | None = None) -> CandidateDTO:
+        doc = await self.parsing.parse_cv(data)
+        text = doc.text or ""
+        features = doc.features or cv_features(text)
+        version = features_version()
+        cv_id = await self.repository.put_cv(
+            text_hash=content_hash(text),
+            filename=filename,
+            text=text,
+            contacts=doc.contacts or {},
+            features=features,
+            features_version=version,
+            signature=doc.signature,
+        )
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(cv_id, doc.signature)
+        return CandidateDTO(id=cv_id, filename=filename, text=text, contacts=doc.contacts or {},
+                            features_version=version, **features)
+
+    async def get(self, cv_id: UUID) -> CandidateDTO:
+        dto = await self.repository.get_cv(cv_id)
+        if dto is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Кандидат не найден")
+        return dto
+
+    @staticmethod
+    def cv_input(dto: CandidateDTO) -> Dict[str, Any]:
+        cv = {
+            "text": dto.text,
+            "detected_meta": dto.contacts,
+            "skills": dto.skills,
+            "experience_years": dto.experience_years,
+            "english_level": dto.english_level,
+        }
+        if dto.bm25_tf is not None:
+            cv["bm25_tf"] = dto.bm25_tf
+        return cv
+
+    async def rescreen(self, vacancy_id: UUID, limit: int = 100) -> RescreenResponse:
+        vac = MatchService.vacancy_input(await self.vacancies.get_document(vacancy_id))
+
+        total = 0
+        counts: Dict[str, int] = {}
+        top: List[Tuple[float, int, RescreenItem]] = []
+        version = features_version()
+        async for batch in self.repository.iter_cvs():
+            # признаки старой версии (извлекателей, таксономии) пересчитает тот же вызов в пуле
+            stale = [i for i, dto in enumerate(batch) if dto.features_version != version]
+            # скоринг пачки - CPU, уводим с event loop в пул процессов: туда уходят только входы decide
+            out = await self.parsing.executor.run("rescreen", cpu_tasks.rescreen, vac,
+                                                  [self.cv_input(dto) for dto in batch], stale)
+            for i, features in out["features"].items():
+                await self.repository.update_features(batch[i].id, features, version)
+            items = [RescreenItem(candidate_id=dto.id, filename=dto.filename, decision=d["decision"],
+                                  score=d["score"], reasons=d["reasons"], details=d["details"])
+                     for dto, d in zip(batch, out["results"])]
+            for item in items:
+                counts[item.decision] = counts.get(item.decision, 0) + 1
+                entry = (item.score, total, item)
+                total += 1
+                if len(top) < limit:
+                    heapq.heappush(top, entry)
+                elif limit > 0 and entry[0] > top[0][0]:
+                    heapq.heapreplace(top, entry)
+
+        items = [e[2] for e in sorted(top, key=lambda e: (-e[0], e[1]))]
+        return RescreenResponse(vacancy_id=vacancy_id, total=total, counts=counts, items=items)
@@ -0,0 +1,128 @@
+from repositories.db.compare_cache import CompareCacheRepository
+from schemas.docs import CachedAnalysis
+from settings.settings import settings
+from utils.ttl_cache import TTLCache
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import hashlib
+import logging
+import re
+
+_WS_RX = re.compile(r"\s+")
+
+
+def normalize_text(text: str | None) -> str:
+    """Нормализация перед хешированием: регистр и пробельные символы не влияют на ключ."""
+    return _WS_RX.sub(" ", (text or "").lower()).strip()
+
+
+def content_hash(text: str | None) -> str:
+    """Хеш нормализованного текста - ключ резюме в cv_features (одинаковые тексты - одна запись)."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def compare_key(cv_text: str | None, vac_text: str | None, model: str = "") -> str:
+    """Content-addressed ключ пары резюме/вакансия (модель LLM тоже входит в ключ)."""
+    h = hashlib.sha256()
+    for part in (model, normalize_text(vac_text), normalize_text(cv_text)):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class CompareCacheService:
+    """
+    Двухуровневый кэш результатов анализа: LRU с TTL в памяти процесса и таблица compare_cache
+    в Postgres, общая для всех воркеров. Одинаковые одновременные запросы ждут одно вычисление.
+    """
+
+    def __init__(self, repository: Optional[CompareCacheRepository] = None):
+        self.memory: TTLCache[str, CachedAnalysis] = TTLCache(settings.cache.memory_size, settings.cache.ttl_sec)
+        self.repository = repository if settings.cache.pg_enabled else None
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.counters: Dict[str, int] = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "errors": 0,
+        }
+        self.logger = logging.getLogger(__name__)
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[CachedAnalysis]]) -> CachedAnalysis:
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return value
+
+        task = self._inflight.get(key)
+        if task is None:
+            # вычисление живёт отдельно от запроса: отключение клиента не отменяет его для остальных
+            task = asyncio.create_task(self._load(key, compute))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.counters["coalesced"] += 1
+
+        return await asyncio.shield(task)
+
+    async def peek(self, key: str) -> Optional[CachedAnalysis]:
+        """Готовый результат из памяти или БД - без вычисления."""
+        value = self.memory.get(key)
+        if value is not None:
+            self.counters["memory_hits"] += 1
+            return value
+        value = await self._db_get(key)
+        if value is not None:
+            self.counters["db_hits"] += 1
+            self.memory.set(key, value)
+        return value
+
+    async def put(self, key: str, value: CachedAnalysis) -> None:
+        self.memory.set(key, value)
+        await self._db_put(key, value)
+
+    async def refresh(self, key: str, compute: Callable[[], Awaitable[CachedAnalysis]]) -> CachedAnalysis:
+        """Вычисляет заново, не глядя в кэш, и перезаписывает результат."""
+        self.counters["misses"] += 1
+        value = await compute()
+        await self.put(key, value)
+        return value
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            self.counters["errors"] += 1
+
+    async def _load(self, key: str, compute: Callable[[], Awaitable[CachedAnalysis]]) -> CachedAnalysis:
+        value = await self._db_get(key)
+        if value is not None:
+            self.counters["db_hits"] += 1
+        else:
+            self.counters["misses"] += 1
+            value = await compute()
+            await self._db_put(key, value)
+
+        self.memory.set(key, value)
+        return value
+
+    async def _db_get(self, key: str) -> Optional[CachedAnalysis]:
+        if self.repository is None:
+            return None
+        try:
+            return await self.repository.get(key)
+        except Exception:
+            # недоступная БД не должна ломать /compare - работаем как при промахе
+            self.logger.exception("compare cache: db read failed")
+            return None
+
+    async def _db_put(self, key: str, value: CachedAnalysis) -> None:
+        if self.repository is None:
+            return
+        try:
+            await self.repository.put(key, value, settings.cache.ttl_sec)
+        except Exception:
+            self.logger.exception("compare cache: db write failed")
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.counters, "memory_size": len(self.memory), "inflight": len(self._inflight)}
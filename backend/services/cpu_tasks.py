@@ -0,0 +1,79 @@
+from utils.docx_extract import extract_docx
+from utils.vacancy_extract import table_rows_to_pairs, vacancy_profile_from_pairs
+from utils.contacts_extract import extract_contacts
+from matching.features import cv_features
+from matching.matcher import decide, decide_many
+from matching.analysis import AnalyzedText
+from matching.embeddings import get_embedder
+from matching import minhash
+from typing import Any, Dict, List
+import numpy as np
+
+# CPU-этапы для CpuExecutor. Функции выполняются в дочерних процессах, поэтому модуль
+# не тянет ни БД, ни настроек, а на вход/выход идут только байты и простые dict:
+# DOCX передаётся один раз сырыми байтами, обратно - текст и готовые признаки.
+
+
+def parse_cv(data: bytes) -> Dict[str, Any]:
+    """
+    Резюме за один вызов: текст, контакты, признаки для мэтчера и MinHash-подпись (поиск почти-дубликатов).
+    """
+    text = extract_docx(data).text
+    sig = minhash.signature(text)
+    return {"text": text, "contacts": extract_contacts(text), "features": cv_features(text),
+            "signature": minhash.to_bytes(sig) if sig is not None else None}
+
+
+def parse_vacancy(data: bytes) -> Dict[str, Any]:
+    """
+    Вакансия за один проход: текст (для LLM), пары из таблиц и профиль (для мэтчера).
+    """
+    content = extract_docx(data)
+    pairs = table_rows_to_pairs(content.rows)
+    return {"text": content.text, "tables": pairs, "profile": vacancy_profile_from_pairs(pairs)}
+
+
+def docx_text(data: bytes) -> str:
+    return extract_docx(data).text
+
+
+def match(vac: Dict[str, Any], cv: Dict[str, Any]) -> Dict[str, Any]:
+    return decide(vac, cv)
+
+
+def match_vacancies(vacs: List[Dict[str, Any]], cv: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Одно резюме против нескольких вакансий: разбор резюме (AnalyzedText) общий для всех.
+    """
+    cv = dict(cv)
+    cv.setdefault("analysis", AnalyzedText(cv.get("text") or ""))
+    return [decide(vac, cv) for vac in vacs]
+
+
+def rescreen(vac: Dict[str, Any], cvs: List[Dict[str, Any]], stale: List[int]) -> Dict[str, Any]:
+    """
+    Пачка сохранённых резюме против вакансии (decide_many). cvs - входы decide с признаками
+    из cv_features; у резюме с индексами из stale признаки старой версии - они пересчитываются
+    из текста здесь и возвращаются для записи в БД: {"results": [...], "features": {i: признаки}}.
+    """
+    features = {i: cv_features(cvs[i]["text"]) for i in stale}
+    cvs = [{**cv, **features[i]} if i in features else cv for i, cv in enumerate(cvs)]
+    return {"results": decide_many(vac, cvs), "features": features}
+
+
+def screen_cv(data: bytes, vacs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Резюме против нескольких вакансий за один вызов (оффлайн-скрининг): разбор как в parse_cv,
+    decide по каждой вакансии с общим AnalyzedText. Обратно - разбор и решения, без DOCX.
+    """
+    parsed = parse_cv(data)
+    cv = {**parsed["features"], "text": parsed["text"], "detected_meta": parsed["contacts"],
+          "analysis": AnalyzedText(parsed["text"])}
+    return {**parsed, "decisions": [decide(vac, cv) for vac in vacs]}
+
+
+def embed(config: Dict[str, Any], texts: List[str]) -> np.ndarray:
+    """
+    Эмбеддинги текстов бэкендом из config (см. embeddings.get_embedder) - модель грузится в процессе один раз.
+    """
+    return get_embedder(**config).embed(texts)
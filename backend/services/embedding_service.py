@@ -0,0 +1,174 @@
+from repositories.db.embedding import EmbeddingRepository
+from repositories.db.vacancy import VacancyRepository
+from repositories.db.cv_features import CvFeaturesRepository
+from infrastructure.executor.pool import CpuExecutor
+from schemas.vacancy import VacancyRankItem
+from schemas.candidate import CandidateRankItem
+from settings.settings import settings
+from services import cpu_tasks
+from matching.embeddings import embedder_name, text_hash
+from matching.matcher import vacancy_text
+from matching.score import semantic_score_vectors
+from matching.ann import make_index
+from utils.ttl_cache import TTLCache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+import numpy as np
+
+# индексы перечитываются из БД не реже этого, как индексы VacancyService
+_INDEX_TTL_SEC = 300.0
+# сколько текстов уходит в пул процессов за раз
+_EMBED_BATCH = 64
+
+
+class EmbeddingService:
+    """
+    Семантическая близость резюме и вакансий: эмбеддинги считаются бэкендом из настроек
+    (hashing / onnx) в пуле процессов и кэшируются по хешу текста - в памяти и в таблице embedding.
+    Векторы вакансий реестра и резюме пула лежат в индексах ближайших (flat / hnsw),
+    поэтому короткий список по смыслу - один поиск, без LLM на каждую пару.
+    """
+
+    def __init__(self,
+                 executor: CpuExecutor,
+                 repository: Optional[EmbeddingRepository],
+                 vacancies: VacancyRepository,
+                 candidates: CvFeaturesRepository):
+        cfg = settings.embeddings
+        self.executor = executor
+        self.repository = repository
+        self.vacancies = vacancies
+        self.candidates = candidates
+        self.config: Dict[str, Any] = {"backend": cfg.backend, "dim": cfg.dim, "model_path": cfg.onnx_path,
+                                       "tokenizer_path": cfg.tokenizer_path, "max_length": cfg.max_length,
+                                       "prefix": cfg.prefix}
+        self.model = embedder_name(**self.config)
+        self.memory: TTLCache[str, np.ndarray] = TTLCache(cfg.memory_size, ttl_sec=24 * 3600.0)
+        self._index_params = ({"m": cfg.hnsw_m, "ef_construction": cfg.hnsw_ef_construction, "ef": cfg.hnsw_ef}
+                              if cfg.index == "hnsw" else {})
+
+        # kind -> (индекс, подписи, время загрузки); подпись - title вакансии / filename резюме
+        self._indexes: Dict[str, Tuple[Any, Dict[UUID, str | None], float]] = {}
+        self._locks = {"vacancy": asyncio.Lock(), "cv": asyncio.Lock()}
+        self.logger = logging.getLogger(__name__)
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Векторы текстов (n, dim): память -> Postgres -> вычисление недостающих пачками в пуле.
+        """
+        hashes = [text_hash(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        for h in hashes:
+            v = self.memory.get(h)
+            if v is not None:
+                found[h] = v
+
+        missing = [h for h in dict.fromkeys(hashes) if h not in found]
+        if missing and self.repository is not None:
+            try:
+                found.update(await self.repository.get_many(self.model, missing))
+            except Exception:
+                self.logger.exception("embedding cache read failed")
+
+        todo: Dict[str, str] = {}
+        for h, t in zip(hashes, texts):
+            if h not in found:
+                todo.setdefault(h, t)
+        if todo:
+            keys, values = list(todo), list(todo.values())
+            computed: Dict[str, np.ndarray] = {}
+            for i in range(0, len(values), _EMBED_BATCH):
+                vecs = await self.executor.run("embed", cpu_tasks.embed, self.config, values[i:i + _EMBED_BATCH])
+                computed.update(zip(keys[i:i + _EMBED_BATCH], vecs))
+            found.update(computed)
+            if self.repository is not None:
+                try:
+                    await self.repository.put_many(self.model, computed)
+                except Exception:
+                    self.logger.exception("embedding cache write failed")
+
+        for h in hashes:
+            self.memory.set(h, found[h])
+        if not hashes:
+            return np.zeros((0, settings.embeddings.dim), dtype=np.float32)
+        return np.stack([found[h] for h in hashes])
+
+    async def _source(self, kind: str):
+        if kind == "vacancy":
+            async for batch in self.vacancies.iter_texts():
+                yield [(vacancy_id, title, vacancy_text({"title": title, "description_md": desc}))
+                       for vacancy_id, title, desc in batch]
+        else:
+            async for batch in self.candidates.iter_cvs():
+                yield [(dto.id, dto.filename, dto.text) for dto in batch]
+
+    async def _get_index(self, kind: str):
+        entry = self._indexes.get(kind)
+        if entry is not None and time.monotonic() - entry[2] < _INDEX_TTL_SEC:
+            return entry
+        async with self._locks[kind]:
+            entry = self._indexes.get(kind)
+            if entry is None or time.monotonic() - entry[2] >= _INDEX_TTL_SEC:
+                index, labels = None, {}
+                async for batch in self._source(kind):
+                    vectors = await self.embed([text for _, _, text in batch])
+                    if index is None:
+                        index = make_index(settings.embeddings.index, vectors.shape[1], **self._index_params)
+                    for (key, label, _), vec in zip(batch, vectors):
+                        index.add(key, vec)
+                        labels[key] = label
+                if index is None:
+                    index = make_index(settings.embeddings.index, settings.embeddings.dim, **self._index_params)
+                entry = (index, labels, time.monotonic())
+                self._indexes[kind] = entry
+        return entry
+
+    async def add(self, kind: str, key: UUID, label: str | None, text: str) -> None:
+        """
+        Новый документ в уже загруженный индекс (не загруженный подхватит его при загрузке).
+        """
+        entry = self._indexes.get(kind)
+        if entry is None:
+            return
+        index, labels, _ = entry
+        try:
+            vector = (await self.embed([text]))[0]
+        except Exception:
+            # документ уже сохранён - в индекс он попадёт при следующей загрузке
+            self.logger.exception("embedding of %s %s failed", kind, key)
+            return
+        index.add(key, vector)
+        labels[key] = label
+
+    async def add_vacancy(self, vacancy_id: UUID, profile: Dict[str, Any]) -> None:
+        title = profile.get("title") or "Vacancy"
+        await self.add("vacancy", vacancy_id, title,
+                       vacancy_text({"title": title, "description_md": profile.get("description_md", "")}))
+
+    async def similarity(self, vacancy_text: str, cv_text: str) -> float:
+        """
+        score.semantic_score для пары текстов, но векторы - из кэша (память, Postgres) и пула процессов.
+        """
+        vecs = await self.embed([vacancy_text, cv_text])
+        return semantic_score_vectors(vecs[0], vecs[1])
+
+    async def similar_vacancies(self, text: str, limit: int = 20) -> List[VacancyRankItem]:
+        """
+        Вакансии реестра, ближайшие к тексту резюме по косинусу эмбеддингов.
+        """
+        index, labels, _ = await self._get_index("vacancy")
+        vector = (await self.embed([text]))[0]
+        return [VacancyRankItem(vacancy_id=key, title=labels.get(key) or "Vacancy", score=score)
+                for key, score in index.search(vector, limit)]
+
+    async def similar_candidates(self, text: str, limit: int = 20) -> List[CandidateRankItem]:
+        """
+        Резюме пула, ближайшие к тексту вакансии по косинусу эмбеддингов.
+        """
+        index, labels, _ = await self._get_index("cv")
+        vector = (await self.embed([text]))[0]
+        return [CandidateRankItem(candidate_id=key, filename=labels.get(key), score=score)
+                for key, score in index.search(vector, limit)]
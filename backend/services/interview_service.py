@@ -0,0 +1,114 @@
+from repositories.db.cv_features import CvFeaturesRepository
+from repositories.db.vacancy import VacancyRepository
+from services.analysis_service import AnalysisService, accepted
+from services.compare_cache import content_hash
+from services.user import UserService
+from schemas.docs import CachedAnalysis, InterviewDTO, ParsedDocument
+from matching.features import cv_features, features_version
+from settings.settings import settings
+from fastapi import HTTPException, status
+from typing import Any, Dict, Optional
+from uuid import UUID
+import asyncio
+import httpx
+import logging
+
+# как часто проверяем, не закончил ли генерацию другой процесс, секунд
+_POLL_SEC = 1.0
+
+
+class InterviewService:
+    """
+    Ссылки на интервью и материалы к ним. Материалы (темы, meta, сжатые копии) - второй вызов
+    LLM, только для допущенных кандидатов и в фоне: ссылка выдаётся сразу после вердикта, запись
+    user создаётся с pending - ссылками на входы генерации (резюме в cv_features, текст вакансии
+    в vacancy_text по хешу, вердикт), материалы дописываются по готовности.
+    Вход по ссылке (materials) дожидается генерации. Кто генерирует - решает claimed_at в записи:
+    процесс, выдавший ссылку (API или воркер), или, если он молчит дольше interview_claim_sec
+    (рестарт, упал), тот, кто первым перехватил. Остальные ждут, второй платный вызов не делается.
+    """
+
+    def __init__(self, analysis: AnalysisService, users: UserService,
+                 cvs: CvFeaturesRepository, vacancies: VacancyRepository):
+        self.analysis = analysis
+        self.users = users
+        self.cvs = cvs
+        self.vacancies = vacancies
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self.logger = logging.getLogger(__name__)
+
+    async def create_link(self, cv: ParsedDocument, vacancy: ParsedDocument, analysis: CachedAnalysis,
+                          client: httpx.AsyncClient | None = None) -> Optional[str]:
+        """Ссылка на интервью для допущенного кандидата; отказ - None."""
+        if not accepted(analysis.response):
+            return None
+        if analysis.interview is not None:
+            return await self.users.create_interview_link(analysis.interview)
+
+        # тексты - по ссылкам: резюме уже может быть в cv_features (та же запись по хешу текста),
+        # вакансия хранится один раз на все кандидатуры
+        cv_id = await self.cvs.put_cv(
+            text_hash=content_hash(cv.text),
+            filename=None,
+            text=cv.text,
+            contacts=cv.contacts or {},
+            features=cv.features or cv_features(cv.text),
+            features_version=features_version(),
+            signature=cv.signature,
+        )
+        vacancy_hash = content_hash(vacancy.text)
+        await self.vacancies.put_text(vacancy_hash, vacancy.text)
+        user_id = await self.users.put_pending({"cv_id": str(cv_id), "vacancy_hash": vacancy_hash,
+                                                "response": analysis.response.model_dump(mode="json")})
+        # задача не привязана к запросу: отключение клиента не отменяет генерацию
+        task = asyncio.create_task(self._prepare(user_id, cv, vacancy, analysis, client))
+        self._tasks[user_id] = task
+        task.add_done_callback(lambda t: self._done(user_id, t))
+        return await self.users.interview_link(user_id)
+
+    async def materials(self, user_id: int, client: httpx.AsyncClient | None = None) -> InterviewDTO:
+        """Материалы интервью для входа по ссылке - готовые, когда и где бы их ни начали генерировать."""
+        task = self._tasks.get(user_id)
+        if task is not None:
+            try:
+                return await asyncio.shield(task)
+            except Exception:
+                # фоновая генерация упала (claim уже снят) - пробуем ещё раз ниже
+                pass
+
+        while True:
+            if await self.users.get_pending(user_id) is None:
+                return await self.users.get_data_by_id(user_id)
+            pending = await self.users.claim_pending(user_id, settings.analyzer.interview_claim_sec)
+            if pending is not None:
+                return await self._prepare_pending(user_id, pending, client)
+            # генерирует другой процесс (воркер, другая реплика) - ждём его результата в записи
+            await asyncio.sleep(_POLL_SEC)
+
+    async def _prepare_pending(self, user_id: int, pending: Dict[str, Any],
+                               client: httpx.AsyncClient | None) -> InterviewDTO:
+        cv = await self.cvs.get_cv(UUID(pending["cv_id"]))
+        vacancy_text = await self.vacancies.get_text(pending["vacancy_hash"])
+        if cv is None or vacancy_text is None:
+            await self.users.release_claim(user_id)
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND,
+                                detail="Не найдены резюме или вакансия для материалов интервью")
+        return await self._prepare(user_id, ParsedDocument(text=cv.text), ParsedDocument(text=vacancy_text),
+                                   CachedAnalysis(response=pending["response"]), client)
+
+    async def _prepare(self, user_id: int, cv: ParsedDocument, vacancy: ParsedDocument,
+                       analysis: CachedAnalysis, client: httpx.AsyncClient | None) -> InterviewDTO:
+        try:
+            dto = await self.analysis.interview(cv, vacancy, analysis, client)
+        except BaseException:
+            # не ждать interview_claim_sec: следующий вход по ссылке сразу попробует снова
+            await asyncio.shield(self.users.release_claim(user_id))
+            raise
+        await self.users.store_interview(user_id, dto)
+        return dto
+
+    def _done(self, user_id: int, task: asyncio.Task) -> None:
+        self._tasks.pop(user_id, None)
+        if not task.cancelled() and task.exception() is not None:
+            # pending остаётся в записи - материалы сгенерируются при входе по ссылке
+            self.logger.error("interview materials failed for user %s: %s", user_id, task.exception())
@@ -0,0 +1,167 @@
+from repositories.db.job import JobRepository, JOB_NEW_CHANNEL, JOB_DONE_CHANNEL, DONE, FAILED
+from infrastructure.db.notify import PgNotifier
+from services.parsing_service import ParsingService
+from services.vacancy_service import VacancyService
+from services.screening_service import ScreeningService
+from schemas.job import JobDTO, ClaimedJob
+from settings.settings import settings
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID
+import asyncio
+import httpx
+import logging
+import time
+
+JobHandler = Callable[[ClaimedJob], Awaitable[Dict[str, Any]]]
+
+COMPARE_JOB = "compare"
+
+
+class JobService:
+    """
+    Приём задач и выдача статуса/результата. Ожидание завершения - через NOTIFY,
+    с периодическим опросом БД на случай потери LISTEN-соединения.
+    """
+
+    def __init__(self, repository: JobRepository, notifier: Optional[PgNotifier] = None):
+        self.repository = repository
+        self.notifier = notifier
+        self._tracked: Set[asyncio.Task] = set()
+        self.logger = logging.getLogger(__name__)
+
+    async def submit(self, kind: str, payload: Dict[str, Any],
+                     cv: bytes | None = None, vacancy: bytes | None = None) -> UUID:
+        return await self.repository.create_job(kind, payload, cv=cv, vacancy=vacancy)
+
+    async def track(self, kind: str, payload: Dict[str, Any], work: Awaitable[BaseModel],
+                    cv: bytes | None = None, vacancy: bytes | None = None) -> UUID:
+        """
+        Оформляет как задачу работу, которая уже идёт в этом процессе (LLM после истечения
+        бюджета /compare): результат можно получить через GET /jobs/{id}. Входные файлы
+        сохраняются, чтобы при падении процесса задачу доделал воркер.
+        """
+        job_id = await self.repository.create_job(kind, payload, cv=cv, vacancy=vacancy, running=True)
+        task = asyncio.ensure_future(self._finish_tracked(job_id, work))
+        self._tracked.add(task)
+        task.add_done_callback(self._tracked.discard)
+        return job_id
+
+    async def _finish_tracked(self, job_id: UUID, work: Awaitable[BaseModel]) -> None:
+        try:
+            result = await work
+        except HTTPException as e:
+            retry = e.status_code >= 500 and 1 < settings.jobs.max_attempts
+            await self.repository.finish_job(job_id, error=str(e.detail), retry=retry)
+        except Exception as e:
+            self.logger.exception("tracked job %s failed", job_id)
+            await self.repository.finish_job(job_id, error=str(e), retry=1 < settings.jobs.max_attempts)
+        else:
+            await self.repository.finish_job(job_id, result=result.model_dump(mode="json"))
+
+    async def get(self, job_id: UUID) -> JobDTO:
+        job = await self.repository.get_job(job_id)
+        if job is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Задача не найдена")
+        return job
+
+    async def wait(self, job_id: UUID, timeout: float) -> JobDTO:
+        """Ждёт завершения задачи не дольше timeout секунд и возвращает её текущее состояние."""
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            # подписываемся до чтения статуса, чтобы не пропустить NOTIFY между ними
+            fut = self.notifier.waiter(JOB_DONE_CHANNEL, str(job_id)) if self.notifier else None
+            try:
+                job = await self.get(job_id)
+                remaining = deadline - time.monotonic()
+                if job.status in (DONE, FAILED) or remaining <= 0:
+                    return job
+                step = min(remaining, settings.jobs.poll_interval_sec)
+                if fut is not None and self.notifier.active:
+                    try:
+                        await asyncio.wait_for(asyncio.shield(fut), timeout=step)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(min(step, 1.0))
+            finally:
+                if fut is not None:
+                    self.notifier.discard(JOB_DONE_CHANNEL, str(job_id), fut)
+
+
+class JobWorker:
+    """
+    Воркер очереди: забирает задачи через SKIP LOCKED и выполняет обработчик по kind.
+    Ошибки 4xx - окончательные, остальные - повтор, пока не исчерпаны попытки.
+    """
+
+    def __init__(self, repository: JobRepository, handlers: Dict[str, JobHandler],
+                 notifier: Optional[PgNotifier] = None):
+        self.repository = repository
+        self.handlers = handlers
+        self.notifier = notifier
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        wake = self.notifier.subscribe(JOB_NEW_CHANNEL) if self.notifier else None
+        try:
+            while not stop.is_set():
+                try:
+                    if await self.run_once():
+                        continue
+                    await self.repository.requeue_stale(settings.jobs.stale_after_sec, settings.jobs.max_attempts)
+                except Exception:
+                    self.logger.exception("job worker iteration failed")
+
+                # очередь пуста - спим до NOTIFY о новой задаче или до следующего опроса
+                waiters = [asyncio.ensure_future(stop.wait())]
+                if wake is not None:
+                    waiters.append(asyncio.ensure_future(wake.get()))
+                done, pending = await asyncio.wait(waiters, timeout=settings.jobs.poll_interval_sec,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                for w in pending:
+                    w.cancel()
+        finally:
+            if wake is not None:
+                self.notifier.unsubscribe(JOB_NEW_CHANNEL, wake)
+
+    async def run_once(self) -> bool:
+        """Выполняет одну задачу. False - если очередь пуста."""
+        job = await self.repository.claim_job()
+        if job is None:
+            return False
+
+        handler = self.handlers.get(job.kind)
+        if handler is None:
+            await self.repository.finish_job(job.id, error=f"Неизвестный тип задачи: {job.kind}")
+            return True
+
+        try:
+            result = await handler(job)
+        except HTTPException as e:
+            retry = e.status_code >= 500 and job.attempts < settings.jobs.max_attempts
+            await self.repository.finish_job(job.id, error=str(e.detail), retry=retry)
+        except Exception as e:
+            self.logger.exception("job %s failed", job.id)
+            retry = job.attempts < settings.jobs.max_attempts
+            await self.repository.finish_job(job.id, error=str(e), retry=retry)
+        else:
+            await self.repository.finish_job(job.id, result=result)
+        return True
+
+
+def compare_job_handler(parsing: ParsingService, vacancies: VacancyService, screening: ScreeningService,
+                        client: httpx.AsyncClient | None = None) -> JobHandler:
+    """Обработчик задачи compare: тот же конвейер, что у /compare."""
+
+    async def handle(job: ClaimedJob) -> Dict[str, Any]:
+        cv_doc = await parsing.parse_cv(job.cv or b"")
+        if job.vacancy is not None:
+            vac_doc = await parsing.parse_vacancy(job.vacancy)
+        else:
+            vac_doc = await vacancies.get_document(UUID(job.payload["vacancy_id"]))
+        resp = await screening.compare(cv_doc, vac_doc, client)
+        return resp.model_dump(mode="json")
+
+    return handle
@@ -1,36 +1,44 @@
 from .parsing_service import ParsingService
-from schemas.docs import ParsedDocsResponse, CompareResponse, ParsedText
-from matching.matcher import decide as decide_core
+from schemas.docs import CompareResponse, ParsedDocument
+from utils.deadline import Deadline
+from services import cpu_tasks
+from typing import Any, Dict
 
 class MatchService:
     def __init__(self, parsing_service: ParsingService):
         self.parsing = parsing_service
 
-    async def compare_docs(self, cv: bytes, vacancy: bytes) -> CompareResponse:
-        # парсим оба DOCX
-        parsed: ParsedDocsResponse = await self.parsing.parse_docs(cv, vacancy)
+    async def parse_docs(self, cv: bytes, vacancy: bytes) -> tuple[ParsedDocument, ParsedDocument]:
+        # каждый DOCX парсится ровно один раз
+        return await self.parsing.parse_docs(cv, vacancy)
 
-
-        vac = { 
-            "title": parsed.vacancy.get("title") or "Vacancy",
-            "description_md": parsed.vacancy.get("description_md", ""),
-            "must_have": parsed.vacancy.get("must_have", []),
-            "nice_to_have": parsed.vacancy.get("nice_to_have", []),
-            "min_years_total": parsed.vacancy.get("min_years_total"),
-            "english_min_level": parsed.vacancy.get("english_min_level"),
+    @staticmethod
+    def vacancy_input(vacancy: ParsedDocument) -> Dict[str, Any]:
+        profile = vacancy.profile or {}
+        return { 
+            "title": profile.get("title") or "Vacancy",
+            "description_md": profile.get("description_md", ""),
+            "must_have": profile.get("must_have", []),
+            "nice_to_have": profile.get("nice_to_have", []),
+            "min_years_total": profile.get("min_years_total"),
+            "english_min_level": profile.get("english_min_level"),
+            "bm25_weights": (vacancy.features or {}).get("bm25_weights"),
         }
 
-        cv = {
-            "text": parsed.cv.text,
-            "detected_meta": parsed.cv.contacts or {},
+    @staticmethod
+    def cv_input(cv: ParsedDocument) -> Dict[str, Any]:
+        return {
+            **(cv.features or {}),
+            "text": cv.text or "",
+            "detected_meta": cv.contacts or {},
         }
 
-        decision = decide_core(vac, cv)
-        decision["contacts"] = parsed.cv.contacts
+    async def compare_docs(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                           deadline: Deadline | None = None) -> CompareResponse:
+        vac = self.vacancy_input(vacancy)
+        aw = self.parsing.executor.run("match", cpu_tasks.match, vac, self.cv_input(cv))
+        decision = await (deadline.run(aw, "match") if deadline is not None else aw)
+        decision["contacts"] = cv.contacts
         dto = CompareResponse(decision=decision, vacancy=vac)
         
         return dto
-
-    async def docs_to_text(self, cv: bytes, vacancy: bytes) -> ParsedText:
-        docs_text = await self.parsing.docs_to_text(cv, vacancy)
-        return docs_text
\ No newline at end of file
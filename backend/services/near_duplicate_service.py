@@ -0,0 +1,92 @@
+from repositories.db.cv_features import CvFeaturesRepository
+from services.compare_cache import content_hash
+from schemas.docs import ParsedDocument
+from matching.features import features_version
+from matching.minhash import LshIndex, from_bytes
+from typing import Optional, Tuple
+from uuid import UUID
+import asyncio
+import logging
+import time
+
+# индекс перечитывается из БД не реже этого, как индексы VacancyService
+_INDEX_TTL_SEC = 300.0
+
+
+class NearDuplicateService:
+    """
+    Почти-дубликаты резюме (новый телефон, переставленные разделы): MinHash-подписи текстов
+    хранятся в cv_features, в памяти - LSH-индекс по ним. Найденный дубликат даёт id резюме,
+    чей уже посчитанный анализ можно взять вместо нового вызова LLM (см. AnalysisService).
+    """
+
+    def __init__(self, repository: CvFeaturesRepository, threshold: float = 0.9, bands: int = 16):
+        self.repository = repository
+        self.threshold = threshold
+        self.bands = bands
+        self._index: LshIndex[UUID] | None = None
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    async def _get_index(self) -> LshIndex[UUID]:
+        if self._index is not None and time.monotonic() - self._loaded_at < _INDEX_TTL_SEC:
+            return self._index
+        async with self._lock:
+            if self._index is None or time.monotonic() - self._loaded_at >= _INDEX_TTL_SEC:
+                index: LshIndex[UUID] = LshIndex(self.bands)
+                async for batch in self.repository.iter_signatures():
+                    for cv_id, data in batch:
+                        sig = from_bytes(data)
+                        if sig is not None:
+                            index.add(cv_id, sig)
+                self._index = index
+                self._loaded_at = time.monotonic()
+        return self._index
+
+    async def find(self, cv: ParsedDocument) -> Optional[Tuple[UUID, str, float]]:
+        """
+        Самое похожее сохранённое резюме со сходством >= threshold, кроме точной копии текста:
+        (id, текст, сходство). None - нет подписи, нет дубликата или БД недоступна.
+        """
+        sig = from_bytes(cv.signature) if cv.signature else None
+        if sig is None:
+            return None
+        try:
+            index = await self._get_index()
+            for cv_id, sim in index.query(sig, self.threshold):
+                dto = await self.repository.get_cv(cv_id)
+                if dto is not None and dto.text != cv.text:
+                    return cv_id, dto.text, sim
+        except Exception:
+            self.logger.exception("near-duplicate lookup failed")
+        return None
+
+    def add(self, cv_id: UUID, signature: bytes | None) -> None:
+        """Резюме в уже загруженный индекс (не загруженный подхватит его из БД)."""
+        sig = from_bytes(signature) if signature else None
+        if self._index is not None and sig is not None:
+            self._index.add(cv_id, sig)
+
+    async def remember(self, cv: ParsedDocument, filename: str | None = None) -> UUID | None:
+        """
+        Сохраняет резюме с подписью в cv_features (та же запись, что у POST /candidates),
+        чтобы следующие его версии находились как дубликаты.
+        """
+        if not cv.signature or not cv.features or cv.text is None:
+            return None
+        try:
+            cv_id = await self.repository.put_cv(
+                text_hash=content_hash(cv.text),
+                filename=filename,
+                text=cv.text,
+                contacts=cv.contacts or {},
+                features=cv.features,
+                features_version=features_version(),
+                signature=cv.signature,
+            )
+        except Exception:
+            self.logger.exception("near-duplicate remember failed")
+            return None
+        self.add(cv_id, cv.signature)
+        return cv_id
@@ -1,36 +1,70 @@
 from repositories.db.repository import Repository
-from utils.docx_extract import docx_to_txt
-from utils.vacancy_extract import parse_vacancy_docx_to_profile
-from utils.contacts_extract import extract_contacts
-from schemas.docs import ParsedDoc, ParsedDocsResponse, ParsedText
+from infrastructure.executor.pool import CpuExecutor
+from utils.docx_extract import DocxLimitError
+from schemas.docs import ParsedDocument
+from utils.deadline import Deadline
+from services import cpu_tasks
 from fastapi import HTTPException, status
 import asyncio
 
 class ParsingService():
-    def __init__(self, repository: Repository):
+    def __init__(self, repository: Repository, executor: CpuExecutor | None = None):
         self.repository = repository
+        # без пула процессов CPU-этапы идут в потоке
+        self.executor = executor or CpuExecutor()
     
-    async def parse_docs(self, cv: bytes, vacancy: bytes) -> ParsedDocsResponse:
+    async def _run(self, stage: str, fn, data: bytes, deadline: Deadline | None):
+        aw = self.executor.run(stage, fn, data)
+        return await (deadline.run(aw, stage) if deadline is not None else aw)
+    
+    async def parse_cv(self, cv: bytes, deadline: Deadline | None = None) -> ParsedDocument:
+        """
+        Резюме: текст извлекаем один раз, из него же - контакты и признаки для мэтчера.
+        """
+        if not cv:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Файл пустой")
         try:
-            cv_text = await docx_to_txt(cv)
+            parsed = await self._run("parse_cv", cpu_tasks.parse_cv, cv, deadline)
+        except HTTPException:
+            raise
+        except DocxLimitError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=f"Резюме: {e}")
         except Exception:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось прочитать файл резюме (.docx может быть повреждён)")
         
-        contacts = extract_contacts(cv_text)
-        
-        vac = parse_vacancy_docx_to_profile(vacancy)
-        
-        return ParsedDocsResponse(
-            cv=ParsedDoc(
-                text=cv_text,
-                contacts=contacts,
-            ),
-            vacancy=vac
-        )
+        return ParsedDocument(**parsed)
+    
+    async def parse_vacancy(self, vacancy: bytes, deadline: Deadline | None = None) -> ParsedDocument:
+        """
+        Вакансия: таблицы (для мэтчера) и текст (для LLM) собираются за один потоковый проход.
+        """
+        try:
+            parsed = await self._run("parse_vacancy", cpu_tasks.parse_vacancy, vacancy, deadline)
+        except HTTPException:
+            raise
+        except DocxLimitError as e:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=f"Вакансия: {e}")
+        except Exception:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось прочитать файл вакансии (.docx может быть повреждён)")
         
-    async def docs_to_text(self, cv: bytes, vac: bytes) -> ParsedText:
-        cv_text, vac_text = await asyncio.gather(
-            docx_to_txt(cv),
-            docx_to_txt(vac),
-        )
-        return ParsedText(cv_text=cv_text, vac_text=vac_text)
\ No newline at end of file
+        return ParsedDocument(**parsed)
+    
+    async def parse_docs(self, cv: bytes, vacancy: bytes,
+                         deadline: Deadline | None = None) -> tuple[ParsedDocument, ParsedDocument]:
+        return await asyncio.gather(self.parse_cv(cv, deadline), self.parse_vacancy(vacancy, deadline))
+    
+    async def ensure_text(self, doc: ParsedDocument) -> str:
+        """
+        Возвращает текст документа, извлекая его не более одного раза.
+        """
+        if doc.text is None:
+            if not doc.raw:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Файл пустой")
+            try:
+                doc.text = await self.executor.run("docx_text", cpu_tasks.docx_text, doc.raw)
+            except DocxLimitError as e:
+                raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+            except Exception:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Не удалось прочитать файл (.docx может быть повреждён)")
+            doc.raw = None
+        return doc.text
@@ -0,0 +1,214 @@
+from services.parsing_service import ParsingService
+from services.match_service import MatchService
+from services.analysis_service import AnalysisService
+from services.interview_service import InterviewService
+from schemas.docs import ParsedDocument, ParsingAndLLMResponse
+from settings.settings import settings
+from utils.deadline import Deadline
+from fastapi import HTTPException
+from contextlib import nullcontext
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Any
+import asyncio
+import httpx
+import logging
+
+# (имя файла, загрузчик байтов) - байты читаются только когда до файла дошла очередь
+CvSource = Tuple[str, Callable[[], Awaitable[bytes]]]
+
+
+class _StreamedVerdict:
+    """
+    Вердикт из потока ответа LLM (AnalysisService.analyze(on_field=...)):
+    - early - пришли decision и match_percentage (первые поля ответа), обоснование и фидбек
+      ещё генерируются;
+    - ready - пришёл candidate_feedback, последнее поле ответа вердикта.
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        loop = asyncio.get_running_loop()
+        self.early = loop.create_future()
+        self.ready = loop.create_future()
+
+    def on_field(self, key: str, value: Any) -> None:
+        self.fields[key] = value
+        if "decision" in self.fields and "match_percentage" in self.fields and not self.early.done():
+            self.early.set_result(None)
+        if key == "candidate_feedback" and not self.ready.done():
+            self.ready.set_result(None)
+
+    def payload(self) -> Dict[str, Any]:
+        return {"decision": self.fields.get("decision"), "score": self.fields.get("match_percentage"),
+                "reasons": self.fields.get("candidate_feedback"), "reused_from": None}
+
+
+class ScreeningService:
+    """
+    Полный конвейер сравнения: мэтчер -> (если не reject) LLM-вердикт -> (если допущен) ссылка
+    на интервью; материалы к ней генерируются в фоне (InterviewService).
+    """
+
+    def __init__(self, parsing: ParsingService, matching: MatchService,
+                 analysis: AnalysisService, interviews: InterviewService):
+        self.parsing = parsing
+        self.matching = matching
+        self.analysis = analysis
+        self.interviews = interviews
+        self.logger = logging.getLogger(__name__)
+
+    async def compare_events(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                             client: httpx.AsyncClient | None = None,
+                             llm_slots: asyncio.Semaphore | None = None,
+                             force: bool = False) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Тот же конвейер, но по этапам: (событие, данные) отдаются сразу по готовности этапа -
+        decision (мэтчер), provisional_verdict (решение и процент LLM, пока генерируются обоснование
+        и фидбек; только в режиме stream), verdict (LLM), link (ссылка на интервью, только допущенным),
+        result (итоговый ParsingAndLLMResponse).
+        force - LLM-анализ заново, без кэша и вердиктов почти-дубликатов.
+        """
+        dto = await self.matching.compare_docs(cv, vacancy)
+        decision = dto.decision
+        resp = ParsingAndLLMResponse(details=decision.get("details", None))
+        yield "decision", {
+            "decision": decision["decision"],
+            "score": decision["score"],
+            "reasons": decision["reasons"],
+            "details": decision.get("details"),
+        }
+
+        if decision["decision"] != "reject":
+            # текст вакансии нужен только LLM; если документ пришёл без текста - извлекаем сейчас
+            await self.parsing.ensure_text(vacancy)
+            streamed, sent = _StreamedVerdict(), False
+            async with (llm_slots or nullcontext()):
+                task = asyncio.ensure_future(self.analysis.analyze(cv, vacancy, client, force, streamed.on_field))
+                try:
+                    # решение и процент отдаём, как только они сгенерированы, затем - вердикт целиком,
+                    # не дожидаясь конца ответа LLM
+                    await asyncio.wait([task, streamed.early], return_when=asyncio.FIRST_COMPLETED)
+                    if not task.done():
+                        verdict = streamed.payload()
+                        yield "provisional_verdict", {"decision": verdict["decision"], "score": verdict["score"]}
+                        await asyncio.wait([task, streamed.ready], return_when=asyncio.FIRST_COMPLETED)
+                    if not task.done():
+                        sent = True
+                        yield "verdict", streamed.payload()
+                    analysis = await task
+                finally:
+                    task.cancel()
+
+            resp.decision = analysis.response.decision
+            resp.score = analysis.response.score
+            resp.reasons = analysis.response.reasons
+            resp.reused_from = analysis.response.reused_from
+            if not sent:
+                yield "verdict", {"decision": resp.decision, "score": resp.score, "reasons": resp.reasons,
+                                  "reused_from": resp.reused_from}
+
+            resp.link = await self.interviews.create_link(cv, vacancy, analysis, client)
+            if resp.link is not None:
+                yield "link", {"link": resp.link}
+        else:
+            resp = self._matcher_response(decision)
+
+        yield "result", resp
+
+    @staticmethod
+    def _matcher_response(decision: Dict[str, Any]) -> ParsingAndLLMResponse:
+        resp = ParsingAndLLMResponse(details=decision.get("details", None))
+        resp.decision = decision["decision"]
+        resp.score = decision["score"]*100
+        resp.reasons = decision["reasons"][0] if decision["reasons"] else None
+        return resp
+
+    async def _complete(self, resp: ParsingAndLLMResponse, cv: ParsedDocument, vacancy: ParsedDocument,
+                        client: httpx.AsyncClient | None, force: bool = False,
+                        streamed: _StreamedVerdict | None = None) -> ParsingAndLLMResponse:
+        """LLM-вердикт и (допущенным) ссылка на интервью поверх ответа мэтчера."""
+        await self.parsing.ensure_text(vacancy)
+        analysis = await self.analysis.analyze(cv, vacancy, client, force,
+                                               streamed.on_field if streamed is not None else None)
+        resp.decision = analysis.response.decision
+        resp.score = analysis.response.score
+        resp.reasons = analysis.response.reasons
+        resp.reused_from = analysis.response.reused_from
+        resp.link = await self.interviews.create_link(cv, vacancy, analysis, client)
+        return resp
+
+    async def compare_within(self, cv: ParsedDocument, vacancy: ParsedDocument, deadline: Deadline | None,
+                             client: httpx.AsyncClient | None = None, force: bool = False,
+                             ) -> Tuple[ParsingAndLLMResponse, Optional[asyncio.Task]]:
+        """
+        Конвейер с бюджетом времени. Мэтчер обязателен, LLM ждём только пока есть бюджет:
+        не успел - отдаём решение мэтчера с provisional=True и задачу, которая продолжает
+        работать в фоне и вернёт полный ответ. deadline=None - ждём LLM без ограничения.
+        Если к сроку LLM успел сгенерировать решение и процент (stream), provisional-ответ несёт
+        их вместо решения мэтчера (reasons - фидбек LLM, если успел) - в фоне дописывается
+        только конец ответа вердикта.
+        """
+        dto = await self.matching.compare_docs(cv, vacancy, deadline)
+        resp = self._matcher_response(dto.decision)
+        if resp.decision == "reject":
+            return resp, None
+
+        # задача не привязана к запросу: по таймауту отменяется только ожидание, не сам LLM
+        streamed = _StreamedVerdict()
+        task = asyncio.ensure_future(self._complete(resp.model_copy(), cv, vacancy, client, force, streamed))
+        try:
+            timeout = deadline.remaining() if deadline is not None else None
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout), None
+        except asyncio.TimeoutError:
+            if streamed.early.done():
+                verdict = streamed.payload()
+                # фидбек LLM (или None, если ещё не сгенерирован) - причины мэтчера к вердикту LLM не относятся
+                resp.decision, resp.score, resp.reasons = verdict["decision"], verdict["score"], verdict["reasons"]
+            resp.provisional = True
+            return resp, task
+
+    async def compare(self, cv: ParsedDocument, vacancy: ParsedDocument,
+                      client: httpx.AsyncClient | None = None,
+                      llm_slots: asyncio.Semaphore | None = None, force: bool = False) -> ParsingAndLLMResponse:
+        resp = ParsingAndLLMResponse()
+        async for event, data in self.compare_events(cv, vacancy, client, llm_slots, force):
+            if event == "result":
+                resp = data
+        return resp
+
+    async def screen_batch(self, vacancy: ParsedDocument, sources: List[CvSource],
+                           client: httpx.AsyncClient | None = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Одна (уже распарсенная) вакансия против многих резюме. Парсинг и вызовы LLM ограничены
+        своими семафорами; результаты отдаются по мере готовности, а не в порядке файлов.
+        """
+        parse_slots = asyncio.Semaphore(settings.batch.parse_concurrency)
+        llm_slots = asyncio.Semaphore(settings.batch.llm_concurrency)
+
+        # текст вакансии извлекаем один раз до разветвления, а не в каждой задаче
+        await self.parsing.ensure_text(vacancy)
+
+        async def one(index: int, filename: str, load: Callable[[], Awaitable[bytes]]) -> Dict[str, Any]:
+            item: Dict[str, Any] = {"index": index, "filename": filename}
+            try:
+                async with parse_slots:
+                    data = await load()
+                    if not data:
+                        raise HTTPException(status_code=400, detail="Файл пустой")
+                    cv = await self.parsing.parse_cv(data)
+                resp = await self.compare(cv, vacancy, client, llm_slots)
+                item["result"] = resp.model_dump()
+            except HTTPException as e:
+                item["error"] = {"status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                self.logger.exception("batch screening failed for %s", filename)
+                item["error"] = {"status_code": 500, "detail": str(e)}
+            return item
+
+        tasks = [asyncio.create_task(one(i, name, load)) for i, (name, load) in enumerate(sources)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            # клиент отключился - не продолжаем работу впустую
+            for t in tasks:
+                t.cancel()
@@ -0,0 +1,89 @@
+from matching.skills import use_compiled, taxonomy_version, current_matcher
+from matching.taxonomy import compile_taxonomy
+from typing import Any, Callable, Dict, Optional, Tuple
+import asyncio
+import logging
+import os
+
+
+class TaxonomyService:
+    """
+    Таксономия навыков из файла (settings.taxonomy): исходник JSON компилируется в файл матчера,
+    все процессы (API, пул, воркер) читают его через use_compiled и сами подхватывают замену.
+    Сервис следит за исходником и перекомпилирует его атомарно - новая версия без рестарта;
+    признаки резюме старой версии пересчитываются при следующем чтении (см. features_version).
+    """
+
+    def __init__(self, path: str = "", compiled_path: str = "", poll_interval_sec: float = 10.0):
+        self.path = path or None
+        self.compiled_path = (compiled_path or f"{path}.bin") if path else (compiled_path or None)
+        self.poll_interval_sec = poll_interval_sec
+        self._source_mtime: Optional[int] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _source_stamp(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _compile_if_stale(self) -> bool:
+        stamp = self._source_stamp()
+        if stamp is None or stamp == self._source_mtime:
+            return False
+        try:
+            compiled = os.stat(self.compiled_path).st_mtime_ns
+        except FileNotFoundError:
+            compiled = None
+        # на старте не компилируем заново, если файл матчера свежее исходника
+        if self._source_mtime is None and compiled is not None and compiled >= stamp:
+            self._source_mtime = stamp
+            return False
+        # битый исходник не перекомпилируем каждый цикл - только после следующей правки
+        self._source_mtime = stamp
+        version = compile_taxonomy(self.path, self.compiled_path)
+        self.logger.info("skill taxonomy %s compiled to %s", version, self.compiled_path)
+        return True
+
+    def prepare(self) -> None:
+        """
+        Компилирует исходник, если нужно, и переключает текущий процесс на файл матчера.
+        Вызывается до старта пула процессов.
+        """
+        if self.path is not None:
+            self._compile_if_stale()
+        if self.compiled_path is not None:
+            use_compiled(self.compiled_path)
+
+    def initializers(self) -> Tuple[Tuple[Callable[..., Any], Tuple[Any, ...]], ...]:
+        """Инициализаторы для CpuExecutor: процессы пула читают тот же файл матчера."""
+        if self.compiled_path is None:
+            return ()
+        return ((use_compiled, (self.compiled_path,)),)
+
+    async def watch(self, stop: asyncio.Event) -> None:
+        """
+        Проверяет исходник раз в poll_interval_sec и перекомпилирует изменённый.
+        Ошибка в исходнике не ломает работу: остаётся прежняя версия.
+        """
+        if self.path is None:
+            return
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval_sec)
+            except asyncio.TimeoutError:
+                pass
+            if stop.is_set():
+                break
+            try:
+                await asyncio.to_thread(self._compile_if_stale)
+            except Exception:
+                self.logger.exception("skill taxonomy %s: compile failed, keeping current version", self.path)
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "version": taxonomy_version(),
+            "source": self.path,
+            "compiled": self.compiled_path,
+            "aliases": len(current_matcher().canon),
+        }
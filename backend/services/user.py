@@ -1,6 +1,7 @@
 from repositories.db.user import UserRepository
 from utils.encrypt_id import encrypt_user_id, decrypt_user_id
 from schemas.docs import InterviewDTO
+from typing import Any, Dict
 
 class UserService:
     def __init__(self):
@@ -9,12 +10,35 @@ class UserService:
     async def put_user(self, dto: InterviewDTO) -> int | None:
         return await self.repository.put_user(dto.summary, dto.meta, dto.hard_topics, dto.soft_topics)
     
+    async def put_pending(self, pending: Dict[str, Any]) -> int | None:
+        return await self.repository.put_pending(pending)
+    
+    async def store_interview(self, id: int, dto: InterviewDTO) -> None:
+        await self.repository.store_interview(user_id=id, dto=dto)
+    
+    async def claim_pending(self, id: int, stale_sec: float) -> Dict[str, Any] | None:
+        return await self.repository.claim_pending(user_id=id, stale_sec=stale_sec)
+    
+    async def release_claim(self, id: int) -> None:
+        await self.repository.release_claim(user_id=id)
+    
+    async def get_pending(self, id) -> Dict[str, Any] | None:
+        return await self.repository.get_pending(user_id=id)
+    
     async def get_data_by_id(self, id) -> InterviewDTO:
         return await self.repository.get_data_by_id(user_id=id)
     
     async def get_encrypted_id(self, id):
         return await encrypt_user_id(user_id=id)
     
+    async def interview_link(self, id: int) -> str:
+        encrypted_user_id = await self.get_encrypted_id(id)
+        return f"http://localhost/interview/{encrypted_user_id}"
+    
+    async def create_interview_link(self, dto: InterviewDTO) -> str:
+        user_id = await self.put_user(dto)
+        return await self.interview_link(user_id)
+    
     async def validate_user(self, id) -> int:
         id = await decrypt_user_id(token=id)
         if await self.repository.check_user(user_id=id):
@@ -23,4 +47,4 @@ class UserService:
             return None
         
     async def check_user(self, id)-> bool:
-        return await self.repository.check_user(user_id=id)
\ No newline at end of file
+        return await self.repository.check_user(user_id=id)
@@ -0,0 +1,184 @@
+from repositories.db.vacancy import VacancyRepository
+from services.parsing_service import ParsingService
+from schemas.docs import ParsedDocument
+from services.match_service import MatchService
+from services import cpu_tasks
+from schemas.vacancy import VacancyDTO, VacancyRankItem, VacancySuggestion
+from matching.matcher import vacancy_features
+from matching.score import BM25_TOKENS_VERSION, bm25_weights
+from matching.bm25_index import BM25Index
+from matching.skill_index import RequirementIndex, best_k
+from matching.analysis import AnalyzedText
+from utils.ttl_cache import TTLCache
+from fastapi import HTTPException, status
+from typing import Any, Dict, List
+from uuid import UUID
+import asyncio
+import time
+
+# индекс перечитывается из БД не реже этого: вакансии могли добавить другие воркеры
+_INDEX_TTL_SEC = 300.0
+
+
+class VacancyService:
+    """
+    Реестр вакансий: DOCX парсится один раз при загрузке, дальше /compare работает
+    с сохранённым профилем, текстом и признаками по vacancy_id.
+    """
+
+    def __init__(self, parsing: ParsingService, repository: VacancyRepository):
+        self.parsing = parsing
+        self.repository = repository
+        # готовые к мэтчингу документы (веса BM25 уже посчитаны)
+        self._docs: TTLCache[UUID, ParsedDocument] = TTLCache(maxsize=512, ttl_sec=3600.0)
+        # BM25 по всему реестру (корпусные idf/avgdl), загружается лениво
+        self._index: BM25Index[UUID] | None = None
+        self._titles: Dict[UUID, str] = {}
+        self._index_loaded_at = 0.0
+        self._index_lock = asyncio.Lock()
+        # навык -> вакансии с весами требований, для обратного мэтчинга (тоже лениво)
+        self._req_index: RequirementIndex[UUID] | None = None
+        self._req_loaded_at = 0.0
+        self._req_lock = asyncio.Lock()
+
+    async def register(self, data: bytes) -> VacancyDTO:
+        doc = await self.parsing.parse_vacancy(data)
+        profile = doc.profile or {}
+        features = vacancy_features(profile)
+
+        vacancy_id = await self.repository.put_vacancy(
+            title=profile.get("title") or "Vacancy",
+            profile=profile,
+            text=doc.text or "",
+            features=features,
+        )
+        dto = VacancyDTO(id=vacancy_id, title=profile.get("title") or "Vacancy",
+                         profile=profile, text=doc.text or "", features=features)
+        self._docs.set(vacancy_id, self._to_document(dto))
+        if self._index is not None:
+            self._index.add(vacancy_id, features["bm25_tf"])
+        if self._index is not None or self._req_index is not None:
+            self._titles[vacancy_id] = dto.title
+        if self._req_index is not None:
+            self._req_index.add(vacancy_id, profile.get("must_have") or [], profile.get("nice_to_have") or [],
+                                profile.get("min_years_total"))
+        return dto
+
+    async def get(self, vacancy_id: UUID) -> VacancyDTO:
+        dto = await self.repository.get_vacancy(vacancy_id)
+        if dto is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Вакансия не найдена")
+        return dto
+
+    async def list(self, limit: int = 100, offset: int = 0) -> List[VacancyDTO]:
+        return await self.repository.list_vacancies(limit=limit, offset=offset)
+
+    async def get_document(self, vacancy_id: UUID) -> ParsedDocument:
+        doc = self._docs.get(vacancy_id)
+        if doc is None:
+            doc = self._to_document(await self._fresh(await self.get(vacancy_id)))
+            self._docs.set(vacancy_id, doc)
+        return doc
+
+    async def get_documents(self, vacancy_ids: List[UUID]) -> Dict[UUID, ParsedDocument]:
+        """Документы вакансий: из кэша, недостающие - одним запросом (несуществующих в ответе нет)."""
+        docs: Dict[UUID, ParsedDocument] = {}
+        missing: List[UUID] = []
+        for vacancy_id in vacancy_ids:
+            doc = self._docs.get(vacancy_id)
+            if doc is None:
+                missing.append(vacancy_id)
+            else:
+                docs[vacancy_id] = doc
+        for dto in await self.repository.get_vacancies(missing):
+            doc = self._to_document(await self._fresh(dto))
+            self._docs.set(dto.id, doc)
+            docs[dto.id] = doc
+        return docs
+
+    async def _fresh(self, dto: VacancyDTO) -> VacancyDTO:
+        """
+        Вакансия с bm25_tf текущей токенизации: сохранённые старой версией пересчитываются
+        по профилю и переписываются в БД (один раз на вакансию).
+        """
+        if dto.features.get("bm25_version") == BM25_TOKENS_VERSION:
+            return dto
+        features = {**dto.features, **vacancy_features(dto.profile)}
+        await self.repository.update_features(dto.id, features)
+        return dto.model_copy(update={"features": features})
+
+    async def _get_index(self) -> BM25Index[UUID]:
+        if self._index is not None and time.monotonic() - self._index_loaded_at < _INDEX_TTL_SEC:
+            return self._index
+        async with self._index_lock:
+            if self._index is None or time.monotonic() - self._index_loaded_at >= _INDEX_TTL_SEC:
+                # строим новый индекс рядом и подменяем целиком - поиск не видит полузагруженный
+                index: BM25Index[UUID] = BM25Index()
+                titles: Dict[UUID, str] = {}
+                stale: List[UUID] = []
+                async for batch in self.repository.iter_term_freqs(BM25_TOKENS_VERSION):
+                    for vacancy_id, title, tf in batch:
+                        if tf is None:
+                            stale.append(vacancy_id)
+                        else:
+                            index.add(vacancy_id, tf)
+                        titles[vacancy_id] = title
+                for vacancy_id in stale:
+                    dto = await self._fresh(await self.get(vacancy_id))
+                    index.add(vacancy_id, dto.features["bm25_tf"])
+                self._index, self._titles = index, titles
+                self._index_loaded_at = time.monotonic()
+        return self._index
+
+    async def rank(self, text: str, limit: int = 20) -> List[VacancyRankItem]:
+        """
+        Вакансии реестра, ближайшие к тексту (резюме) по BM25 с корпусной статистикой.
+        """
+        index = await self._get_index()
+        return [VacancyRankItem(vacancy_id=vacancy_id, title=self._titles.get(vacancy_id, "Vacancy"), score=score)
+                for vacancy_id, score in index.top_k(text, limit)]
+
+    async def _get_requirements_index(self) -> RequirementIndex[UUID]:
+        if self._req_index is not None and time.monotonic() - self._req_loaded_at < _INDEX_TTL_SEC:
+            return self._req_index
+        async with self._req_lock:
+            if self._req_index is None or time.monotonic() - self._req_loaded_at >= _INDEX_TTL_SEC:
+                index: RequirementIndex[UUID] = RequirementIndex()
+                async for batch in self.repository.iter_requirements():
+                    for vacancy_id, title, req in batch:
+                        index.add(vacancy_id, req["must_have"], req["nice_to_have"], req["min_years_total"])
+                        self._titles[vacancy_id] = title
+                self._req_index = index
+                self._req_loaded_at = time.monotonic()
+        return self._req_index
+
+    async def suggest(self, cv: Dict[str, Any], limit: int = 10, exclude: UUID | None = None) -> List[VacancySuggestion]:
+        """
+        Лучшие вакансии реестра для резюме (cv - вход decide, см. MatchService.cv_input).
+        Индекс требований оценивает все вакансии без текста, полный decide считается только
+        для короткого списка фиксированной длины (RequirementIndex.candidates): документы -
+        одним запросом, decide - одним вызовом в пуле.
+        """
+        if limit <= 0:
+            return []
+        index = await self._get_requirements_index()
+        analysis = cv.get("analysis") or AnalyzedText(cv.get("text") or "")
+        cv = {**cv, "analysis": analysis}
+        skills = set(cv["skills"]) if "skills" in cv else analysis.skill_set
+        exp_years = cv["experience_years"] if "experience_years" in cv else analysis.experience_years
+
+        keys = index.candidates(skills, exp_years, limit, exclude)
+        docs = await self.get_documents(keys)
+        # порядок короткого списка (для равных скоров), удалённые за время TTL индекса - пропускаем
+        keys = [k for k in keys if k in docs]
+        results = await self.parsing.executor.run("suggest", cpu_tasks.match_vacancies,
+                                                  [MatchService.vacancy_input(docs[k]) for k in keys], cv)
+        return [VacancySuggestion(vacancy_id=vacancy_id, title=self._titles.get(vacancy_id, "Vacancy"),
+                                  decision=d["decision"], score=d["score"], reasons=d["reasons"], details=d["details"])
+                for vacancy_id, d in best_k(keys, results, limit)]
+
+    @staticmethod
+    def _to_document(dto: VacancyDTO) -> ParsedDocument:
+        features = dict(dto.features)
+        features["bm25_weights"] = bm25_weights(features.get("bm25_tf") or {})
+        return ParsedDocument(text=dto.text, profile=dto.profile, features=features)
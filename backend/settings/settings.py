@@ -24,12 +24,120 @@ class Analyzer(BaseModel):
     temperature: float = 0.3
     url: str = c.ANALYZER_URL
     timeout_sec: float = 60.0
+    # ответ LLM потоком (SSE): решение и процент отдаются (provisional_verdict в /compare/stream,
+    # provisional-ответ /compare) сразу, пока генерируются обоснование и фидбек
+    stream: bool = True
+    # анализ в два вызова: короткий вердикт (его ждёт /compare) и, только для допущенных,
+    # материалы интервью (темы, meta, сжатые копии) - в фоне, до первого входа по ссылке
+    verdict_max_tokens: int = 1500
+    interview_max_tokens: int = 10000
+    # генерация материалов, взятая другим процессом и молчащая дольше этого, перехватывается, секунд
+    interview_claim_sec: float = 180.0
+    # тексты в промпте: без повторов строк и лишних разделов резюме (prompt_compact) и в бюджете
+    # prompt_budget_tokens на оба текста, без системного промпта (оценка, ~3 символа на токен),
+    # см. llm_compare/prompt_builder.py. По умолчанию 0 - без обрезки: на benchmarks.prompt_eval
+    # --bloat решения те же, что по чистому резюме, с обрезкой - пока нет (стаж считается иначе)
+    prompt_compact: bool = True
+    prompt_budget_tokens: int = 0
+    
+
+class Llm(BaseModel):
+    # политика вызовов LLM (анализатор и интервьюер), см. infrastructure/llm/transport.py
+    retries: int = 2
+    backoff_base_sec: float = 0.5
+    backoff_max_sec: float = 8.0
+    # дубль запроса, если ответа нет дольше этого перцентиля удачных попыток (0.95); None - без дублей
+    hedge_percentile: float | None = None
+    hedge_min_delay_sec: float = 2.0
+    # запасной endpoint для дублей и при открытом предохранителе основного; пусто - без запасного
+    alt_url: str = ""
+    alt_model: str = ""
+    alt_api_key: str = ""
+    # предохранитель: столько повторяемых ошибок подряд - и endpoint отключается на reset_sec
+    breaker_failures: int = 5
+    breaker_reset_sec: float = 30.0
+    # таймаут одного вызова модели интервьюера, секунд
+    interviewer_timeout_sec: float = 30.0
+    
+
+class Compare(BaseModel):
+    # бюджет времени /compare, секунд: не успел LLM - ответ мэтчера, LLM дорабатывает в фоне; 0 - без бюджета
+    budget_sec: float = 20.0
+    
+
+class Cache(BaseModel):
+    memory_size: int = 1024
+    ttl_sec: float = 24 * 3600.0
+    pg_enabled: bool = True
+    
+
+class Batch(BaseModel):
+    parse_concurrency: int = 8
+    llm_concurrency: int = 4
+    max_files: int = 1000
+    
+
+class Jobs(BaseModel):
+    workers: int = 2
+    poll_interval_sec: float = 5.0
+    stale_after_sec: float = 600.0
+    max_attempts: int = 3
+    
+
+class Executor(BaseModel):
+    # процессы для CPU-этапов (парсинг, признаки, мэтчер); 0 - в потоке, без пула
+    processes: int = max(1, mp.cpu_count() - 1)
+    start_method: str = "spawn"
+    max_tasks_per_child: int | None = None
+    
+
+class Embeddings(BaseModel):
+    # бэкенд эмбеддингов: "hashing" (без модели) или "onnx" (нужны onnx_path и tokenizer_path)
+    backend: str = "hashing"
+    dim: int = 512
+    onnx_path: str = ""
+    tokenizer_path: str = ""
+    max_length: int = 256
+    prefix: str = ""
+    # индекс ближайших: "flat" (точный, numpy) или "hnsw" (hnswlib)
+    index: str = "flat"
+    hnsw_m: int = 16
+    hnsw_ef_construction: int = 200
+    hnsw_ef: int = 64
+    memory_size: int = 4096
+    
+
+class Taxonomy(BaseModel):
+    # исходник таксономии навыков (JSON, см. matching/taxonomy.py); пусто - встроенные ALIASES
+    path: str = ""
+    # файл скомпилированного матчера; пусто - path + ".bin"
+    compiled_path: str = ""
+    # как часто проверять, не изменился ли исходник
+    poll_interval_sec: float = 10.0
+    
+
+class NearDuplicates(BaseModel):
+    # повторно присланное резюме с мелкими правками берёт готовый вердикт LLM у почти-дубликата
+    enabled: bool = True
+    # порог оценки Жаккара по словесным шинглам (MinHash)
+    threshold: float = 0.9
+    # полос LSH (делитель matching.minhash.NUM_PERM): больше полос - выше полнота, больше кандидатов
+    bands: int = 16
     
 
 class _Settings(BaseSettings):
     pg: Postgres = Postgres()
     uvicorn: Uvicorn = Uvicorn()
     analyzer: Analyzer = Analyzer()
+    compare: Compare = Compare()
+    cache: Cache = Cache()
+    batch: Batch = Batch()
+    jobs: Jobs = Jobs()
+    executor: Executor = Executor()
+    embeddings: Embeddings = Embeddings()
+    taxonomy: Taxonomy = Taxonomy()
+    llm: Llm = Llm()
+    near_duplicates: NearDuplicates = NearDuplicates()
     
     model_config = SettingsConfigDict(env_file=".env", env_prefix="app_", env_nested_delimiter="__")
     
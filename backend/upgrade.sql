@@ -0,0 +1,85 @@
+-- Обновление уже созданной базы до текущей схемы: init.sql выполняется только при первом
+-- создании базы (docker-entrypoint-initdb.d). Все команды идемпотентны - скрипт можно
+-- запускать при каждом старте: python -m infrastructure.db.upgrade (см. docker-entrypoint.sh).
+
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS pending JSONB;
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMPTZ;
+ALTER TABLE cv_features ADD COLUMN IF NOT EXISTS bm25_tf JSONB;
+
+CREATE TABLE IF NOT EXISTS compare_cache(
+    key TEXT PRIMARY KEY,
+    response JSONB NOT NULL,
+    interview JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS compare_cache_expires_at_idx ON compare_cache(expires_at);
+
+CREATE TABLE IF NOT EXISTS vacancy(
+    id UUID PRIMARY KEY,
+    title TEXT NOT NULL,
+    profile JSONB NOT NULL,
+    text TEXT NOT NULL,
+    features JSONB NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS vacancy_text(
+    text_hash TEXT PRIMARY KEY,
+    text_z BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS cv_features(
+    id UUID PRIMARY KEY,
+    text_hash TEXT NOT NULL UNIQUE,
+    filename TEXT,
+    text_z BYTEA NOT NULL,
+    contacts JSONB NOT NULL DEFAULT '{}'::jsonb,
+    skills TEXT[] NOT NULL DEFAULT '{}',
+    experience_years DOUBLE PRECISION,
+    english_level TEXT,
+    features_version TEXT NOT NULL,
+    minhash BYTEA,
+    bm25_tf JSONB,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE TABLE IF NOT EXISTS job(
+    id UUID PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+    cv BYTEA,
+    vacancy BYTEA,
+    result JSONB,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    locked_at TIMESTAMPTZ,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS job_queued_idx ON job(created_at) WHERE status = 'queued';
+CREATE INDEX IF NOT EXISTS job_running_idx ON job(locked_at) WHERE status = 'running';
+
+CREATE TABLE IF NOT EXISTS embedding(
+    model TEXT NOT NULL,
+    text_hash TEXT NOT NULL,
+    vector BYTEA NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (model, text_hash)
+);
+
+CREATE TABLE IF NOT EXISTS bulk_result(
+    run_id TEXT NOT NULL,
+    file TEXT NOT NULL,
+    vacancy TEXT NOT NULL,
+    decision TEXT,
+    score DOUBLE PRECISION,
+    result JSONB NOT NULL,
+    error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (run_id, file, vacancy)
+);
@@ -0,0 +1,34 @@
+from fastapi import HTTPException, status
+from typing import Awaitable, TypeVar
+import asyncio
+import time
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """
+    Бюджет времени запроса: создаётся на входе и передаётся по конвейеру,
+    каждый этап ждёт не дольше, чем осталось.
+    """
+
+    def __init__(self, budget_sec: float):
+        self.budget_sec = budget_sec
+        self.expires_at = time.monotonic() + budget_sec
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    async def run(self, aw: Awaitable[T], stage: str) -> T:
+        """
+        Ждёт обязательный этап (без него нечего вернуть) в пределах бюджета, иначе 504.
+        """
+        try:
+            return await asyncio.wait_for(aw, timeout=self.remaining())
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                                detail=f"Бюджет времени запроса ({self.budget_sec:g} с) исчерпан на этапе {stage}")
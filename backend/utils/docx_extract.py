@@ -1,37 +1,218 @@
 from fastapi import HTTPException
 import mammoth
 from io import BytesIO
-import tempfile, os
-import docx2txt
+from dataclasses import dataclass, field
+from typing import Iterator, List, Tuple
+import xml.etree.ElementTree as ET
+import zipfile
 import re
 import asyncio
 
+# лимиты на входной DOCX: размер архива, распакованный размер xml-части, степень сжатия
+MAX_DOCX_BYTES = 20 * 1024 * 1024
+MAX_PART_BYTES = 50 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 100
+_CHUNK = 64 * 1024
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_T, _TAB, _BR, _CR, _P = _W + "t", _W + "tab", _W + "br", _W + "cr", _W + "p"
+_TBL, _TR, _TC = _W + "tbl", _W + "tr", _W + "tc"
+_GRID_SPAN, _VMERGE, _VAL = _W + "gridSpan", _W + "vMerge", _W + "val"
+
+_MAIN_PART = "word/document.xml"
+_HEADER_RX = re.compile(r"word/header[0-9]*\.xml")
+_FOOTER_RX = re.compile(r"word/footer[0-9]*\.xml")
+
+
+class DocxLimitError(ValueError):
+    """DOCX превышает лимиты по размеру или похож на zip-бомбу."""
+
+
+@dataclass(slots=True)
+class DocxParagraph:
+    text: str
+    part: str = _MAIN_PART
+
+
+@dataclass(slots=True)
+class DocxTableRow:
+    # ячейки строки по сетке таблицы (объединённые ячейки повторяются, как в python-docx)
+    cells: List[str]
+    depth: int = 1
+    part: str = _MAIN_PART
+
+
+@dataclass(slots=True)
+class DocxContent:
+    text: str = ""
+    rows: List[Tuple[str, ...]] = field(default_factory=list)
+
+
 def docx_to_markdown(docx_bytes: bytes) -> str:
     result = mammoth.convert_to_markdown(BytesIO(docx_bytes))
     md = result.value.strip()
     return md
-    
+
+
+def _text_parts(names: List[str]) -> List[str]:
+    # тот же порядок, что у docx2txt: колонтитулы сверху, основной текст, нижние колонтитулы
+    headers = [n for n in names if _HEADER_RX.match(n)]
+    footers = [n for n in names if _FOOTER_RX.match(n)]
+    return headers + [_MAIN_PART] + footers
+
+
+def _open_zip(data: bytes) -> zipfile.ZipFile:
+    if not data:
+        raise DocxLimitError("Файл пустой")
+    if len(data) > MAX_DOCX_BYTES:
+        raise DocxLimitError(f"Файл больше {MAX_DOCX_BYTES // (1024 * 1024)} МБ")
+    return zipfile.ZipFile(BytesIO(data))
+
+
+def _iter_part_chunks(zf: zipfile.ZipFile, name: str) -> Iterator[bytes]:
+    info = zf.getinfo(name)
+    if info.file_size > MAX_PART_BYTES:
+        raise DocxLimitError(f"{name}: распакованный размер {info.file_size} превышает лимит")
+    if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+        raise DocxLimitError(f"{name}: подозрительная степень сжатия")
+
+    # заголовкам zip верить нельзя - считаем реально распакованные байты
+    total = 0
+    with zf.open(info) as fp:
+        while True:
+            chunk = fp.read(_CHUNK)
+            if not chunk:
+                return
+            total += len(chunk)
+            if total > MAX_PART_BYTES:
+                raise DocxLimitError(f"{name}: распакованный размер превышает лимит")
+            yield chunk
+
+
+def _iter_part(zf: zipfile.ZipFile, name: str) -> Iterator[DocxParagraph | DocxTableRow]:
+    """
+    Потоково разбирает одну xml-часть: абзацы и строки таблиц отдаются по мере закрытия тегов,
+    разобранные элементы сразу удаляются из дерева, поэтому память не растёт с размером документа.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    stack: List[ET.Element] = []
+    runs: List[List[str]] = []          # буферы открытых абзацев (абзацы бывают вложенными - надписи)
+    cells: List[List[str]] = []         # абзацы открытых ячеек
+    rows: List[List[str]] = []          # ячейки открытых строк (по сетке)
+    prev_rows: List[List[str]] = []     # предыдущая строка каждой открытой таблицы - для vMerge
+    spans: List[Tuple[int, bool]] = []  # (gridSpan, vMerge=continue) открытых ячеек
+
+    for chunk in _iter_part_chunks(zf, name):
+        parser.feed(chunk)
+        for event, elem in parser.read_events():
+            tag = elem.tag
+            if event == "start":
+                stack.append(elem)
+                if tag == _P:
+                    if runs and runs[-1]:
+                        # вложенный абзац: отдаём уже набранный текст внешнего, как docx2txt
+                        text = "".join(runs[-1])
+                        runs[-1].clear()
+                        if cells:
+                            cells[-1].append(text)
+                        yield DocxParagraph(text, name)
+                    runs.append([])
+                elif tag == _TBL:
+                    prev_rows.append([])
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                    spans.append((1, False))
+                continue
+
+            stack.pop()
+            if tag == _T:
+                if runs and elem.text:
+                    runs[-1].append(elem.text)
+            elif tag == _TAB:
+                if runs:
+                    runs[-1].append("\t")
+            elif tag in (_BR, _CR):
+                if runs:
+                    runs[-1].append("\n")
+            elif tag == _GRID_SPAN:
+                if spans:
+                    spans[-1] = (int(elem.get(_VAL) or 1), spans[-1][1])
+            elif tag == _VMERGE:
+                if spans:
+                    spans[-1] = (spans[-1][0], (elem.get(_VAL) or "continue") == "continue")
+            elif tag == _P:
+                text = "".join(runs.pop())
+                if cells:
+                    cells[-1].append(text)
+                yield DocxParagraph(text, name)
+            elif tag == _TC:
+                span, cont = spans.pop()
+                text = "\n".join(cells.pop())
+                if rows:
+                    row = rows[-1]
+                    if cont and prev_rows and len(prev_rows[-1]) > len(row):
+                        text = prev_rows[-1][len(row)]
+                    row.extend([text] * span)
+            elif tag == _TR:
+                row = rows.pop()
+                if prev_rows:
+                    prev_rows[-1] = row
+                yield DocxTableRow(row, len(prev_rows), name)
+            elif tag == _TBL:
+                prev_rows.pop()
+
+            # элемент разобран - отцепляем одного ребёнка от родителя. Дерево может быть построено
+            # дальше очереди событий, поэтому удаляется не обязательно он сам, но к концу разбора
+            # каждый родитель теряет ровно столько детей, сколько их у него было
+            if stack:
+                del stack[-1][-1]
+
+    parser.close()
+
+
+def iter_docx(data: bytes, parts: Tuple[str, ...] | None = None) -> Iterator[DocxParagraph | DocxTableRow]:
+    """
+    Потоковый разбор DOCX прямо из байтов загрузки, без временных файлов и дерева python-docx.
+    Отдаёт абзацы и строки таблиц в порядке документа. По умолчанию - колонтитулы и основной текст
+    в порядке docx2txt. Бросает DocxLimitError при превышении лимитов.
+    """
+    with _open_zip(data) as zf:
+        names = zf.namelist()
+        for name in (parts if parts is not None else _text_parts(names)):
+            if name not in names:
+                continue
+            yield from _iter_part(zf, name)
+
+
+def extract_docx(data: bytes, with_text: bool = True) -> DocxContent:
+    """
+    За один проход собирает очищенный текст (как docx2txt + _clean_text)
+    и строки таблиц верхнего уровня основного документа.
+    """
+    out = DocxContent()
+    pieces: List[str] = []
+    parts = None if with_text else (_MAIN_PART,)
+    for block in iter_docx(data, parts):
+        if isinstance(block, DocxParagraph):
+            pieces.append(block.text)
+        elif block.depth == 1 and block.part == _MAIN_PART:
+            out.rows.append(tuple(block.cells))
+    if with_text:
+        out.text = _clean_text("\n".join(pieces))
+    return out
+
+
 async def docx_to_txt(data: bytes) -> str:
     if not data:
         raise HTTPException(status_code=400, detail="Файл пустой")
-
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".docx")
-    try:
-        tmp.write(data)
-        tmp.flush()
-        tmp.close()
-        text = await asyncio.to_thread(docx2txt.process, tmp.name)
-        text = (text or "").replace("\r\n", "\n").replace("\r", "\n")
-        return _clean_text(text)
-    finally:
-        try:
-            os.remove(tmp.name)
-        except OSError:
-            pass
+    content = await asyncio.to_thread(extract_docx, data)
+    return content.text
 
 
 def _clean_text(text: str) -> str:
-  
+
     # нормализуем переводы строк и неразрывные пробелы
     text = text.replace('\r\n', '\n').replace('\r', '\n').replace('\u00A0', ' ')
 
@@ -51,4 +232,4 @@ def _clean_text(text: str) -> str:
     # убрать пустые строки
     text = re.sub(r'\n{2,}', '\n', text)
 
-    return text.strip()
\ No newline at end of file
+    return text.strip()
@@ -1,8 +1,7 @@
-from typing import Dict, Any, List, Tuple, Optional
-from io import BytesIO
+from typing import Dict, Any, Iterable, List, Sequence, Tuple, Optional
 import re
-from docx import Document
 from matching.skills import normalize_skills
+from utils.docx_extract import extract_docx
 
 # ключи/синонимы столбца "Наименование поля"
 KEY_SYNONYMS: Dict[str, List[str]] = {
@@ -36,16 +35,15 @@ def _clean_text(s: str) -> str:
     s = re.sub(r"\n{2,}", "\n", s)        # множественные переносы
     return s.strip()
 
-def _tables_to_pairs(doc: Document) -> List[Tuple[str, str]]:
+def table_rows_to_pairs(rows: Iterable[Sequence[str]]) -> List[Tuple[str, str]]:
     pairs: List[Tuple[str, str]] = []
-    for table in doc.tables:
-        for row in table.rows:
-            if len(row.cells) < 2:
-                continue
-            k = _clean_text(row.cells[0].text).strip(" :")
-            v = _clean_text(row.cells[1].text)
-            if k and v:
-                pairs.append((k, v))
+    for cells in rows:
+        if len(cells) < 2:
+            continue
+        k = _clean_text(cells[0]).strip(" :")
+        v = _clean_text(cells[1])
+        if k and v:
+            pairs.append((k, v))
     return pairs
 
 def _canon_key(raw_key: str) -> Optional[str]:
@@ -110,15 +108,16 @@ def _extract_skills(requirements_md: str, duties_md: str) -> Dict[str, List[str]
     nice = [s for s in nice_all if s not in must]
     return {"must_have": must, "nice_to_have": nice}
 
-def  parse_vacancy_docx_to_profile(docx_bytes: bytes) -> Dict[str, Any]:
+def read_vacancy_tables(docx_bytes: bytes) -> List[Tuple[str, str]]:
+    """Достаёт пары (ключ, значение) из всех двухколоночных таблиц DOCX вакансии."""
+    return table_rows_to_pairs(extract_docx(docx_bytes, with_text=False).rows)
+
+def vacancy_profile_from_pairs(pairs: List[Tuple[str, str]]) -> Dict[str, Any]:
     """
-    Читает все таблицы DOCX вакансии (формат 'Наименование поля' / 'Значение')
-    и строит профиль под мэтчер: title, description_md, must/nice, min_years_total, english_min_level.
+    Строит профиль под мэтчер из пар таблицы (формат 'Наименование поля' / 'Значение'):
+    title, description_md, must/nice, min_years_total, english_min_level.
     Работает и если названия полей отличаются — через KEY_SYNONYMS.
     """
-    doc = Document(BytesIO(docx_bytes))
-    pairs = _tables_to_pairs(doc)
-
     bag: Dict[str, str] = {}
     for raw_k, v in pairs:
         canon = _canon_key(raw_k)
@@ -150,3 +149,9 @@ def  parse_vacancy_docx_to_profile(docx_bytes: bytes) -> Dict[str, Any]:
         "min_years_total": min_years_total,
         "english_min_level": english_min_level,
     }
+
+def parse_vacancy_docx_to_profile(docx_bytes: bytes) -> Dict[str, Any]:
+    """
+    Читает все таблицы DOCX вакансии и строит профиль под мэтчер.
+    """
+    return vacancy_profile_from_pairs(read_vacancy_tables(docx_bytes))
@@ -0,0 +1,78 @@
+from repositories.db.repository import Repository
+from repositories.db.compare_cache import CompareCacheRepository
+from repositories.db.vacancy import VacancyRepository
+from repositories.db.cv_features import CvFeaturesRepository
+from repositories.db.job import JobRepository, JOB_NEW_CHANNEL, JOB_DONE_CHANNEL
+from infrastructure.db.notify import PgNotifier
+from services.parsing_service import ParsingService
+from services.match_service import MatchService
+from services.user import UserService
+from services.interview_service import InterviewService
+from services.compare_cache import CompareCacheService
+from services.analysis_service import AnalysisService
+from services.near_duplicate_service import NearDuplicateService
+from services.vacancy_service import VacancyService
+from services.screening_service import ScreeningService
+from services.taxonomy_service import TaxonomyService
+from services.job_service import JobWorker, compare_job_handler, COMPARE_JOB
+from infrastructure.executor.pool import CpuExecutor
+from settings.settings import settings
+import argparse
+import asyncio
+import httpx
+import logging
+import signal
+
+
+async def run(workers: int) -> None:
+    """
+    Отдельный процесс-воркер очереди задач: масштабируется независимо от HTTP-сервера.
+    """
+    taxonomy_service = TaxonomyService(settings.taxonomy.path, settings.taxonomy.compiled_path,
+                                       settings.taxonomy.poll_interval_sec)
+    taxonomy_service.prepare()
+    executor = CpuExecutor(settings.executor.processes, settings.executor.start_method,
+                           settings.executor.max_tasks_per_child,
+                           initializers=taxonomy_service.initializers())
+    await executor.start()
+    parsing_service = ParsingService(Repository(), executor)
+    near_duplicates = NearDuplicateService(CvFeaturesRepository(), settings.near_duplicates.threshold,
+                                           settings.near_duplicates.bands) if settings.near_duplicates.enabled else None
+    vacancy_service = VacancyService(parsing_service, VacancyRepository())
+    analysis_service = AnalysisService(CompareCacheService(CompareCacheRepository()), near_duplicates)
+    screening_service = ScreeningService(
+        parsing_service,
+        MatchService(parsing_service),
+        analysis_service,
+        InterviewService(analysis_service, UserService(), CvFeaturesRepository(), VacancyRepository()),
+    )
+
+    notifier = PgNotifier([JOB_NEW_CHANNEL, JOB_DONE_CHANNEL])
+    await notifier.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with httpx.AsyncClient(timeout=settings.analyzer.timeout_sec) as client:
+        handlers = {COMPARE_JOB: compare_job_handler(parsing_service, vacancy_service, screening_service, client)}
+        tasks = [asyncio.create_task(JobWorker(JobRepository(), handlers, notifier).run(stop))
+                 for _ in range(workers)]
+        tasks.append(asyncio.create_task(taxonomy_service.watch(stop)))
+        await asyncio.gather(*tasks)
+
+    await notifier.stop()
+    executor.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Воркер очереди задач")
+    parser.add_argument("--workers", type=int, default=settings.jobs.workers)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(args.workers))
+
+if __name__ == "__main__":
+    main()